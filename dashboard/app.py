@@ -5,7 +5,7 @@ Scanner report files (sast-report.json, trivy-report.json, etc.) still
 live on disk because they are generated by the pipeline toolchain.
 """
 
-from flask import Flask, jsonify, request, redirect, session
+from flask import Flask, jsonify, request, redirect, session, stream_with_context
 from flask_cors import CORS
 from flask_jwt_extended import (
     JWTManager,
@@ -14,7 +14,8 @@ from flask_jwt_extended import (
     get_jwt_identity,
     get_jwt,
 )
-from functools import wraps
+from functools import lru_cache, wraps
+import copy
 import json
 def utcnow():
     return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -25,17 +26,16 @@ import hashlib
 import re
 import uuid
 import secrets as _secrets
-import smtplib
-import ssl
-from email.message import EmailMessage
 import psycopg2
 from cryptography.fernet import Fernet
 import base64, datetime
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional
+from sqlalchemy.orm import load_only
 import threading
-import queue
+import time
 import sys
+import atexit
 
 import bcrypt as pybcrypt
 from flask_bcrypt import Bcrypt
@@ -70,6 +70,10 @@ from pipeline.pipeline_executor import (
     PipelineResult,
 )
 from pipeline.sast_scanner import LANGUAGE_INFO, TOOL_DISPLAY
+from pipeline.findings import (
+    FINDINGS_SUMMARY_FILE, ScanSummary, load_scan_summaries, severity_rank,
+)
+from pipeline.report_store import load_report, remove_report, report_exists, resolve_report
 
 # Google OAuth (optional)
 try:
@@ -149,6 +153,19 @@ from models import (  # noqa: E402
     WebhookLog,
     SystemLog,
 )
+from notifications import add_notification  # noqa: E402
+from pipeline_worker import (  # noqa: E402
+    PIPELINE_EVENT_FIELDS, PipelineWorkerPool, pipeline_queue_snapshot, publish_pipeline_status,
+)
+from rollups import daily_series, rollup_totals  # noqa: E402
+from events import (  # noqa: E402
+    broker as event_broker, format_sse, pipeline_channel, start_event_bridge, user_channel,
+)
+from http_cache import (  # noqa: E402
+    apply_cache_headers, compress_response, finished_pipeline_policy, is_not_modified, not_modified,
+)
+
+app.after_request(compress_response)
 
 
 def _cleanup_orphan_notifications_once():
@@ -219,145 +236,63 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 REPORT_DIR = os.path.join(os.path.dirname(BASE_DIR), "runtime", "reports")
 os.makedirs(REPORT_DIR, exist_ok=True)
 
-# Pipeline executor
-def _persist_pipeline_state(pipeline):
-    with app.app_context():
-        db_pipeline = db.session.get(Pipeline, pipeline.id)
-        if not db_pipeline:
-            return
-        db_pipeline.status = _normalize_status(pipeline.status)
-        db_pipeline.stages = pipeline.stages or {}
-        if pipeline.started_at:
-            try:
-                db_pipeline.started_at = datetime.fromisoformat(pipeline.started_at)
-            except ValueError:
-                pass
-        if pipeline.finished_at:
-            try:
-                db_pipeline.completed_at = datetime.fromisoformat(pipeline.finished_at)
-            except ValueError:
-                pass
-        db_pipeline.duration_seconds = pipeline.duration_seconds
-        db_pipeline.security_score = pipeline.security_score
-        db_pipeline.is_deployable = pipeline.is_deployable
-        if pipeline.vulnerability_summary is not None:
-            db_pipeline.vulnerability_summary = pipeline.vulnerability_summary
-        if getattr(pipeline, "ai_prediction", None) is not None:
-            db_pipeline.ai_prediction_data = pipeline.ai_prediction
-        db.session.commit()
-
-
-pipeline_executor = PipelineExecutor(REPORT_DIR, on_update=_persist_pipeline_state)
 
-# Serialized pipeline execution: exactly one running pipeline at a time.
-_pipeline_job_queue: "queue.Queue[dict]" = queue.Queue()
-_pipeline_worker_lock = threading.Lock()
-_pipeline_worker_started = False
-_pipeline_queue_state_lock = threading.Lock()
-_queued_pipeline_ids: set = set()
-_active_pipeline_id: str | None = None
+def _pipeline_report_dir(user_id, pipeline_id: str) -> str:
+    """Per-user, per-run report directory (created by the executor on completion)."""
+    return os.path.join(REPORT_DIR, str(user_id), pipeline_id)
 
 
-def _enqueue_pipeline_job(job: dict) -> bool:
-    pipeline_obj = job.get("pipeline")
-    pipeline_id = getattr(pipeline_obj, "id", None)
-    if not pipeline_id:
-        return False
-
-    global _active_pipeline_id
-    with _pipeline_queue_state_lock:
-        if pipeline_id == _active_pipeline_id or pipeline_id in _queued_pipeline_ids:
-            return False
-        _queued_pipeline_ids.add(pipeline_id)
-
-    _pipeline_job_queue.put(job)
-    return True
-
-
-def _recover_orphaned_queued_pipelines():
-    """Re-enqueue queued DB pipelines that were orphaned (e.g., backend restart)."""
-    with app.app_context():
-        queued_rows = (
-            Pipeline.query
-            .filter(Pipeline.status == "queued")
-            .order_by(Pipeline.created_at.asc())
-            .all()
-        )
-
-        for row in queued_rows:
-            with _pipeline_queue_state_lock:
-                if row.id == _active_pipeline_id or row.id in _queued_pipeline_ids:
-                    continue
-
-            pipeline = pipeline_executor.create_pipeline(
-                repo_url=row.repo_url or "",
-                branch=row.branch or "main",
-                commit_sha=row.commit_sha or "manual",
-                commit_message=row.commit_message or "Recovered queued pipeline",
-                author=row.author or "system",
-                pipeline_id=row.id,
-            )
-            if row.stages:
-                pipeline.stages = row.stages
-
-            scan_prefs = {}
-            if row.user_id:
-                user = db.session.get(User, row.user_id)
-                if user:
-                    settings = _get_or_create_settings(user)
-                    scan_prefs = settings.get_section("scanPreferences") or {}
-
-            _enqueue_pipeline_job(
-                {
-                    "executor": pipeline_executor,
-                    "pipeline": pipeline,
-                    "repo_url": row.repo_url or None,
-                    "target_dir": None,
-                    "image_name": None,
-                    "scan_prefs": scan_prefs,
-                }
-            )
+# Pipeline workers: embedded runs the worker pool inside the web process;
+# external leaves the queue to the standalone worker (dashboard/worker.py).
+PIPELINE_WORKER_MODE = os.getenv("PIPELINE_WORKER_MODE", "embedded").strip().lower()
+pipeline_workers = PipelineWorkerPool(app, REPORT_DIR)
+atexit.register(pipeline_workers.drain)
 
 # GitHub webhook secret
 GITHUB_WEBHOOK_SECRET = os.environ.get("GITHUB_WEBHOOK_SECRET", "your-webhook-secret")
 ALLOW_UNVERIFIED_WEBHOOKS = os.environ.get("ALLOW_UNVERIFIED_WEBHOOKS", "false").lower() == "true"
 
-# Email configuration
-SMTP_HOST = os.environ.get("SMTP_HOST", "")
-SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
-SMTP_USER = os.environ.get("SMTP_USER", "")
-SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "")
-SMTP_FROM = os.environ.get("SMTP_FROM", SMTP_USER or "no-reply@sentinelops.local")
-SMTP_USE_TLS = os.environ.get("SMTP_USE_TLS", "true").lower() == "true"
-SMTP_USE_SSL = os.environ.get("SMTP_USE_SSL", "false").lower() == "true"
+
 
 
 # ====================================================================
 # HELPER: load scanner report from disk (unchanged)
 # ====================================================================
 
-def load_json_file(filename):
-    """Load a JSON report file from REPORT_DIR."""
-    path = os.path.join(REPORT_DIR, filename)
-    try:
-        with open(path) as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return None
+def load_json_file(filename, report_dir: Optional[str] = None):
+    """Load a JSON report file from a pipeline's report dir, or REPORT_DIR.
+
+    Raw reports can be tens of MB, so they are parsed per call and never
+    memoized; callers own the returned data.
+    """
+    return load_report(os.path.join(report_dir or REPORT_DIR, filename))
+
 
+def load_scan_summaries_for(report_dir: Optional[str] = None) -> Dict[str, ScanSummary]:
+    """Per-scanner totals of a pipeline's reports (see pipeline.findings).
 
-def _load_json_path(path: str):
+    Runs that predate findings-summary.json are summarized from their raw
+    reports. Per-pipeline report directories are immutable once the
+    executor renames them into place, so their (small) summaries are
+    memoized; every call gets its own copy.
+    """
+    if not report_dir:
+        return load_scan_summaries(REPORT_DIR)
+    path = resolve_report(os.path.join(report_dir, FINDINGS_SUMMARY_FILE)) or report_dir
     try:
-        if not path or not os.path.exists(path):
-            return None
-        with open(path) as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, TypeError):
-        return None
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    return {
+        source: ScanSummary.from_dict(source, copy.deepcopy(data))
+        for source, data in _finished_scan_summaries(report_dir, path, mtime_ns).items()
+    }
 
 
-def _normalize_status(status) -> str:
-    return status.value if hasattr(status, "value") else str(status)
+@lru_cache(maxsize=256)
+def _finished_scan_summaries(report_dir: str, path: str, mtime_ns: int) -> Dict[str, dict]:
+    # mtime_ns is part of the cache key so a re-run under the same id is reloaded
+    return {source: scan.to_dict() for source, scan in load_scan_summaries(report_dir).items()}
 
 
 # ====================================================================
@@ -534,301 +469,6 @@ def verify_github_username_route():
     result = verify_github_user(username)
     return jsonify(result), 200 if result.get("valid") else 400
 
-# ====================================================================
-# HELPER: notifications
-# ====================================================================
-
-def _send_email(to_email: str, subject: str, body_text: str) -> bool:
-    if not to_email:
-        return False
-
-    # --- SMTP fallback ---
-    if not SMTP_HOST or not SMTP_FROM:
-        return False
-    try:
-        message = EmailMessage()
-        message["Subject"] = subject
-        message["From"] = SMTP_FROM
-        message["To"] = to_email
-        message.set_content(body_text)
-
-        if SMTP_USE_SSL:
-            with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=15) as server:
-                if SMTP_USER and SMTP_PASSWORD:
-                    server.login(SMTP_USER, SMTP_PASSWORD)
-                server.send_message(message)
-        else:
-            with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=15) as server:
-                if SMTP_USE_TLS:
-                    server.starttls(context=ssl.create_default_context())
-                if SMTP_USER and SMTP_PASSWORD:
-                    server.login(SMTP_USER, SMTP_PASSWORD)
-                server.send_message(message)
-        return True
-    except Exception as exc:
-        app.logger.warning(f"Email delivery failed to {to_email}: {exc}")
-        return False
-
-
-def _get_user_notification_prefs(user: User) -> dict:
-    defaults = {
-        "email": {
-            "pipelineSuccess": True,
-            "pipelineFailure": True,
-            "criticalVuln": True,
-            "secretDetected": True,
-            "deploymentBlocked": False,
-        },
-        "inApp": True,
-        "weeklySummary": True,
-        "realtimeWebhook": False,
-    }
-    settings = _get_or_create_settings(user)
-    prefs = settings.get_section("notifications") or {}
-    merged = {**defaults, **prefs}
-    if isinstance(prefs.get("email"), dict):
-        merged["email"] = {**defaults["email"], **prefs["email"]}
-    return merged
-
-
-def _should_send_email_for_event(prefs: dict, event_key: Optional[str]) -> bool:
-    if not event_key:
-        return False
-    event_pref_map = {
-        "pipeline_success": "pipelineSuccess",
-        "pipeline_failure": "pipelineFailure",
-        "critical_vuln": "criticalVuln",
-        "secret_detected": "secretDetected",
-        "deployment_blocked": "deploymentBlocked",
-    }
-    email_key = event_pref_map.get(event_key)
-    if not email_key:
-        return False
-    email_prefs = prefs.get("email") or {}
-    return bool(email_prefs.get(email_key, False))
-
-
-def add_notification(
-    notification_type: str,
-    title: str,
-    message: str,
-    metadata: dict = None,
-    user_id: Optional[int] = None,
-    event_key: Optional[str] = None,
-):
-    """Create in-app notifications (scoped by user preferences) and send email if enabled."""
-    targets = []
-    if user_id is None:
-        app.logger.warning(
-            "Skipped notification '%s' because user_id is required for scoped delivery",
-            title,
-        )
-        return []
-
-    user = db.session.get(User, int(user_id))
-    if user and user.is_active:
-        targets = [user]
-
-    created = []
-    for user in targets:
-        prefs = _get_user_notification_prefs(user)
-
-        if bool(prefs.get("inApp", True)):
-            notif = Notification(
-                id=str(uuid.uuid4())[:8],
-                user_id=user.id,
-                type=notification_type,
-                title=title,
-                message=message,
-                read=False,
-            )
-            tagged_meta = {
-                **(metadata or {}),
-                "owner_user_id": user.id,
-                "owner_username": user.username,
-            }
-            notif.extra_data = tagged_meta
-            db.session.add(notif)
-            created.append(notif)
-
-        if _should_send_email_for_event(prefs, event_key):
-            _send_email(
-                user.email,
-                f"[SentinelOps] {title}",
-                f"{message}\n\nTimestamp: {utcnow().isoformat()}\n",
-            )
-
-    db.session.commit()
-
-    # Prune old notifications per-user (keep last 100)
-    target_ids = [u.id for u in targets]
-    if target_ids:
-        for uid in target_ids:
-            count = Notification.query.filter_by(user_id=uid).count()
-            if count > 100:
-                oldest = (
-                    Notification.query
-                    .filter_by(user_id=uid)
-                    .order_by(Notification.created_at.asc())
-                    .limit(count - 100)
-                    .all()
-                )
-                for row in oldest:
-                    db.session.delete(row)
-        db.session.commit()
-
-    return created
-
-
-def _severity_counts(items, key: str) -> Dict[str, int]:
-    counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0, "INFO": 0}
-    for item in items or []:
-        sev = (item.get(key) or "LOW").upper()
-        if sev in counts:
-            counts[sev] += 1
-        else:
-            counts["LOW"] += 1
-    return counts
-
-
-def _store_scan_results_from_reports(pipeline_id: str, reports_dir: str) -> None:
-    # Clear any previous scan rows for this pipeline
-    existing = ScanResult.query.filter_by(pipeline_id=pipeline_id).all()
-    for sr in existing:
-        db.session.delete(sr)
-    db.session.commit()
-
-    def add_scan_result(scanner_type: str, counts: Dict[str, int], total: int, raw_path: str):
-        sr = ScanResult(
-            pipeline_id=pipeline_id,
-            scanner_type=scanner_type,
-            total_findings=total,
-            critical_count=counts.get("CRITICAL", 0),
-            high_count=counts.get("HIGH", 0),
-            medium_count=counts.get("MEDIUM", 0),
-            low_count=counts.get("LOW", 0),
-            info_count=counts.get("INFO", 0),
-            raw_report_path=raw_path,
-        )
-        db.session.add(sr)
-        db.session.commit()
-        return sr
-
-    # SAST (unified) or Bandit fallback
-    sast_path = os.path.join(reports_dir, "sast-report.json")
-    bandit_path = os.path.join(reports_dir, "bandit-report.json")
-    sast_data = _load_json_path(sast_path) or _load_json_path(bandit_path) or {}
-    sast_results = sast_data.get("results", []) or []
-    totals = (sast_data.get("metrics", {}) or {}).get("totals", {})
-    if totals:
-        counts = {
-            "CRITICAL": totals.get("critical", 0),
-            "HIGH": totals.get("high", 0),
-            "MEDIUM": totals.get("medium", 0),
-            "LOW": totals.get("low", 0),
-            "INFO": totals.get("info", 0),
-        }
-        total = totals.get("total", sum(counts.values()))
-    else:
-        counts = _severity_counts(sast_results, "severity")
-        total = len(sast_results)
-    sr_sast = add_scan_result("SAST", counts, total, sast_path if os.path.exists(sast_path) else bandit_path)
-    for item in sast_results:
-        sev = (item.get("severity") or item.get("issue_severity") or "LOW").upper()
-        title = item.get("rule_name") or item.get("message") or item.get("issue_text") or ""
-        message = item.get("message") or item.get("issue_text") or item.get("code") or ""
-        file_path = item.get("file") or item.get("filename") or item.get("path") or ""
-        line = item.get("line") or item.get("line_number") or 0
-        rule_id = item.get("rule_id") or item.get("test_id") or ""
-        language = item.get("language") or ""
-        tool = item.get("tool") or ""
-        url = item.get("more_info") or item.get("url") or ""
-        cwe = item.get("cwe") or item.get("issue_cwe") or {}
-        cwe_id = cwe.get("id") if isinstance(cwe, dict) else ""
-        vuln = Vulnerability(
-            scan_result_id=sr_sast.id,
-            source="SAST",
-            tool=tool,
-            severity=sev,
-            title=title,
-            message=message,
-            file_path=file_path,
-            line_number=int(line or 0),
-            rule_id=rule_id,
-            language=language,
-            url=url,
-            cwe_id=cwe_id or "",
-        )
-        db.session.add(vuln)
-    db.session.commit()
-
-    # Trivy
-    trivy_path = os.path.join(reports_dir, "trivy-report.json")
-    trivy_data = _load_json_path(trivy_path) or {}
-    trivy_vulns = []
-    for result in trivy_data.get("Results", []) or []:
-        trivy_vulns.extend(result.get("Vulnerabilities", []) or [])
-    trivy_counts = _severity_counts(trivy_vulns, "Severity")
-    sr_trivy = add_scan_result("Trivy", trivy_counts, len(trivy_vulns), trivy_path)
-    for v in trivy_vulns:
-        vuln = Vulnerability(
-            scan_result_id=sr_trivy.id,
-            source="Trivy",
-            tool="trivy",
-            severity=(v.get("Severity") or "LOW").upper(),
-            title=v.get("Title") or v.get("VulnerabilityID") or "",
-            message=v.get("Description") or "",
-            file_path=v.get("PkgName") or v.get("Target") or "",
-            rule_id=v.get("VulnerabilityID") or "",
-            vulnerability_id=v.get("VulnerabilityID") or "",
-            fixed_version=v.get("FixedVersion") or "",
-            url=v.get("PrimaryURL") or "",
-        )
-        db.session.add(vuln)
-    db.session.commit()
-
-    # Gitleaks
-    gitleaks_path = os.path.join(reports_dir, "gitleaks-report.json")
-    gitleaks_data = _load_json_path(gitleaks_path) or {}
-    gitleaks_results = gitleaks_data.get("results", []) or []
-    gitleaks_counts = _severity_counts(gitleaks_results, "severity")
-    sr_gitleaks = add_scan_result("Gitleaks", gitleaks_counts, len(gitleaks_results), gitleaks_path)
-    for s in gitleaks_results:
-        secret = Secret(
-            scan_result_id=sr_gitleaks.id,
-            rule_id=s.get("rule_id") or "",
-            severity=(s.get("severity") or "HIGH").upper(),
-            file_path=s.get("file") or "",
-            line_number=int(s.get("line") or 0),
-            match=s.get("match") or "",
-            commit=s.get("commit") or "",
-            author=s.get("author") or "",
-        )
-        db.session.add(secret)
-    db.session.commit()
-
-    # DAST
-    dast_path = os.path.join(reports_dir, "dast-report.json")
-    dast_data = _load_json_path(dast_path) or {}
-    dast_results = dast_data.get("results", []) or []
-    dast_counts = _severity_counts(dast_results, "risk")
-    sr_dast = add_scan_result("DAST", dast_counts, len(dast_results), dast_path)
-    for a in dast_results:
-        vuln = Vulnerability(
-            scan_result_id=sr_dast.id,
-            source="DAST",
-            tool="zap",
-            severity=(a.get("risk") or "LOW").upper(),
-            title=a.get("name") or "",
-            message=a.get("desc") or a.get("description") or "",
-            file_path=a.get("url") or "",
-            url=a.get("reference") or "",
-            cwe_id=str(a.get("cweid") or ""),
-        )
-        db.session.add(vuln)
-    db.session.commit()
-
-
 def _normalize_repo_url(url: str) -> str:
     raw = (url or "").strip().lower()
     if raw.endswith(".git"):
@@ -1187,85 +827,42 @@ def update_policy_route():
 def evaluate_policy():
     """Evaluate the current reports against the security policy."""
     policy = Policy.get_instance()
+    report_dir = _get_latest_report_dir_for_user(get_current_user_info()["id"])
 
-    sast_data = load_json_file("sast-report.json")
-    bandit_data = load_json_file("bandit-report.json")
-    trivy_data = load_json_file("trivy-report.json")
-    gitleaks_data = load_json_file("gitleaks-report.json")
-    dast_data = load_json_file("dast-report.json")
+    scans = load_scan_summaries_for(report_dir)
 
     # ---- SAST score ----
-    sast_score = 100
-    sast_critical = 0
-    sast_high = 0
-    sast_medium = 0
-    sast_low = 0
-
-    if sast_data and sast_data.get("metrics"):
-        totals = sast_data["metrics"].get("totals", {})
-        sast_critical = totals.get("critical", 0)
-        sast_high = totals.get("high", 0)
-        sast_medium = totals.get("medium", 0)
-        sast_low = totals.get("low", 0)
-    elif bandit_data and bandit_data.get("results"):
-        for r in bandit_data["results"]:
-            sev = r.get("issue_severity", "").upper()
-            if sev == "HIGH":
-                sast_high += 1
-            elif sev == "MEDIUM":
-                sast_medium += 1
-            else:
-                sast_low += 1
-
-    sast_score -= sast_critical * 15 + sast_high * 8 + sast_medium * 3 + sast_low * 1
+    sast = scans.get("SAST", ScanSummary("SAST")).bucketed()
+    sast_critical = sast["CRITICAL"]
+    sast_high = sast["HIGH"]
+    sast_medium = sast["MEDIUM"]
+    sast_low = sast["LOW"]
+    sast_score = 100 - (sast_critical * 15 + sast_high * 8 + sast_medium * 3 + sast_low * 1)
     sast_score = max(0, sast_score)
 
     # ---- Trivy score ----
-    trivy_score = 100
-    trivy_critical = 0
-    trivy_high = 0
-    trivy_medium = 0
-    trivy_low = 0
-
-    if trivy_data and trivy_data.get("Results"):
-        for result in trivy_data["Results"]:
-            for vuln in result.get("Vulnerabilities", []):
-                sev = vuln.get("Severity", "").upper()
-                if sev == "CRITICAL":
-                    trivy_critical += 1
-                elif sev == "HIGH":
-                    trivy_high += 1
-                elif sev == "MEDIUM":
-                    trivy_medium += 1
-                else:
-                    trivy_low += 1
-    trivy_score -= trivy_critical * 15 + trivy_high * 8 + trivy_medium * 3 + trivy_low * 1
+    trivy = scans.get("Trivy", ScanSummary("Trivy")).bucketed()
+    trivy_critical = trivy["CRITICAL"]
+    trivy_high = trivy["HIGH"]
+    trivy_medium = trivy["MEDIUM"]
+    trivy_low = trivy["LOW"] + trivy["INFO"]
+    trivy_score = 100 - (trivy_critical * 15 + trivy_high * 8 + trivy_medium * 3 + trivy_low * 1)
     trivy_score = max(0, trivy_score)
 
     # ---- Gitleaks score ----
-    gitleaks_score = 100
-    gitleaks_total = 0
-    gitleaks_critical = 0
-    gitleaks_high = 0
-
-    if gitleaks_data:
-        gitleaks_total = gitleaks_data.get("total_secrets", 0)
-        gitleaks_critical = gitleaks_data.get("metrics", {}).get("critical", 0)
-        gitleaks_high = gitleaks_data.get("metrics", {}).get("high", 0)
-    gitleaks_score -= gitleaks_critical * 20 + gitleaks_high * 12 + (gitleaks_total - gitleaks_critical - gitleaks_high) * 5
+    gitleaks = scans.get("Gitleaks", ScanSummary("Gitleaks"))
+    gitleaks_total = gitleaks.total
+    gitleaks_critical = gitleaks.count("CRITICAL")
+    gitleaks_high = gitleaks.count("HIGH")
+    gitleaks_score = 100 - (gitleaks_critical * 20 + gitleaks_high * 12 + (gitleaks_total - gitleaks_critical - gitleaks_high) * 5)
     gitleaks_score = max(0, gitleaks_score)
 
     # ---- DAST score ----
-    dast_score = 100
-    dast_high = 0
-    dast_medium = 0
-    dast_low = 0
-
-    if dast_data:
-        dast_high = dast_data.get("metrics", {}).get("high", 0)
-        dast_medium = dast_data.get("metrics", {}).get("medium", 0)
-        dast_low = dast_data.get("metrics", {}).get("low", 0)
-    dast_score -= dast_high * 10 + dast_medium * 4 + dast_low * 1
+    dast = scans.get("DAST", ScanSummary("DAST"))
+    dast_high = dast.count("HIGH")
+    dast_medium = dast.count("MEDIUM")
+    dast_low = dast.count("LOW")
+    dast_score = 100 - (dast_high * 10 + dast_medium * 4 + dast_low * 1)
     dast_score = max(0, dast_score)
 
     # ---- Composite ----
@@ -1319,21 +916,140 @@ def evaluate_policy():
 # REPORT ROUTES (DB-backed scanner findings)
 # ====================================================================
 
-def _get_latest_pipeline_id_for_user(user_id):
-    """Helper to find the most recent pipeline ID for the current user."""
-    p = Pipeline.query.filter_by(user_id=user_id).order_by(Pipeline.created_at.desc()).first()
-    return p.id if p else None
+def _encode_cursor(*values) -> str:
+    """Opaque keyset cursor for the sort key of the last row on a page."""
+    raw = json.dumps(list(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, size: int) -> list:
+    """Values encoded by _encode_cursor; ValueError if malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (TypeError, ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+# Findings per page of the report endpoints
+FINDINGS_PAGE_LIMIT = 500
+FINDINGS_PAGE_MAX_LIMIT = 2000
+
+# Exact-match filter query parameters -> finding column (where the model has it)
+_FINDING_FILTERS = {
+    "tool": "tool",
+    "language": "language",
+    "cwe": "cwe_id",
+    "cve": "vulnerability_id",
+    "rule": "rule_id",
+}
+
+# Columns matched (case-insensitive substring) by the ``search`` parameter
+_FINDING_SEARCH_COLUMNS = ("title", "message", "file_path", "rule_id", "vulnerability_id", "tool", "cwe_id")
+
+
+def _findings_page(model, scan_result_id):
+    """One page of a scan's Vulnerability or Secret rows, most severe first.
+
+    Reads the request's ``limit`` and ``cursor`` and the filters ``severity``
+    (comma-separated), ``file`` (path prefix), ``tool``, ``language``,
+    ``cwe``, ``cve``, ``rule``, ``fixable`` (``yes``/``no``) and ``search``
+    (substring of the text columns). Returns ``(rows, next_cursor)``; raises
+    ValueError on a malformed cursor or one issued for another scan result
+    (e.g. a "latest" view whose pipeline changed between pages).
+    """
+    args = request.args
+    limit = max(1, min(args.get("limit", FINDINGS_PAGE_LIMIT, type=int), FINDINGS_PAGE_MAX_LIMIT))
+    q = model.query.filter(model.scan_result_id == scan_result_id)
+
+    for param, column in _FINDING_FILTERS.items():
+        value = (args.get(param) or "").strip()
+        if not value or not hasattr(model, column):
+            continue
+        if param == "cwe":
+            value = re.sub(r"^CWE-", "", value, flags=re.IGNORECASE)
+        elif param == "cve":
+            value = value.upper()
+        q = q.filter(getattr(model, column) == value)
+    if args.get("severity"):
+        ranks = {severity_rank(s.strip()) for s in args["severity"].split(",") if s.strip()}
+        q = q.filter(model.severity_rank.in_(ranks))
+    if args.get("file"):
+        q = q.filter(model.file_path.startswith(args["file"], autoescape=True))
+    if args.get("fixable") in ("yes", "no") and hasattr(model, "fixed_version"):
+        has_fix = db.func.coalesce(model.fixed_version, "") != ""
+        q = q.filter(has_fix if args["fixable"] == "yes" else db.not_(has_fix))
+    search = (args.get("search") or "").strip()
+    if search:
+        q = q.filter(db.or_(*(
+            getattr(model, column).icontains(search, autoescape=True)
+            for column in _FINDING_SEARCH_COLUMNS if hasattr(model, column)
+        )))
+
+    cursor = args.get("cursor")
+    if cursor:
+        try:
+            cursor_scan, after_rank, after_id = (int(v) for v in _decode_cursor(cursor, 3))
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor") from exc
+        if cursor_scan != scan_result_id:
+            raise ValueError("Cursor belongs to a different report")
+        q = q.filter(db.or_(
+            model.severity_rank > after_rank,
+            db.and_(model.severity_rank == after_rank, model.id > after_id),
+        ))
+
+    rows = q.order_by(model.severity_rank, model.id).limit(limit + 1).all()
+    page = rows[:limit]
+    next_cursor = (
+        _encode_cursor(scan_result_id, page[-1].severity_rank, page[-1].id) if len(rows) > limit else None
+    )
+    return page, next_cursor
 
 
-def _resolve_accessible_pipeline_id(current_user: dict, pipeline_id: Optional[str]) -> Optional[str]:
+def _get_latest_report_dir_for_user(user_id) -> Optional[str]:
+    """Report directory of the user's most recent finished pipeline."""
+    row = (
+        db.session.query(Pipeline.report_dir)
+        .filter(
+            Pipeline.user_id == user_id,
+            Pipeline.status.in_(("success", "failed")),
+            Pipeline.report_dir.isnot(None),
+        )
+        .order_by(Pipeline.created_at.desc())
+        .first()
+    )
+    if row and os.path.isdir(row.report_dir):
+        return row.report_dir
+    return None
+
+
+def _resolve_accessible_pipeline(current_user: dict, pipeline_id: Optional[str]):
+    """(id, user_id, status, completed_at) of the requested pipeline, or of the
+    user's latest one when ``pipeline_id`` is empty; None if not accessible.
+
+    Loads just enough to decide whether a cached copy is still valid.
+    """
+    q = db.session.query(Pipeline.id, Pipeline.user_id, Pipeline.status, Pipeline.completed_at)
     if pipeline_id:
-        pipeline = db.session.get(Pipeline, pipeline_id)
+        pipeline = q.filter(Pipeline.id == pipeline_id).first()
         if not pipeline:
             return None
         if current_user["role"] != "admin" and pipeline.user_id != current_user["id"]:
             return None
-        return pipeline.id
-    return _get_latest_pipeline_id_for_user(current_user["id"])
+        return pipeline
+    return (
+        q.filter(Pipeline.user_id == current_user["id"])
+        .order_by(Pipeline.created_at.desc())
+        .first()
+    )
+
+
+def _report_cache_policy(pipeline):
+    """Finished pipelines are immutable once addressed by id; "latest" views are revalidated."""
+    return finished_pipeline_policy(pipeline, immutable=bool(request.args.get("pipeline_id")))
 
 @app.route("/api/bandit")
 @jwt_required()
@@ -1347,18 +1063,25 @@ def bandit():
 @require_permission("reports.view")
 def sast():
     current_user = get_current_user_info()
-    pipeline_id = _resolve_accessible_pipeline_id(current_user, request.args.get("pipeline_id"))
-    if not pipeline_id:
+    pipeline = _resolve_accessible_pipeline(current_user, request.args.get("pipeline_id"))
+    if not pipeline:
         return jsonify({"error": "No report found. Run pipeline to see reports."}), 404
+    cache = _report_cache_policy(pipeline)
+    if is_not_modified(cache):
+        return not_modified(cache)
         
-    sr = ScanResult.query.filter_by(pipeline_id=pipeline_id, scanner_type="SAST").first()
+    sr = ScanResult.query.filter_by(pipeline_id=pipeline.id, scanner_type="SAST").first()
     if not sr:
         return jsonify({"error": "SAST report not found for this pipeline."}), 404
         
-    vulns = Vulnerability.query.filter_by(scan_result_id=sr.id).order_by(Vulnerability.severity).all()
+    try:
+        vulns, next_cursor = _findings_page(Vulnerability, sr.id)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
     results = [v.to_dict() for v in vulns]
+    meta = sr.extra_metadata
     
-    return jsonify({
+    return apply_cache_headers(jsonify({
         "metrics": {
             "totals": {
                 "critical": sr.critical_count,
@@ -1367,11 +1090,15 @@ def sast():
                 "low": sr.low_count,
                 "info": sr.info_count,
                 "total": sr.total_findings
-            }
+            },
+            "by_language": meta.get("by_language", {}),
+            "by_tool": meta.get("by_tool", {}),
         },
         "results": results,
+        "pipeline_id": pipeline.id,
+        "next_cursor": next_cursor,
         "generated_at": sr.created_at.isoformat()
-    })
+    }), cache)
 
 @app.route("/api/sast/languages")
 @jwt_required()
@@ -1386,15 +1113,21 @@ def sast_languages():
 @require_permission("reports.view")
 def trivy():
     current_user = get_current_user_info()
-    pipeline_id = _resolve_accessible_pipeline_id(current_user, request.args.get("pipeline_id"))
-    if not pipeline_id:
+    pipeline = _resolve_accessible_pipeline(current_user, request.args.get("pipeline_id"))
+    if not pipeline:
         return jsonify({"error": "No report found. Run pipeline to see reports."}), 404
+    cache = _report_cache_policy(pipeline)
+    if is_not_modified(cache):
+        return not_modified(cache)
         
-    sr = ScanResult.query.filter_by(pipeline_id=pipeline_id, scanner_type="Trivy").first()
+    sr = ScanResult.query.filter_by(pipeline_id=pipeline.id, scanner_type="Trivy").first()
     if not sr:
         return jsonify({"error": "Trivy report not found for this pipeline."}), 404
         
-    vulns = Vulnerability.query.filter_by(scan_result_id=sr.id).order_by(Vulnerability.severity).all()
+    try:
+        vulns, next_cursor = _findings_page(Vulnerability, sr.id)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
     
     # Pack into legacy format for frontend compatibility if needed, else flat list
     # The frontend expects {"Results": [{"Vulnerabilities": [...]}]}
@@ -1412,39 +1145,50 @@ def trivy():
             "PrimaryURL": v.url
         })
         
-    return jsonify({
+    return apply_cache_headers(jsonify({
         "Results": [{"Target": "Container", "Vulnerabilities": packed_vulns}],
         "CreatedAt": sr.created_at.isoformat(),
         "metrics": {
             "critical": sr.critical_count,
             "high": sr.high_count,
             "medium": sr.medium_count,
-            "low": sr.low_count
-        }
-    })
+            "low": sr.low_count,
+            "total": sr.total_findings,
+        },
+        "pipeline_id": pipeline.id,
+        "next_cursor": next_cursor,
+    }), cache)
 
 
 @app.route("/api/gitleaks")
 @jwt_required()
 def gitleaks():
     current_user = get_current_user_info()
-    pipeline_id = _resolve_accessible_pipeline_id(current_user, request.args.get("pipeline_id"))
-    if not pipeline_id:
+    pipeline = _resolve_accessible_pipeline(current_user, request.args.get("pipeline_id"))
+    if not pipeline:
         return jsonify({"error": "No report found. Run pipeline to see reports."}), 404
+    cache = _report_cache_policy(pipeline)
+    if is_not_modified(cache):
+        return not_modified(cache)
         
-    sr = ScanResult.query.filter_by(pipeline_id=pipeline_id, scanner_type="Gitleaks").first()
+    sr = ScanResult.query.filter_by(pipeline_id=pipeline.id, scanner_type="Gitleaks").first()
     if not sr:
         return jsonify({"error": "Gitleaks report not found. Run a scan first."}), 404
         
-    secrets = Secret.query.filter_by(scan_result_id=sr.id).all()
+    try:
+        secrets, next_cursor = _findings_page(Secret, sr.id)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
     results = [s.to_dict() for s in secrets]
     
     # Pack for legacy frontend format: list of secrets, or dict with "results"
-    return jsonify({
+    return apply_cache_headers(jsonify({
         "results": results,
         "total_secrets": sr.total_findings,
+        "pipeline_id": pipeline.id,
+        "next_cursor": next_cursor,
         "timestamp": sr.created_at.isoformat()
-    })
+    }), cache)
 
 
 @app.route("/api/dast")
@@ -1453,16 +1197,21 @@ def gitleaks():
 @require_permission("reports.view")
 def dast():
     current_user = get_current_user_info()
-    pipeline_id = _resolve_accessible_pipeline_id(current_user, request.args.get("pipeline_id"))
-    if not pipeline_id:
+    pipeline = _resolve_accessible_pipeline(current_user, request.args.get("pipeline_id"))
+    if not pipeline:
         return jsonify({"error": "No report found. Run pipeline to see reports."}), 404
+    cache = _report_cache_policy(pipeline)
+    if is_not_modified(cache):
+        return not_modified(cache)
         
-    sr = ScanResult.query.filter_by(pipeline_id=pipeline_id, scanner_type="DAST").first()
+    sr = ScanResult.query.filter_by(pipeline_id=pipeline.id, scanner_type="DAST").first()
     if not sr:
         return jsonify({"error": "DAST report not found. Run a scan first."}), 404
         
-    vulns = Vulnerability.query.filter_by(scan_result_id=sr.id).order_by(Vulnerability.severity).all()
-    results = [v.to_dict() for v in vulns]
+    try:
+        vulns, next_cursor = _findings_page(Vulnerability, sr.id)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
     
     # Repack for frontend
     alerts = []
@@ -1476,8 +1225,11 @@ def dast():
             "cweid": v.cwe_id
         })
     
-    return jsonify({
+    return apply_cache_headers(jsonify({
         "results": alerts,
+        "total_alerts": sr.total_findings,
+        "pipeline_id": pipeline.id,
+        "next_cursor": next_cursor,
         "timestamp": sr.created_at.isoformat(),
         "metrics": {
             "high": sr.high_count,
@@ -1485,40 +1237,28 @@ def dast():
             "low": sr.low_count,
             "info": sr.info_count
         }
-    })
+    }), cache)
 
 
 @app.route("/api/summary")
 @jwt_required()
 def summary():
     """Aggregate summary across all scanners."""
-    sast_data = load_json_file("sast-report.json")
-    bandit_data = load_json_file("bandit-report.json")
-    trivy_data = load_json_file("trivy-report.json")
+    report_dir = _get_latest_report_dir_for_user(get_current_user_info()["id"])
+    scans = load_scan_summaries_for(report_dir)
 
     # SAST metrics
     sast_metrics = {"total": 0, "critical": 0, "high": 0, "medium": 0, "low": 0, "languages": [], "tools": []}
-    if sast_data and "metrics" in sast_data:
-        totals = sast_data["metrics"].get("totals", {})
-        sast_metrics = {
-            "total": totals.get("total_issues", 0),
-            "critical": totals.get("critical", 0),
-            "high": totals.get("high", 0),
-            "medium": totals.get("medium", 0),
-            "low": totals.get("low", 0),
-            "languages": sast_data.get("languages_detected", []),
-            "tools": sast_data.get("tools_used", []),
-        }
-    elif bandit_data and "metrics" in bandit_data:
-        totals = bandit_data["metrics"].get("_totals", {})
+    sast = scans.get("SAST")
+    if sast and sast.meta:
         sast_metrics = {
-            "total": len(bandit_data.get("results", [])),
-            "critical": 0,
-            "high": totals.get("SEVERITY.HIGH", 0),
-            "medium": totals.get("SEVERITY.MEDIUM", 0),
-            "low": totals.get("SEVERITY.LOW", 0),
-            "languages": ["python"],
-            "tools": ["bandit"],
+            "total": sast.total,
+            "critical": sast.count("CRITICAL"),
+            "high": sast.count("HIGH"),
+            "medium": sast.count("MEDIUM"),
+            "low": sast.count("LOW"),
+            "languages": sast.meta.get("languages_detected", []),
+            "tools": sast.meta.get("tools_used", []),
         }
 
     bandit_metrics = {
@@ -1530,43 +1270,45 @@ def summary():
 
     # Trivy metrics
     trivy_metrics = {"total": 0, "critical": 0, "high": 0, "medium": 0, "low": 0}
-    if trivy_data and "Results" in trivy_data:
-        for result in trivy_data["Results"]:
-            for vuln in result.get("Vulnerabilities", []):
-                trivy_metrics["total"] += 1
-                sev = vuln.get("Severity", "").upper()
-                if sev.lower() in trivy_metrics:
-                    trivy_metrics[sev.lower()] += 1
+    trivy = scans.get("Trivy")
+    if trivy:
+        trivy_metrics = {
+            "total": trivy.total,
+            "critical": trivy.count("CRITICAL"),
+            "high": trivy.count("HIGH"),
+            "medium": trivy.count("MEDIUM"),
+            "low": trivy.count("LOW"),
+        }
 
     # Gitleaks metrics
-    gitleaks_data = load_json_file("gitleaks-report.json")
     gitleaks_metrics = {"total": 0, "critical": 0, "high": 0, "medium": 0, "tool": "none", "tool_available": False}
-    if gitleaks_data:
+    gitleaks = scans.get("Gitleaks")
+    if gitleaks and gitleaks.meta:
         gitleaks_metrics = {
-            "total": gitleaks_data.get("total_secrets", 0),
-            "critical": gitleaks_data.get("metrics", {}).get("critical", 0),
-            "high": gitleaks_data.get("metrics", {}).get("high", 0),
-            "medium": gitleaks_data.get("metrics", {}).get("medium", 0),
-            "tool": gitleaks_data.get("tool", "unknown"),
-            "tool_available": gitleaks_data.get("tool_available", False),
+            "total": gitleaks.total,
+            "critical": gitleaks.count("CRITICAL"),
+            "high": gitleaks.count("HIGH"),
+            "medium": gitleaks.count("MEDIUM"),
+            "tool": gitleaks.meta.get("tool", "unknown"),
+            "tool_available": gitleaks.meta.get("tool_available", False),
         }
 
     # DAST metrics
-    dast_data = load_json_file("dast-report.json")
     dast_metrics = {
         "total": 0, "high": 0, "medium": 0, "low": 0, "informational": 0,
         "tool": "none", "tool_available": False, "target_url": "",
     }
-    if dast_data:
+    dast = scans.get("DAST")
+    if dast and dast.meta:
         dast_metrics = {
-            "total": dast_data.get("total_alerts", 0),
-            "high": dast_data.get("metrics", {}).get("high", 0),
-            "medium": dast_data.get("metrics", {}).get("medium", 0),
-            "low": dast_data.get("metrics", {}).get("low", 0),
-            "informational": dast_data.get("metrics", {}).get("informational", 0),
-            "tool": dast_data.get("tool", "unknown"),
-            "tool_available": dast_data.get("tool_available", False),
-            "target_url": dast_data.get("target_url", ""),
+            "total": dast.total,
+            "high": dast.count("HIGH"),
+            "medium": dast.count("MEDIUM"),
+            "low": dast.count("LOW"),
+            "informational": dast.count("INFORMATIONAL"),
+            "tool": dast.meta.get("tool", "unknown"),
+            "tool_available": dast.meta.get("tool_available", False),
+            "target_url": dast.meta.get("target_url", ""),
         }
 
     return jsonify({
@@ -1593,11 +1335,11 @@ def api_health():
         "status": "healthy",
         "timestamp": utcnow().isoformat(),
         "reports": {
-            "sast": os.path.exists(os.path.join(REPORT_DIR, "sast-report.json")),
-            "bandit": os.path.exists(os.path.join(REPORT_DIR, "bandit-report.json")),
-            "trivy": os.path.exists(os.path.join(REPORT_DIR, "trivy-report.json")),
-            "gitleaks": os.path.exists(os.path.join(REPORT_DIR, "gitleaks-report.json")),
-            "dast": os.path.exists(os.path.join(REPORT_DIR, "dast-report.json")),
+            "sast": report_exists(os.path.join(REPORT_DIR, "sast-report.json")),
+            "bandit": report_exists(os.path.join(REPORT_DIR, "bandit-report.json")),
+            "trivy": report_exists(os.path.join(REPORT_DIR, "trivy-report.json")),
+            "gitleaks": report_exists(os.path.join(REPORT_DIR, "gitleaks-report.json")),
+            "dast": report_exists(os.path.join(REPORT_DIR, "dast-report.json")),
         },
     })
 
@@ -1606,30 +1348,150 @@ def api_health():
 # NOTIFICATION ROUTES
 # ====================================================================
 
+# Notifications per page of GET /api/notifications
+NOTIFICATIONS_PAGE_LIMIT = 20
+NOTIFICATIONS_PAGE_MAX_LIMIT = 100
+# An open notification stream checks the database for notifications created
+# by other processes (and sends a keep-alive) this often, and is closed after
+# EVENT_STREAM_MAX_SECONDS so the browser reconnects and threads are recycled
+EVENT_STREAM_POLL_SECONDS = float(os.getenv("EVENT_STREAM_POLL_SECONDS", "15"))
+EVENT_STREAM_MAX_SECONDS = float(os.getenv("EVENT_STREAM_MAX_SECONDS", "300"))
+
+
+def _event_stream_response(generate):
+    response = app.response_class(stream_with_context(generate()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Tell nginx-style proxies not to buffer the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _notification_counts(user_id):
+    """(total, unread) notifications of ``user_id`` in one indexed query."""
+    return db.session.query(
+        db.func.count(),
+        db.func.count().filter(Notification.read.is_(False)),
+    ).filter(Notification.user_id == user_id).one()
+
+
 @app.route("/api/notifications", methods=["GET"])
 @jwt_required()
 @require_permission("notifications.view")
 @require_permission("notifications.view")
 def get_all_notifications():
-    _ensure_pipeline_worker()
+    """Newest-first notifications, paginated by an opaque keyset cursor."""
     current_user = get_current_user_info()
-    notifications = (
-        Notification.query
-        .filter(
-            Notification.user_id == current_user["id"],
-            Notification.user_id.isnot(None),
-        )
-        .order_by(Notification.created_at.desc())
-        .all()
-    )
-    unread_count = sum(1 for n in notifications if not n.read)
+    limit = max(1, min(request.args.get("limit", NOTIFICATIONS_PAGE_LIMIT, type=int),
+                       NOTIFICATIONS_PAGE_MAX_LIMIT))
+    q = Notification.query.filter(Notification.user_id == current_user["id"])
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            created_at, after_id = _decode_cursor(cursor, 2)
+            created_at = datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid cursor"}), 400
+        q = q.filter(db.or_(
+            Notification.created_at < created_at,
+            db.and_(Notification.created_at == created_at, Notification.id < after_id),
+        ))
+
+    rows = q.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_cursor(page[-1].created_at.isoformat(), page[-1].id)
+    total, unread_count = _notification_counts(current_user["id"])
     return jsonify({
-        "notifications": [n.to_dict() for n in notifications],
+        "notifications": [n.to_dict() for n in page],
         "unreadCount": unread_count,
-        "total": len(notifications),
+        "total": total,
+        "next_cursor": next_cursor,
     })
 
 
+@app.route("/api/notifications/unread-count", methods=["GET"])
+@jwt_required()
+@require_permission("notifications.view")
+def get_unread_notification_count():
+    current_user = get_current_user_info()
+    total, unread_count = _notification_counts(current_user["id"])
+    return jsonify({"unreadCount": unread_count, "total": total})
+
+
+@app.route("/api/notifications/stream", methods=["GET"])
+@jwt_required()
+@require_permission("notifications.view")
+def stream_notifications():
+    """Server-sent events: a ``notification`` event per new notification.
+
+    Notifications are pushed as soon as they are committed, by this process
+    or, through the event bridge, by another one (an external worker);
+    without the bridge, other processes' notifications are picked up every
+    EVENT_STREAM_POLL_SECONDS. A reconnecting client sends
+    Last-Event-ID and receives what it missed. A ``resync`` event means
+    events were dropped and the client should refetch the list.
+    """
+    user_id = get_current_user_info()["id"]
+    since, resumed_from = utcnow(), None
+    last_event_id = request.headers.get("Last-Event-ID")
+    if last_event_id:
+        try:
+            created_at, resumed_from = _decode_cursor(last_event_id, 2)
+            since = datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            resumed_from = None
+    subscription = event_broker.subscribe(user_channel(user_id))
+    if subscription is None:
+        return jsonify({"error": "Too many open event streams"}), 503
+    # The request's session is not used by the stream; give back its connection
+    db.session.remove()
+
+    def catch_up(after, sent):
+        """Notifications created at or after ``after`` not already in ``sent``."""
+        try:
+            rows = (
+                Notification.query
+                .filter(Notification.user_id == user_id, Notification.created_at >= after)
+                .order_by(Notification.created_at, Notification.id)
+                .limit(NOTIFICATIONS_PAGE_MAX_LIMIT)
+                .all()
+            )
+            return [n.to_dict() for n in rows if n.id not in sent]
+        finally:
+            db.session.remove()
+
+    def generate():
+        nonlocal since
+        # ids already sent that were created at ``since``
+        sent = {resumed_from} if resumed_from else set()
+        deadline = time.monotonic() + EVENT_STREAM_MAX_SECONDS
+        with subscription:
+            yield f"retry: {int(EVENT_STREAM_POLL_SECONDS * 1000)}\n\n"
+            pending = catch_up(since, sent) if resumed_from else []
+            while time.monotonic() < deadline:
+                for payload in pending:
+                    created_at = datetime.fromisoformat(payload["created_at"])
+                    if created_at > since:
+                        since, sent = created_at, set()
+                    sent.add(payload["id"])
+                    yield format_sse("notification", payload,
+                                     _encode_cursor(payload["created_at"], payload["id"]))
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield format_sse("resync", {})
+                event = subscription.get(timeout=EVENT_STREAM_POLL_SECONDS)
+                if event is not None:
+                    pending = [event[1]] if event[0] == "notification" else []
+                    continue
+                pending = catch_up(since, sent)
+                if not pending:
+                    yield ": keep-alive\n\n"
+
+    return _event_stream_response(generate)
+
+
 @app.route("/api/notifications/<notification_id>/read", methods=["POST"])
 @jwt_required()
 @require_permission("notifications.view")
@@ -1688,9 +1550,9 @@ def get_setup_status():
     policy_configured = policy.configured
     initial_scan_completed = config.initial_scan_completed
 
-    has_bandit = os.path.exists(os.path.join(REPORT_DIR, "bandit-report.json"))
-    has_trivy = os.path.exists(os.path.join(REPORT_DIR, "trivy-report.json"))
-    has_decision = os.path.exists(os.path.join(REPORT_DIR, "security_decision.json"))
+    has_bandit = report_exists(os.path.join(REPORT_DIR, "bandit-report.json"))
+    has_trivy = report_exists(os.path.join(REPORT_DIR, "trivy-report.json"))
+    has_decision = report_exists(os.path.join(REPORT_DIR, "security_decision.json"))
 
     setup_completed = repo_configured and policy_configured and initial_scan_completed
 
@@ -1812,9 +1674,7 @@ def reset_setup():
 
     # Clear report files
     for report in ["bandit-report.json", "trivy-report.json", "security_decision.json"]:
-        path = os.path.join(REPORT_DIR, report)
-        if os.path.exists(path):
-            os.remove(path)
+        remove_report(os.path.join(REPORT_DIR, report))
 
     return jsonify({"success": True, "message": "Platform reset to initial state"})
 
@@ -1823,135 +1683,60 @@ def reset_setup():
 # PIPELINE ROUTES  (user-scoped — each user sees only their own data)
 # ====================================================================
 
-def _pipeline_worker_loop():
-    global _active_pipeline_id
-    print("DEBUG WORKER: Started _pipeline_worker_loop")
-    while True:
-        job = _pipeline_job_queue.get()
-        print(f"DEBUG WORKER: Received job: {job}")
-        pipeline = job.get("pipeline") if isinstance(job, dict) else None
-        pipeline_id = getattr(pipeline, "id", None)
-        print(f"DEBUG WORKER: Processing pipeline_id={pipeline_id}")
-
-        if job is None or pipeline is None or not pipeline_id:
-            _pipeline_job_queue.task_done()
-            continue
-
-        with _pipeline_queue_state_lock:
-            _active_pipeline_id = pipeline_id
-
-        executor = job["executor"]
-        repo_url = job.get("repo_url")
-        target_dir = job.get("target_dir")
-        image_name = job.get("image_name")
-        scan_prefs = job.get("scan_prefs")
-
-        try:
-            with app.app_context():
-                db_pipeline = db.session.get(Pipeline, pipeline.id)
-                if db_pipeline:
-                    db_pipeline.status = "running"
-                    db_pipeline.started_at = utcnow()
-                    db_pipeline.stages = pipeline.stages
-                    db.session.commit()
-
-                try:
-                    result = executor.run_pipeline(
-                        pipeline,
-                        repo_url=repo_url,
-                        target_dir=target_dir,
-                        image_name=image_name,
-                        scan_prefs=scan_prefs,
-                    )
-                    if db_pipeline:
-                        db_pipeline.status = _normalize_status(result.status)
-                        db_pipeline.security_score = result.security_score
-                        db_pipeline.is_deployable = result.is_deployable
-                        db_pipeline.vulnerability_summary = result.vulnerability_summary or {}
-                        db_pipeline.stages = result.stages or {}
-                        db_pipeline.duration_seconds = result.duration_seconds
-                        db_pipeline.ai_prediction_data = getattr(result, "ai_prediction", None)
-                        db_pipeline.completed_at = utcnow()
-                        db.session.commit()
-                        check_and_notify_pipeline_completion(db_pipeline.to_dict())
-                    _store_scan_results_from_reports(pipeline.id, executor.reports_dir)
-                except Exception as exc:
-                    if db_pipeline:
-                        db_pipeline.status = "failed"
-                        db_pipeline.completed_at = utcnow()
-                        stages = db_pipeline.stages or {}
-                        stages["pipeline_error"] = {
-                            "name": "Pipeline Error",
-                            "status": "failed",
-                            "error": str(exc),
-                        }
-                        db_pipeline.stages = stages
-                        db.session.commit()
-                        check_and_notify_pipeline_completion(db_pipeline.to_dict())
-        except Exception as worker_exc:
-            with app.app_context():
-                db_pipeline = db.session.get(Pipeline, pipeline.id)
-                if db_pipeline and db_pipeline.status in ("queued", "running"):
-                    db_pipeline.status = "failed"
-                    db_pipeline.completed_at = utcnow()
-                    stages = db_pipeline.stages or {}
-                    stages["pipeline_error"] = {
-                        "name": "Pipeline Worker Error",
-                        "status": "failed",
-                        "error": str(worker_exc),
-                    }
-                    db_pipeline.stages = stages
-                    db.session.commit()
-        finally:
-            with _pipeline_queue_state_lock:
-                _queued_pipeline_ids.discard(pipeline_id)
-                _active_pipeline_id = None
-            _pipeline_job_queue.task_done()
-            _recover_orphaned_queued_pipelines()
-
-
-def _ensure_pipeline_worker():
-    global _pipeline_worker_started
-    with _pipeline_worker_lock:
-        if _pipeline_worker_started:
-            _recover_orphaned_queued_pipelines()
-            return
-        worker = threading.Thread(target=_pipeline_worker_loop, daemon=True)
-        worker.start()
-        _pipeline_worker_started = True
-    _recover_orphaned_queued_pipelines()
-
-
 def run_pipeline_async_db(
-    executor: PipelineExecutor,
-    pipeline,
+    pipeline_id: str,
     repo_url: str = None,
     target_dir: str = None,
     image_name: str = None,
     scan_prefs: dict = None,
 ):
-    _ensure_pipeline_worker()
-    _enqueue_pipeline_job(
-        {
-            "executor": executor,
-            "pipeline": pipeline,
-            "repo_url": repo_url,
-            "target_dir": target_dir,
-            "image_name": image_name,
-            "scan_prefs": scan_prefs,
-        }
-    )
+    """Queue an existing Pipeline row for execution by any worker."""
+    db_pipeline = db.session.get(Pipeline, pipeline_id)
+    if not db_pipeline:
+        return None
+    db_pipeline.status = "queued"
+    db_pipeline.job_spec = {
+        "repo_url": repo_url,
+        "target_dir": target_dir,
+        "image_name": image_name,
+        "scan_prefs": scan_prefs or {},
+    }
+    db.session.commit()
+    publish_pipeline_status(db_pipeline)
+    pipeline_workers.wakeup()
     return None
 
+PIPELINE_LIST_MAX_LIMIT = 100
+# Longest per-day series the trend and analytics endpoints return
+TREND_MAX_DAYS = 366
+TREND_FIELDS = (
+    "id", "created_at", "completed_at", "status", "security_score",
+    "is_deployable", "branch", "vulnerability_summary",
+)
+
+
 @app.route("/api/pipelines", methods=["GET"])
 @jwt_required()
 def get_pipelines():
-    _ensure_pipeline_worker()
+    """Newest-first pipeline list, paginated by an opaque keyset cursor.
+
+    Query parameters: ``limit`` (max PIPELINE_LIST_MAX_LIMIT), ``cursor``
+    (``next_cursor`` of the previous page), ``fields`` (comma-separated,
+    default Pipeline.LIST_FIELDS), ``count=true`` to include the exact
+    ``total``, ``repo`` and, for admins, ``all=true``.
+    """
     current_user = get_current_user_info()
-    limit = request.args.get("limit", 20, type=int)
+    limit = max(1, min(request.args.get("limit", 20, type=int), PIPELINE_LIST_MAX_LIMIT))
     show_all = request.args.get("all", "false").lower() == "true"
 
-    q = Pipeline.query.order_by(Pipeline.created_at.desc())
+    fields = Pipeline.LIST_FIELDS
+    if request.args.get("fields"):
+        fields = tuple(dict.fromkeys(f.strip() for f in request.args["fields"].split(",") if f.strip()))
+        unknown = [f for f in fields if f not in Pipeline.API_FIELDS]
+        if unknown:
+            return jsonify({"error": f"Unknown fields: {', '.join(unknown)}"}), 400
+
+    q = Pipeline.query
 
     # Admins can pass ?all=true to see the global view; everyone else is scoped
     if not (show_all and current_user["role"] == "admin"):
@@ -1961,9 +1746,34 @@ def get_pipelines():
     if repo:
         q = q.filter(Pipeline.github_repo == repo)
 
-    total = q.count()
-    pipelines = [p.to_dict() for p in q.limit(limit).all()]
-    return jsonify({"pipelines": pipelines, "total": total})
+    response = {}
+    if request.args.get("count", "false").lower() == "true":
+        response["total"] = q.with_entities(db.func.count(Pipeline.id)).scalar()
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            after_created_at, after_id = _decode_cursor(cursor, 2)
+            after_created_at = datetime.fromisoformat(after_created_at)
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid cursor"}), 400
+        q = q.filter(db.or_(
+            Pipeline.created_at < after_created_at,
+            db.and_(Pipeline.created_at == after_created_at, Pipeline.id < after_id),
+        ))
+
+    # id and created_at are always loaded: they form the cursor
+    columns = Pipeline.columns_for(dict.fromkeys(("id", "created_at") + tuple(fields)))
+    rows = (
+        q.options(load_only(*columns))
+        .order_by(Pipeline.created_at.desc(), Pipeline.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    page, more = rows[:limit], len(rows) > limit
+    response["pipelines"] = [p.to_dict(fields) for p in page]
+    response["next_cursor"] = _encode_cursor(page[-1].created_at.isoformat(), page[-1].id) if more else None
+    return jsonify(response)
 
 
 @app.route("/api/pipelines/trends", methods=["GET"])
@@ -1971,13 +1781,22 @@ def get_pipelines():
 @require_permission("pipelines.view")
 @require_permission("pipelines.view")
 def get_pipeline_trends():
+    """The user's last ``limit`` runs (oldest first) plus a per-day series of
+    the last ``days`` days read from the daily rollups."""
     current_user = get_current_user_info()
-    limit = request.args.get("limit", 30, type=int)
+    limit = max(1, min(request.args.get("limit", 30, type=int), PIPELINE_LIST_MAX_LIMIT))
+    days = max(1, min(request.args.get("days", 30, type=int), TREND_MAX_DAYS))
     q = Pipeline.query.filter(Pipeline.user_id == current_user["id"])
     repo = request.args.get("repo")
     if repo:
         q = q.filter(Pipeline.github_repo == repo)
-    pipelines = q.order_by(Pipeline.created_at.asc()).limit(limit).all()
+    pipelines = (
+        q.options(load_only(*Pipeline.columns_for(TREND_FIELDS)))
+        .order_by(Pipeline.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    pipelines.reverse()
     trend_data = []
     for p in pipelines:
         vsummary = p.vulnerability_summary or {}
@@ -1996,7 +1815,8 @@ def get_pipeline_trends():
             "low": vsummary.get("low", 0),
             "max_cvss_score": getattr(p, "max_cvss_score", None),
         })
-    return jsonify({"trends": trend_data, "total": len(trend_data)})
+    daily = daily_series(utcnow().date() - timedelta(days=days - 1), user_id=current_user["id"], repo=repo)
+    return jsonify({"trends": trend_data, "total": len(trend_data), "daily": daily})
 
 
 @app.route("/api/pipelines/<pipeline_id>", methods=["GET"])
@@ -2005,31 +1825,147 @@ def get_pipeline_trends():
 @require_permission("pipelines.view")
 def get_pipeline(pipeline_id):
     current_user = get_current_user_info()
-    pipeline = db.session.get(Pipeline, pipeline_id)
-    if not pipeline:
-        return jsonify({"error": "Pipeline not found"}), 404
     # Admins can access any pipeline; regular users only their own
-    if current_user["role"] != "admin" and pipeline.user_id != current_user["id"]:
-        return jsonify({"error": "Not found"}), 404
-    return jsonify(pipeline.to_dict())
-    
+    state = _resolve_accessible_pipeline(current_user, pipeline_id)
+    if not state:
+        return jsonify({"error": "Pipeline not found"}), 404
+    cache = finished_pipeline_policy(state)
+    if is_not_modified(cache):
+        return not_modified(cache)
+    pipeline = db.session.get(Pipeline, state.id)
+    return apply_cache_headers(jsonify(pipeline.to_dict()), cache)
+
+
+# A pipeline stream is open while the pipeline is in one of these
+LIVE_PIPELINE_STATUSES = ("queued", "running")
+# Events relayed by the pipeline streams
+PIPELINE_STREAM_EVENTS = ("status", "stage", "log")
+
+
+def _pipeline_event_stream(subscription, first_events=(), pipeline_id=None):
+    """SSE generator relaying ``subscription``'s pipeline events.
+
+    ``first_events`` are (event, data) pairs sent up front. With
+    ``pipeline_id``, the stream ends once that pipeline leaves
+    LIVE_PIPELINE_STATUSES; otherwise after EVENT_STREAM_MAX_SECONDS.
+    """
+    def ends_stream(event, data):
+        return (
+            pipeline_id is not None
+            and event in ("pipeline", "status")
+            and data.get("pipeline_id") == pipeline_id
+            and data.get("status") not in LIVE_PIPELINE_STATUSES
+        )
+
+    def generate():
+        # Ids only mark frames as received; a client reconnecting with
+        # Last-Event-ID is told to resync
+        sequence = 0
+        deadline = time.monotonic() + EVENT_STREAM_MAX_SECONDS
+        with subscription:
+            yield f"retry: {int(EVENT_STREAM_POLL_SECONDS * 1000)}\n\n"
+            for event, data in first_events:
+                sequence += 1
+                yield format_sse(event, data, str(sequence))
+                if ends_stream(event, data):
+                    return
+            while time.monotonic() < deadline:
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield format_sse("resync", {})
+                item = subscription.get(timeout=EVENT_STREAM_POLL_SECONDS)
+                if item is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                event, data = item
+                if event not in PIPELINE_STREAM_EVENTS:
+                    continue
+                sequence += 1
+                yield format_sse(event, data, str(sequence))
+                if ends_stream(event, data):
+                    return
+
+    return generate
+
+
+@app.route("/api/pipelines/events", methods=["GET"])
+@jwt_required()
+@require_permission("pipelines.view")
+def stream_user_pipeline_events():
+    """Server-sent events of all of the user's pipelines.
+
+    ``status`` events carry a pipeline's committed status and results,
+    ``stage`` events a stage transition (with the log ``line`` it added)
+    and ``log`` events a line of scanner output as it is printed. Events
+    are not replayed: a ``resync`` event (also sent when the client
+    reconnects) means the client should refetch the pipelines it shows.
+    """
+    user_id = get_current_user_info()["id"]
+    subscription = event_broker.subscribe(user_channel(user_id))
+    if subscription is None:
+        return jsonify({"error": "Too many open event streams"}), 503
+    db.session.remove()
+    first_events = [("resync", {})] if request.headers.get("Last-Event-ID") else []
+    return _event_stream_response(_pipeline_event_stream(subscription, first_events))
+
+
+@app.route("/api/pipelines/<pipeline_id>/events", methods=["GET"])
+@jwt_required()
+@require_permission("pipelines.view")
+def stream_pipeline_events(pipeline_id):
+    """Server-sent events of one queued or running pipeline.
+
+    Opens with a ``pipeline`` event carrying its status and stages, then
+    relays its ``status``, ``stage`` and ``log`` events (see
+    stream_user_pipeline_events) and ends once the pipeline has finished.
+    A pipeline that is no longer live gets 204: there is nothing to stream.
+    """
+    current_user = get_current_user_info()
+    state = _resolve_accessible_pipeline(current_user, pipeline_id)
+    if not state:
+        return jsonify({"error": "Pipeline not found"}), 404
+    if state.status not in LIVE_PIPELINE_STATUSES:
+        return "", 204
+    # Subscribe before reading the snapshot so no transition falls in between
+    subscription = event_broker.subscribe(pipeline_channel(state.id))
+    if subscription is None:
+        return jsonify({"error": "Too many open event streams"}), 503
+    fields = PIPELINE_EVENT_FIELDS + ("stages",)
+    try:
+        pipeline = (
+            Pipeline.query.options(load_only(*Pipeline.columns_for(fields)))
+            .filter(Pipeline.id == state.id)
+            .one()
+        )
+        snapshot = {**pipeline.to_dict(fields), "pipeline_id": state.id}
+    except Exception:
+        subscription.close()
+        raise
+    finally:
+        db.session.remove()
+    return _event_stream_response(
+        _pipeline_event_stream(subscription, [("pipeline", snapshot)], pipeline_id=state.id)
+    )
+
 
 @app.route("/api/pipelines/<pipeline_id>/ai-prediction", methods=["GET"])
 @jwt_required()
 def get_ai_prediction(pipeline_id):
     current_user = get_current_user_info()
-    pipeline = db.session.get(Pipeline, pipeline_id)
-    if not pipeline:
-        return jsonify({"error": "Pipeline not found"}), 404
     # Admins can access any pipeline; regular users only their own
-    if current_user["role"] != "admin" and pipeline.user_id != current_user["id"]:
-        return jsonify({"error": "Not found"}), 404
+    state = _resolve_accessible_pipeline(current_user, pipeline_id)
+    if not state:
+        return jsonify({"error": "Pipeline not found"}), 404
+    cache = finished_pipeline_policy(state)
+    if is_not_modified(cache):
+        return not_modified(cache)
         
     # Return the AI prediction stored in the database
-    return jsonify({
+    pipeline = db.session.get(Pipeline, state.id)
+    return apply_cache_headers(jsonify({
         "pipeline_id": pipeline_id, 
         "ai_prediction": pipeline.ai_prediction_data
-    })
+    }), cache)
 
 
 @app.route("/api/pipelines/latest", methods=["GET"])
@@ -2080,9 +2016,8 @@ def generate_ai_fix(pipeline_id):
         from pipeline.ai_predictor import generate_fix
         sast_path = os.path.join(pipeline.report_dir, "sast-report.json") if pipeline.report_dir else None
         source_code = ""
-        if sast_path and os.path.exists(sast_path):
-            with open(sast_path) as f:
-                sast = json.load(f)
+        sast = load_report(sast_path) if sast_path else None
+        if isinstance(sast, dict):
             results = sast.get("results", [])
             if 0 <= vuln_index < len(results):
                 vuln_data = results[vuln_index]
@@ -2092,86 +2027,6 @@ def generate_ai_fix(pipeline_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-# Track already-notified pipelines
-_notified_pipelines: set = set()
-
-
-def check_and_notify_pipeline_completion(pipeline):
-    global _notified_pipelines
-    if not pipeline:
-        return
-    pipeline_id = pipeline.get("id")
-    user_id = pipeline.get("user_id")
-    status = pipeline.get("status", "").lower()
-    if pipeline_id in _notified_pipelines or status not in ("success", "failed"):
-        return
-
-    _notified_pipelines.add(pipeline_id)
-    if len(_notified_pipelines) > 100:
-        _notified_pipelines = set(list(_notified_pipelines)[-50:])
-
-    security_score = pipeline.get("security_score", 0)
-    is_deployable = pipeline.get("is_deployable", False)
-    vuln_summary = pipeline.get("vulnerability_summary", {})
-
-    if status == "success":
-        if vuln_summary.get("critical", 0) > 0:
-            add_notification(
-                "critical",
-                "Critical Vulnerabilities Detected",
-                f"{vuln_summary.get('critical', 0)} critical vulnerabilities detected in pipeline {pipeline_id}.",
-                {"pipeline_id": pipeline_id, "critical_count": vuln_summary.get("critical", 0)},
-                user_id=user_id,
-                event_key="critical_vuln",
-            )
-
-        if (vuln_summary.get("secrets_found", 0) or vuln_summary.get("secrets", 0)) > 0:
-            secret_total = vuln_summary.get("secrets_found", 0) or vuln_summary.get("secrets", 0)
-            add_notification(
-                "warning",
-                "Secret Detected",
-                f"{secret_total} secret finding(s) detected in pipeline {pipeline_id}.",
-                {"pipeline_id": pipeline_id, "secret_count": secret_total},
-                user_id=user_id,
-                event_key="secret_detected",
-            )
-
-        if is_deployable:
-            add_notification(
-                "success",
-                "Deployment Approved",
-                f"Pipeline passed security checks. Score: {security_score}/100",
-                {"pipeline_id": pipeline_id, "security_score": security_score},
-                user_id=user_id,
-                event_key="pipeline_success",
-            )
-        else:
-            reasons = []
-            if security_score < 70:
-                reasons.append(f"Score {security_score} below threshold")
-            if vuln_summary.get("critical", 0) > 0:
-                reasons.append(f"{vuln_summary['critical']} critical vulnerabilities")
-            if vuln_summary.get("high", 0) > 5:
-                reasons.append(f"{vuln_summary['high']} high severity issues")
-            reason_text = "; ".join(reasons) if reasons else "Security requirements not met"
-            add_notification(
-                "critical",
-                "Deployment Blocked",
-                f"Pipeline blocked. {reason_text}. Score: {security_score}/100",
-                {"pipeline_id": pipeline_id, "security_score": security_score, "reasons": reasons},
-                user_id=user_id,
-                event_key="deployment_blocked",
-            )
-    else:
-        add_notification(
-            "warning",
-            "Pipeline Failed",
-            "Security scan failed to complete",
-            {"pipeline_id": pipeline_id},
-            user_id=user_id,
-            event_key="pipeline_failure",
-        )
-
 
 @app.route("/api/pipelines/trigger", methods=["POST"])
 @jwt_required()
@@ -2228,11 +2083,7 @@ def trigger_pipeline():
 
     # --- Per-user, per-run report directory ---
     pipeline_id = str(uuid.uuid4())[:8]
-    user_report_dir = os.path.join(
-        os.path.dirname(BASE_DIR), "runtime", "reports",
-        str(current_user["id"]), pipeline_id
-    )
-    os.makedirs(user_report_dir, exist_ok=True)
+    user_report_dir = _pipeline_report_dir(current_user["id"], pipeline_id)
 
     # --- Create DB pipeline record ---
     github_repo_val = None
@@ -2267,16 +2118,6 @@ def trigger_pipeline():
     db.session.add(pipeline_record)
     db.session.commit()
 
-    # --- Create executor pipeline object (for async run) ---
-    pipeline = pipeline_executor.create_pipeline(
-        repo_url=repo_url,
-        branch=branch,
-        commit_sha=data.get("commit_sha", "manual"),
-        commit_message=data.get("commit_message", f"Manual trigger by {current_user['username']}"),
-        author=current_user["username"],
-        pipeline_id=pipeline_id,
-    )
-
     add_notification(
         "info",
         "Pipeline Triggered",
@@ -2292,8 +2133,7 @@ def trigger_pipeline():
         scan_prefs = settings.get_section("scanPreferences") or {}
 
     run_pipeline_async_db(
-        pipeline_executor,
-        pipeline,
+        pipeline_id,
         repo_url=repo_url if repo_url else None,
         target_dir=target_dir if target_dir else None,
         image_name=image_name if image_name else None,
@@ -2537,11 +2377,7 @@ def github_webhook():
     full_user = get_full_user_info(owner_user.id)
 
     pipeline_id = str(uuid.uuid4())[:8]
-    user_report_dir = os.path.join(
-        os.path.dirname(BASE_DIR), "runtime", "reports",
-        str(owner_user.id), pipeline_id
-    )
-    os.makedirs(user_report_dir, exist_ok=True)
+    user_report_dir = _pipeline_report_dir(owner_user.id, pipeline_id)
 
     github_repo_val = None
     if repo_url and "github.com/" in repo_url:
@@ -2575,22 +2411,12 @@ def github_webhook():
     db.session.add(pipeline_record)
     db.session.commit()
 
-    pipeline = pipeline_executor.create_pipeline(
-        repo_url=repo_url,
-        branch=branch,
-        commit_sha=commit_sha,
-        commit_message=commit_message,
-        author=author,
-        pipeline_id=pipeline_id,
-    )
-
     run_pipeline_async_db(
-        pipeline_executor,
-        pipeline,
+        pipeline_id,
         repo_url=repo_url,
         target_dir=None,
         image_name=None,
-        scan_prefs=scan_prefs
+        scan_prefs=scan_prefs,
     )
 
     git_prefs = owner_git_prefs or {}
@@ -2606,7 +2432,7 @@ def github_webhook():
         user_id=owner_user.id,
     )
 
-    return jsonify({"message": "Pipeline triggered", "pipeline_id": pipeline.id}), 202
+    return jsonify({"message": "Pipeline triggered", "pipeline_id": pipeline_id}), 202
 
 
 # ====================================================================
@@ -2714,6 +2540,10 @@ def validate_scan_input():
 # ADMIN PANEL
 # ====================================================================
 
+# Pipelines not yet folded into the daily rollups
+UNFINISHED_PIPELINE_STATUSES = ("queued", "running", "cancelled")
+
+
 @app.route("/api/admin/stats", methods=["GET"])
 @jwt_required()
 def admin_stats():
@@ -2721,33 +2551,44 @@ def admin_stats():
     if current_user["role"] != "admin":
         return jsonify({"error": "Admin access required"}), 403
 
-    # User stats via ORM
-    total_users = User.query.filter_by(is_active=True).count()
-    admin_count = User.query.filter_by(role="admin", is_active=True).count()
-    user_count = User.query.filter_by(role="user", is_active=True).count()
-    google_users = User.query.filter_by(auth_provider="google").count()
+    # User stats in one pass over users
+    total_users, admin_count, user_count, google_users = db.session.query(
+        db.func.count().filter(User.is_active.is_(True)),
+        db.func.count().filter(User.is_active.is_(True), User.role == "admin"),
+        db.func.count().filter(User.is_active.is_(True), User.role == "user"),
+        db.func.count().filter(User.auth_provider == "google"),
+    ).one()
     local_users = total_users - google_users
 
-    # Pipeline stats (ORM)
-    pipelines = Pipeline.query.all()
-    total_pipelines = len(pipelines)
-    successful = sum(1 for p in pipelines if p.status == "success")
-    failed = sum(1 for p in pipelines if p.status == "failed")
-    running = sum(1 for p in pipelines if p.status == "running" or p.status == "queued")
-    
-    scores = [p.security_score for p in pipelines if p.security_score is not None]
-    avg_score = round(sum(scores) / len(scores)) if scores else 0
-    deployable_count = sum(1 for p in pipelines if p.is_deployable)
-    blocked_count = sum(1 for p in pipelines if p.is_deployable is False and p.status == "success")
+    # Finished pipelines come from the daily rollups; only unfinished ones
+    # are counted live (an index range on status)
+    totals = rollup_totals()
+    unfinished = dict(
+        db.session.query(Pipeline.status, db.func.count())
+        .filter(Pipeline.status.in_(UNFINISHED_PIPELINE_STATUSES))
+        .group_by(Pipeline.status)
+        .all()
+    )
+    total_pipelines = totals["pipelines"] + sum(unfinished.values())
+    successful = totals["succeeded"]
+    failed = totals["failed"]
+    running = unfinished.get("running", 0) + unfinished.get("queued", 0)
+    avg_score = round(totals["score_sum"] / totals["scored"]) if totals["scored"] else 0
+    deployable_count = totals["deployable"]
+    blocked_count = totals["blocked"]
 
     # To maintain fallback compatibility for the UI toggle, we'll check if any rows exist in ScanResults
-    # instead of checking checking the raw JSON files.
+    # instead of checking checking the raw JSON files. One round trip for all scanners.
+    has_sast, has_trivy, has_gitleaks, has_dast = db.session.query(*(
+        db.exists().where(ScanResult.scanner_type == scanner)
+        for scanner in ("SAST", "Trivy", "Gitleaks", "DAST")
+    )).one()
     reports_status = {
-        "sast": ScanResult.query.filter_by(scanner_type="SAST").first() is not None,
+        "sast": has_sast,
         "bandit": False, # deprecated
-        "trivy": ScanResult.query.filter_by(scanner_type="Trivy").first() is not None,
-        "gitleaks": ScanResult.query.filter_by(scanner_type="Gitleaks").first() is not None,
-        "dast": ScanResult.query.filter_by(scanner_type="DAST").first() is not None,
+        "trivy": has_trivy,
+        "gitleaks": has_gitleaks,
+        "dast": has_dast,
         "decision": total_pipelines > 0, # Decision is implicit in the pipelines
     }
 
@@ -3031,21 +2872,32 @@ def scan_local():
     if not target_dir and not image_name:
         return jsonify({"error": "Either directory or image_name is required"}), 400
 
-    pipeline = pipeline_executor.create_pipeline(
+    # Local scans are queued like any other pipeline so whichever worker
+    # claims the row can run them.
+    pipeline_id = str(uuid.uuid4())[:8]
+    pipeline_record = Pipeline(
+        id=pipeline_id,
+        user_id=current_user["id"],
+        report_dir=_pipeline_report_dir(current_user["id"], pipeline_id),
         repo_url="",
+        repo_name=os.path.basename(os.path.normpath(target_dir)) if target_dir else image_name,
         branch="local",
         commit_sha="local",
         commit_message=f"Local scan by {current_user['username']}",
         author=current_user["username"],
+        status="queued",
     )
+    pipeline_record.triggered_by = current_user
+    db.session.add(pipeline_record)
+    db.session.commit()
+
     scan_prefs = {}
     user = db.session.get(User, current_user["id"])
     if user:
         settings = _get_or_create_settings(user)
         scan_prefs = settings.get_section("scanPreferences") or {}
     run_pipeline_async_db(
-        pipeline_executor,
-        pipeline,
+        pipeline_id,
         repo_url=None,
         target_dir=target_dir,
         image_name=image_name,
@@ -3055,10 +2907,10 @@ def scan_local():
         "info",
         "Local Scan Triggered",
         f"Security scan started for local path by {current_user['username']}",
-        {"pipeline_id": pipeline.id},
+        {"pipeline_id": pipeline_id},
         user_id=current_user["id"],
     )
-    return jsonify({"message": "Local scan triggered", "pipeline_id": pipeline.id}), 202
+    return jsonify({"message": "Local scan triggered", "pipeline_id": pipeline_id}), 202
 
 
 @app.route("/api/admin/analytics", methods=["GET"])
@@ -3068,32 +2920,15 @@ def admin_analytics():
     if current_user["role"] != "admin":
         return jsonify({"error": "Admin access required"}), 403
 
-    # Query vulnerabilities by severity
-    vuln_counts = db.session.query(
-        Vulnerability.severity, db.func.count(Vulnerability.id)
-    ).group_by(Vulnerability.severity).all()
-    
-    # Query secrets by severity
-    secret_counts = db.session.query(
-        Secret.severity, db.func.count(Secret.id)
-    ).group_by(Secret.severity).all()
-
-    critical_count = high_count = medium_count = low_count = total_secrets = 0
-    
-    for sev, count in vuln_counts:
-        s = (sev or "INFO").upper()
-        if s == "CRITICAL": critical_count += count
-        elif s == "HIGH": high_count += count
-        elif s == "MEDIUM": medium_count += count
-        elif s == "LOW": low_count += count
-        
-    for sev, count in secret_counts:
-        s = (sev or "CRITICAL").upper()
-        if s == "CRITICAL": critical_count += count
-        elif s == "HIGH": high_count += count
-        elif s == "MEDIUM": medium_count += count
-        elif s == "LOW": low_count += count
-        total_secrets += count
+    # Finding counts and trends come from the daily rollups, not the findings tables
+    totals = rollup_totals()
+    critical_count = totals["critical"]
+    high_count = totals["high"]
+    medium_count = totals["medium"]
+    low_count = totals["low"]
+    total_secrets = totals["secrets"]
+    days = max(1, min(request.args.get("days", 30, type=int), TREND_MAX_DAYS))
+    daily = daily_series(utcnow().date() - timedelta(days=days - 1))
 
     import shutil
 
@@ -3106,7 +2941,7 @@ def admin_analytics():
         "gitleaks": "online" if shutil.which("gitleaks") else "offline",
         "docker": "online" if shutil.which("docker") else "offline",
         "apiLatency": "< 50ms",
-        "queuedJobs": 0,
+        "queuedJobs": Pipeline.query.filter(Pipeline.status == "queued").count(),
     }
     if system_health["bandit"] == "offline" and system_health["semgrep"] == "offline":
         system_health["overallStatus"] = "degraded"
@@ -3123,27 +2958,44 @@ def admin_analytics():
             {"name": "Medium", "value": medium_count},
             {"name": "Low", "value": low_count},
         ],
-        "vulnTrend": [],
-        "secretTrend": [],
-        "deployTrend": [],
+        "vulnTrend": [
+            {k: d[k] for k in ("date", "critical", "high", "medium", "low", "total")} for d in daily
+        ],
+        "secretTrend": [{"date": d["date"], "secrets": d["secrets"]} for d in daily],
+        "deployTrend": [
+            {k: d[k] for k in ("date", "pipelines", "succeeded", "failed", "deployable", "blocked")}
+            for d in daily
+        ],
         "systemHealth": system_health,
         "criticalTrend": {"value": critical_count, "direction": "up" if critical_count > 0 else "flat", "label": "current"},
         "secretsTrend": {"value": total_secrets, "direction": "up" if total_secrets > 0 else "flat", "label": "current"},
     })
 
 
+@app.route("/api/admin/workers", methods=["GET"])
+@jwt_required()
+def admin_workers():
+    """Pipeline worker pool state: per-worker status and queue depth."""
+    current_user = get_current_user_info()
+    if current_user["role"] != "admin":
+        return jsonify({"error": "Admin access required"}), 403
+
+    return jsonify({
+        **pipeline_queue_snapshot(),
+        "mode": PIPELINE_WORKER_MODE,
+        "poolSize": pipeline_workers.size if PIPELINE_WORKER_MODE == "embedded" else 0,
+        "draining": pipeline_workers.draining,
+        "workers": pipeline_workers.snapshot(),
+    })
+
+
 # ====================================================================
 # SETTINGS API
 # ====================================================================
 
 def _get_or_create_settings(user: User) -> UserSettings:
     """Return (or create) the UserSettings row for the given user."""
-    if user.settings:
-        return user.settings
-    settings = UserSettings(user_id=user.id)
-    db.session.add(settings)
-    db.session.commit()
-    return settings
+    return UserSettings.for_user(user)
 
 
 def _get_user_git_integration(user: User) -> dict:
@@ -3680,6 +3532,21 @@ def admin_reply_feedback(feedback_id):
     db.session.commit()
     return jsonify({"message": "Reply sent successfully", "feedback": feedback.to_dict()})
 
+# ====================================================================
+# START-UP
+# ====================================================================
+
+# Embedded workers start once per process; the pool recovers expired leases
+# on start and from its leader-elected reaper, not from request handlers.
+if PIPELINE_WORKER_MODE == "embedded":
+    pipeline_workers.start()
+
+# Relays live events between web processes and external workers over
+# PostgreSQL LISTEN/NOTIFY
+event_bridge = start_event_bridge(DATABASE_URL)
+if event_bridge is not None:
+    atexit.register(event_bridge.stop)
+
 # ====================================================================
 # ENTRY POINT
 # ====================================================================
@@ -0,0 +1,306 @@
+"""
+SentinelOps event broker
+In-process publish/subscribe used to push server-sent events (SSE) to
+connected browsers. Publishers name one or more channels (``user:<id>``,
+``pipeline:<id>``) and an event; every open stream subscribed to one of
+the channels receives it.
+
+Delivery is best effort: a subscriber that falls more than
+EVENT_QUEUE_SIZE events behind is marked overflowed and told to resync
+from the REST API. On PostgreSQL, a PostgresEventBridge relays events
+between processes (web processes and external pipeline workers) over
+LISTEN/NOTIFY; without it, events only reach streams of the publishing
+process.
+"""
+
+import json
+import os
+import queue
+import select
+import threading
+import uuid
+from typing import Any, Dict, Iterable, Optional, Set, Union
+
+try:
+    import psycopg2
+
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+# Events buffered per open stream
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+# Open streams per process; each holds a server thread, so keep this below
+# the gunicorn thread count. Further clients are refused and keep polling
+EVENT_STREAM_MAX_CLIENTS = int(os.getenv("EVENT_STREAM_MAX_CLIENTS", "8"))
+
+# Cross-process relay over PostgreSQL LISTEN/NOTIFY
+EVENT_BRIDGE_ENABLED = os.getenv("EVENT_BRIDGE_ENABLED", "true").lower() == "true"
+EVENT_NOTIFY_CHANNEL = "sentinelops_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+EVENT_NOTIFY_MAX_BYTES = 7900
+# Events waiting to be sent to other processes; further events are dropped
+EVENT_RELAY_QUEUE_SIZE = int(os.getenv("EVENT_RELAY_QUEUE_SIZE", "1000"))
+# Events sent per NOTIFY round trip
+EVENT_RELAY_BATCH_SIZE = 100
+EVENT_BRIDGE_RECONNECT_SECONDS = 5
+
+
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def pipeline_channel(pipeline_id: str) -> str:
+    return f"pipeline:{pipeline_id}"
+
+
+def format_sse(event: str, data: Any, event_id: Optional[str] = None) -> str:
+    """One server-sent event frame."""
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscription:
+    """A stream's view of one channel."""
+
+    def __init__(self, broker: "EventBroker", channel: str):
+        self.broker = broker
+        self.channel = channel
+        self.overflowed = False
+        self._queue: "queue.Queue" = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+    def put(self, event: str, data: Any) -> None:
+        try:
+            self._queue.put_nowait((event, data))
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout: float) -> Optional[tuple]:
+        """Next (event, data), or None if nothing arrived within ``timeout``."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBroker:
+    def __init__(self, max_clients: int = EVENT_STREAM_MAX_CLIENTS):
+        self.max_clients = max_clients
+        # Set by PostgresEventBridge.start to forward publishes to other processes
+        self.relay: Optional["PostgresEventBridge"] = None
+        self._lock = threading.Lock()
+        self._channels: Dict[str, Set[Subscription]] = {}
+        self._count = 0
+
+    def subscribe(self, channel: str) -> Optional[Subscription]:
+        """Open a subscription, or None if the process is at max_clients."""
+        with self._lock:
+            if self._count >= self.max_clients:
+                return None
+            subscription = Subscription(self, channel)
+            self._channels.setdefault(channel, set()).add(subscription)
+            self._count += 1
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if not subscribers or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            self._count -= 1
+            if not subscribers:
+                del self._channels[subscription.channel]
+
+    def publish(self, channels: Union[str, Iterable[str]], event: str, data: Any) -> int:
+        """Hand ``event`` to every subscriber of ``channels`` in every process.
+
+        Returns how many subscribers of this process received it.
+        """
+        channels = (channels,) if isinstance(channels, str) else tuple(channels)
+        if self.relay is not None:
+            self.relay.send(channels, event, data)
+        return self.deliver(channels, event, data)
+
+    def deliver(self, channels: Iterable[str], event: str, data: Any) -> int:
+        """Hand ``event`` to this process's subscribers of ``channels``."""
+        with self._lock:
+            subscribers = {s for channel in channels for s in self._channels.get(channel, ())}
+        for subscription in subscribers:
+            subscription.put(event, data)
+        return len(subscribers)
+
+    def invalidate(self) -> None:
+        """Tell every open stream it may have missed events (it will resync)."""
+        with self._lock:
+            for subscribers in self._channels.values():
+                for subscription in subscribers:
+                    subscription.overflowed = True
+
+    def client_count(self) -> int:
+        with self._lock:
+            return self._count
+
+
+class PostgresEventBridge:
+    """Relays broker publishes between processes over LISTEN/NOTIFY.
+
+    Publishes are queued and sent by a sender thread on its own connection,
+    so publishers never wait on the database; one round trip carries up to
+    EVENT_RELAY_BATCH_SIZE events. With ``listen``, a listener thread
+    delivers events published by other processes to the local broker.
+    Every process tags its events with an origin id and ignores its own,
+    which were already delivered locally.
+    """
+
+    def __init__(self, broker: EventBroker, dsn: str, listen: bool = True,
+                 channel: str = EVENT_NOTIFY_CHANNEL):
+        self.broker = broker
+        self.dsn = dsn
+        self.listen = listen
+        self.channel = channel
+        self.origin = uuid.uuid4().hex[:12]
+        self.dropped = 0
+        self._sequence = 0
+        self._sequence_lock = threading.Lock()
+        self._outbox: "queue.Queue" = queue.Queue(maxsize=EVENT_RELAY_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._threads: list = []
+
+    def start(self) -> None:
+        targets = [("event-relay-sender", self._send_loop)]
+        if self.listen:
+            targets.append(("event-relay-listener", self._listen_loop))
+        for name, target in targets:
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self.broker.relay = self
+
+    def stop(self, timeout: float = 5) -> None:
+        if self.broker.relay is self:
+            self.broker.relay = None
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+    def send(self, channels: Iterable[str], event: str, data: Any) -> None:
+        """Queue an event for the other processes; drops it if it cannot be relayed."""
+        with self._sequence_lock:
+            self._sequence += 1
+            # Also keeps payloads unique: Postgres folds identical
+            # notifications sent in one transaction
+            sequence = self._sequence
+        payload = json.dumps(
+            {"o": self.origin, "n": sequence, "c": list(channels), "e": event, "d": data},
+            separators=(",", ":"), default=str,
+        )
+        if len(payload.encode()) > EVENT_NOTIFY_MAX_BYTES:
+            print(f"[Events] Not relaying oversized {event} event ({len(payload)} bytes)")
+            return
+        try:
+            self._outbox.put_nowait(payload)
+        except queue.Full:
+            self.dropped += 1
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def _send_loop(self) -> None:
+        conn = None
+        while not self._stop.is_set():
+            try:
+                batch = [self._outbox.get(timeout=1)]
+            except queue.Empty:
+                continue
+            while len(batch) < EVENT_RELAY_BATCH_SIZE:
+                try:
+                    batch.append(self._outbox.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if conn is None:
+                    conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+                        (self.channel, batch),
+                    )
+            except psycopg2.Error as exc:
+                print(f"[Events] Relaying {len(batch)} event(s) failed: {exc}")
+                self.dropped += len(batch)
+                if conn is not None:
+                    conn.close()
+                conn = None
+                self._stop.wait(EVENT_BRIDGE_RECONNECT_SECONDS)
+        if conn is not None:
+            conn.close()
+
+    def _listen_loop(self) -> None:
+        connected_before = False
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel}")
+                if connected_before:
+                    # Events sent while disconnected are lost
+                    self.broker.invalidate()
+                connected_before = True
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except psycopg2.Error as exc:
+                print(f"[Events] Event listener disconnected: {exc}")
+                self._stop.wait(EVENT_BRIDGE_RECONNECT_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("o") == self.origin:
+            return
+        self.broker.deliver(message.get("c") or (), message.get("e"), message.get("d"))
+
+
+def start_event_bridge(database_url: Optional[str], listen: bool = True) -> Optional[PostgresEventBridge]:
+    """Relay the module broker's events through PostgreSQL, if configured.
+
+    Returns the started bridge, or None when disabled, when psycopg2 is
+    missing or when ``database_url`` is not a PostgreSQL URL.
+    """
+    if not EVENT_BRIDGE_ENABLED or not PSYCOPG2_AVAILABLE or not database_url:
+        return None
+    scheme, sep, rest = database_url.partition("://")
+    # SQLAlchemy URLs name the driver (postgresql+psycopg2://); libpq does not
+    if not sep or scheme.split("+")[0] not in ("postgres", "postgresql"):
+        return None
+    bridge = PostgresEventBridge(broker, f"postgresql://{rest}", listen=listen)
+    bridge.start()
+    return bridge
+
+
+broker = EventBroker()
@@ -0,0 +1,12 @@
+import { cn } from '../utils/helpers'
+
+// Fetches the next page of a paginated report (see the report endpoints' next_cursor)
+export default function LoadMoreButton({ onClick, loading = false, className }) {
+  return (
+    <div className={cn('flex justify-center py-4', className)}>
+      <button onClick={onClick} disabled={loading} className="btn-secondary text-sm">
+        {loading ? 'Loading...' : 'Load more'}
+      </button>
+    </div>
+  )
+}
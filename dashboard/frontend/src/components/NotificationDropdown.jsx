@@ -12,6 +12,8 @@ import {
 } from 'lucide-react'
 import { cn } from '../utils/helpers'
 import { getAutoRefreshInterval } from '../utils/appearance'
+import { openEventStream } from '../utils/eventStream'
+import LoadMoreButton from './LoadMoreButton'
 
 const API_BASE = import.meta.env.VITE_API_URL
     ? `${import.meta.env.VITE_API_URL}/api`
@@ -62,6 +64,9 @@ export default function NotificationDropdown() {
     const [notifications, setNotifications] = useState([])
     const [loading, setLoading] = useState(false)
     const [unreadCount, setUnreadCount] = useState(0)
+    const [nextCursor, setNextCursor] = useState(null)
+    const [loadingMore, setLoadingMore] = useState(false)
+    const [streamUnavailable, setStreamUnavailable] = useState(false)
     const [refreshSeconds, setRefreshSeconds] = useState(getAutoRefreshInterval(30))
 
     const getAuthHeaders = () => {
@@ -82,31 +87,70 @@ export default function NotificationDropdown() {
                 const data = await response.json()
                 setNotifications(data.notifications || [])
                 setUnreadCount(data.unreadCount || 0)
+                setNextCursor(data.next_cursor || null)
             } else {
                 setNotifications([])
                 setUnreadCount(0)
+                setNextCursor(null)
             }
         } catch (error) {
             console.error('Failed to fetch notifications:', error)
             setNotifications([])
             setUnreadCount(0)
+            setNextCursor(null)
         } finally {
             setLoading(false)
         }
     }, [])
 
+    const loadMore = async () => {
+        if (!nextCursor) return
+        setLoadingMore(true)
+        try {
+            const response = await fetch(
+                `${API_BASE}/notifications?cursor=${encodeURIComponent(nextCursor)}`,
+                { headers: getAuthHeaders() },
+            )
+            if (response.ok) {
+                const data = await response.json()
+                setNotifications((prev) => [...prev, ...(data.notifications || [])])
+                setNextCursor(data.next_cursor || null)
+            }
+        } catch (error) {
+            console.error('Failed to load more notifications:', error)
+        } finally {
+            setLoadingMore(false)
+        }
+    }
+
     useEffect(() => {
         const handler = () => setRefreshSeconds(getAutoRefreshInterval(30))
         window.addEventListener('sentinelops:appearance-updated', handler)
         return () => window.removeEventListener('sentinelops:appearance-updated', handler)
     }, [])
 
+    // New notifications are pushed over an event stream; poll only when the
+    // server cannot hold one open
     useEffect(() => {
         fetchNotifications()
-        if (refreshSeconds === 0) return undefined
+        return openEventStream('/notifications/stream', {
+            onEvent: (type, data) => {
+                if (type === 'notification') {
+                    setNotifications((prev) => (prev.some((n) => n.id === data.id) ? prev : [data, ...prev]))
+                    if (!data.read) setUnreadCount((prev) => prev + 1)
+                } else if (type === 'resync') {
+                    fetchNotifications()
+                }
+            },
+            onUnavailable: () => setStreamUnavailable(true),
+        })
+    }, [fetchNotifications])
+
+    useEffect(() => {
+        if (!streamUnavailable || refreshSeconds === 0) return undefined
         const interval = setInterval(fetchNotifications, refreshSeconds * 1000)
         return () => clearInterval(interval)
-    }, [fetchNotifications, refreshSeconds])
+    }, [fetchNotifications, refreshSeconds, streamUnavailable])
 
     const markAsRead = async (id) => {
         try {
@@ -156,6 +200,7 @@ export default function NotificationDropdown() {
             })
             setNotifications([])
             setUnreadCount(0)
+            setNextCursor(null)
         } catch (error) {
             console.error('Failed to clear notifications:', error)
         }
@@ -281,6 +326,9 @@ export default function NotificationDropdown() {
                                             </div>
                                         )
                                     })}
+                                    {nextCursor && (
+                                        <LoadMoreButton onClick={loadMore} loading={loadingMore} className="py-2" />
+                                    )}
                                 </div>
                             )}
                         </div>
@@ -4,5 +4,6 @@ export { default as Alert } from './Alert'
 export { default as VulnerabilityTable } from './VulnerabilityTable'
 export { default as VulnerabilityModal } from './VulnerabilityModal'
 export { default as LoadingSpinner, PageLoader, CardLoader } from './LoadingSpinner'
+export { default as LoadMoreButton } from './LoadMoreButton'
 export { default as ProtectedRoute } from './ProtectedRoute'
 export * from './charts'
@@ -24,6 +24,8 @@ import { fetchSecuritySummary, fetchLatestPipeline, triggerPipeline, fetchSetupS
 import { notyf } from '../utils/notifications'
 import { formatDate, calculateRiskScore, getSecurityGrade } from '../utils/helpers'
 import { getAutoRefreshInterval } from '../utils/appearance'
+import { openEventStream } from '../utils/eventStream'
+import { LIVE_STATUSES, applyPipelineEvent } from '../utils/pipelineEvents'
 import StatCard from '../components/StatCard'
 import SeverityPieChart from '../components/charts/SeverityPieChart'
 import VulnerabilityBarChart from '../components/charts/VulnerabilityBarChart'
@@ -71,6 +73,7 @@ export default function Dashboard() {
   const [redirecting, setRedirecting] = useState(false)
   const [isFeedbackOpen, setIsFeedbackOpen] = useState(false)
   const [refreshSeconds, setRefreshSeconds] = useState(getAutoRefreshInterval(30))
+  const [streamUnavailable, setStreamUnavailable] = useState(false)
   const { isAuthenticated, loading: authLoading } = useAuth()
   const { selectedRepo } = useRepo()
 
@@ -115,9 +118,23 @@ export default function Dashboard() {
     return () => window.removeEventListener('sentinelops:appearance-updated', handler)
   }, [])
 
-  // Auto-refresh pipeline status if running
+  // Follow a running pipeline over its event stream; reload everything once it finishes
+  const livePipelineId = pipeline && LIVE_STATUSES.includes(pipeline.status) ? pipeline.id : null
+  useEffect(() => {
+    if (!livePipelineId) return undefined
+    return openEventStream(`/pipelines/${livePipelineId}/events`, {
+      onEvent: (type, data) => {
+        setPipeline(current => applyPipelineEvent(current, type, data))
+        if ((type === 'pipeline' || type === 'status') && !LIVE_STATUSES.includes(data.status)) loadData()
+      },
+      // 204: the pipeline finished before the stream opened
+      onUnavailable: status => (status === 204 ? loadData() : setStreamUnavailable(true)),
+    })
+  }, [livePipelineId])
+
+  // Poll pipeline status if running and the stream is unavailable
   useEffect(() => {
-    if (pipeline && ['running', 'queued'].includes(pipeline.status)) {
+    if (streamUnavailable && pipeline && LIVE_STATUSES.includes(pipeline.status)) {
       if (refreshSeconds === 0) return undefined
       const interval = setInterval(async () => {
         try {
@@ -135,7 +152,7 @@ export default function Dashboard() {
       }, refreshSeconds * 1000)
       return () => clearInterval(interval)
     }
-  }, [pipeline, refreshSeconds])
+  }, [pipeline, refreshSeconds, streamUnavailable])
 
   const loadData = async () => {
     try {
@@ -198,6 +215,9 @@ export default function Dashboard() {
   const banditResults = data?.bandit?.results || []
   const banditMetrics = data?.bandit?.metrics?._totals || {}
   const trivyResults = extractTrivyVulnerabilities(data?.trivy)
+  // Report endpoints page their findings; counts come from the scan totals
+  const trivyMetrics = data?.trivy?.metrics || {}
+  const trivyCount = trivyMetrics.total ?? trivyResults.length
 
   // SAST unified data (prefer over bandit-only)
   const sastData = data?.sast || null
@@ -209,10 +229,10 @@ export default function Dashboard() {
   const toolsUsed = Array.isArray(rawTools) ? rawTools : (rawTools ? Object.keys(rawTools) : (banditResults.length > 0 ? ['bandit'] : []))
 
   // Use SAST totals if available, otherwise compute from bandit
-  const codeIssueCount = sastResults.length > 0 ? sastResults.length : banditResults.length
+  const codeIssueCount = sastResults.length > 0 ? (sastMetrics.total ?? sastResults.length) : banditResults.length
   const gitleaksCount = data?.gitleaks?.total_secrets || 0
   const dastCount = data?.dast?.total_alerts || 0
-  const totalVulnerabilities = codeIssueCount + trivyResults.length + gitleaksCount + dastCount
+  const totalVulnerabilities = codeIssueCount + trivyCount + gitleaksCount + dastCount
 
   // Calculate severity counts from SAST if available
   const codeSeverityCounts = sastResults.length > 0
@@ -229,11 +249,18 @@ export default function Dashboard() {
       LOW: banditMetrics['SEVERITY.LOW'] || 0,
     }
 
-  const trivySeverityCounts = trivyResults.reduce((acc, v) => {
-    const severity = v.Severity?.toUpperCase() || 'UNKNOWN'
-    acc[severity] = (acc[severity] || 0) + 1
-    return acc
-  }, {})
+  const trivySeverityCounts = trivyMetrics.total !== undefined
+    ? {
+      CRITICAL: trivyMetrics.critical || 0,
+      HIGH: trivyMetrics.high || 0,
+      MEDIUM: trivyMetrics.medium || 0,
+      LOW: trivyMetrics.low || 0,
+    }
+    : trivyResults.reduce((acc, v) => {
+      const severity = v.Severity?.toUpperCase() || 'UNKNOWN'
+      acc[severity] = (acc[severity] || 0) + 1
+      return acc
+    }, {})
 
   const combinedSeverity = {
     Critical: codeSeverityCounts.CRITICAL + (trivySeverityCounts.CRITICAL || 0),
@@ -276,14 +303,14 @@ export default function Dashboard() {
 
   const radarCoverageCount = [
     Boolean(sastResults.length > 0 || banditResults.length > 0),
-    Boolean(trivyResults.length > 0),
+    Boolean(trivyCount > 0),
     Boolean(secretsCount > 0),
     Boolean(dastAlerts > 0),
   ].filter(Boolean).length
 
   const radarData = [
     { category: 'Code Security', score: codeSecurityScore },
-    { category: 'Container Security', score: trivyResults.length > 0 ? 100 - calculateRiskScore(trivyResults) : 100 },
+    { category: 'Container Security', score: trivyCount > 0 ? 100 - calculateRiskScore(trivyResults) : 100 },
     { category: 'Secrets', score: secretsCount > 0 ? Math.max(0, 100 - secretsCount * 15) : 100 },
     { category: 'DAST', score: dastAlerts > 0 ? Math.max(0, 100 - dastHigh * 20 - dastMedium * 5) : 100 },
     { category: 'Pipeline Readiness', score: pipeline?.security_score ?? securityScore },
@@ -293,7 +320,7 @@ export default function Dashboard() {
   // Bar chart data by type
   const vulnerabilityByType = [
     { name: 'Code Analysis', count: codeIssueCount, severity: 'high' },
-    { name: 'Container Scan', count: trivyResults.length, severity: 'medium' },
+    { name: 'Container Scan', count: trivyCount, severity: 'medium' },
     { name: 'Secret Detection', count: secretsCount, severity: 'high' },
     { name: 'DAST Alerts', count: dastAlerts, severity: 'medium' },
   ]
@@ -625,7 +652,7 @@ export default function Dashboard() {
           </p>
           <div className="flex items-center gap-4">
             <div className="flex items-center gap-2">
-              <span className="text-2xl font-bold text-steel-50 font-mono">{trivyResults.length}</span>
+              <span className="text-2xl font-bold text-steel-50 font-mono">{trivyCount}</span>
               <span className="text-steel-400 text-sm">vulnerabilities</span>
             </div>
             <div className="h-8 w-px bg-white/[0.06]" />
@@ -19,12 +19,14 @@ import {
   Link as LinkIcon,
 } from 'lucide-react'
 import { fetchDastReport, fetchSetupStatus } from '../services/api'
+import { useDebounce } from '../hooks/useData'
 import { useRepo } from '../context/RepoContext'
 import { formatDate, cn } from '../utils/helpers'
 import StatCard from '../components/StatCard'
 import SeverityPieChart from '../components/charts/SeverityPieChart'
 import VulnerabilityBarChart from '../components/charts/VulnerabilityBarChart'
 import { PageLoader } from '../components/LoadingSpinner'
+import LoadMoreButton from '../components/LoadMoreButton'
 import Alert from '../components/Alert'
 import { useAuth } from '../context/AuthContext'
 import { createPortal } from 'react-dom'
@@ -54,6 +56,7 @@ export default function DastReport() {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const [redirecting, setRedirecting] = useState(false)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [selectedAlert, setSelectedAlert] = useState(null)
   const [filters, setFilters] = useState({
     risk: 'all',
@@ -65,27 +68,22 @@ export default function DastReport() {
   const results = useMemo(() => data?.results || [], [data])
   const metrics = useMemo(() => data?.metrics || {}, [data])
 
-  const filteredResults = useMemo(() => {
-    return results.filter(alert => {
-      const alertName = alert.name || alert.alert || ''
-      const alertDesc = alert.description || alert.desc || ''
-      const alertUrl = alert.url || alert.uri || ''
+  // Filters are applied by the server across the whole report; when they
+  // change, the alerts are fetched again from the first page
+  const serverFilters = useDebounce(filters)
+  const reportFilters = (f) => ({ severity: f.risk, search: f.search })
+  const filtersActive = serverFilters.risk !== 'all' || Boolean(serverFilters.search)
 
-      if (filters.risk !== 'all' && (alert.risk || '').toUpperCase() !== filters.risk) {
-        return false
-      }
-      if (filters.search) {
-        const q = filters.search.toLowerCase()
-        return (
-          alertName.toLowerCase().includes(q) ||
-          alertDesc.toLowerCase().includes(q) ||
-          alertUrl.toLowerCase().includes(q) ||
-          (alert.cwe_id || '').toString().includes(q)
-        )
-      }
-      return true
-    })
-  }, [results, filters])
+  useEffect(() => {
+    if (!data) return
+    let cancelled = false
+    fetchDastReport(selectedRepo?.full_name, { pipelineId: data.pipeline_id, filters: reportFilters(serverFilters) })
+      .then(page => {
+        if (!cancelled) setData(prev => ({ ...prev, results: page?.results || [], next_cursor: page?.next_cursor || null }))
+      })
+      .catch(err => console.error('DastReport filter error:', err))
+    return () => { cancelled = true }
+  }, [serverFilters])
 
   useEffect(() => {
     if (!authLoading && isAuthenticated) {
@@ -105,7 +103,7 @@ export default function DastReport() {
         return
       }
 
-      const result = await fetchDastReport(selectedRepo?.full_name)
+      const result = await fetchDastReport(selectedRepo?.full_name, { filters: reportFilters(filters) })
       if (result) {
         setData(result)
       } else {
@@ -123,6 +121,28 @@ export default function DastReport() {
     }
   }
 
+  // Findings arrive most severe first, one page at a time
+  const loadMore = async () => {
+    if (!data?.next_cursor) return
+    setLoadingMore(true)
+    try {
+      const page = await fetchDastReport(selectedRepo?.full_name, {
+        cursor: data.next_cursor,
+        pipelineId: data.pipeline_id,
+        filters: reportFilters(serverFilters),
+      })
+      setData(prev => ({
+        ...prev,
+        results: [...(prev?.results || []), ...(page?.results || [])],
+        next_cursor: page?.next_cursor || null,
+      }))
+    } catch (err) {
+      console.error('DastReport load more error:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   if (authLoading || loading || redirecting) return <PageLoader />
 
   if (error === 'no-report') {
@@ -336,12 +356,12 @@ export default function DastReport() {
             </button>
           ))}
         </div>
-        <span className="text-sm text-steel-500">{filteredResults.length} alerts</span>
+        <span className="text-sm text-steel-500">{results.length}{data?.next_cursor ? '+' : ''} alerts</span>
       </div>
 
       {/* Alerts list */}
       <div className="space-y-3">
-        {filteredResults.map((alert, idx) => (
+        {results.map((alert, idx) => (
           <div key={idx} className="glass-card overflow-hidden">
             <button
               onClick={() => setSelectedAlert(alert)}
@@ -462,10 +482,11 @@ export default function DastReport() {
         document.body
       )}
 
-        {filteredResults.length === 0 && results.length > 0 && (
+        {data?.next_cursor && <LoadMoreButton onClick={loadMore} loading={loadingMore} />}
+        {results.length === 0 && filtersActive && (
           <div className="text-center py-12 text-steel-500 text-sm">No alerts match the current filters</div>
         )}
-        {results.length === 0 && (
+        {results.length === 0 && !filtersActive && (
           <div className="glass-card p-12 text-center">
             <Globe className="w-12 h-12 text-steel-600 mx-auto mb-4" />
             <p className="text-steel-400 mb-2">No DAST alerts found</p>
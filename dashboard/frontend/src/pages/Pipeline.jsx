@@ -38,9 +38,11 @@ import {
   Globe,
   Save,
 } from 'lucide-react'
-import { fetchPipelines, triggerPipeline, fetchSetupStatus } from '../services/api'
+import { fetchPipelines, fetchPipelineById, triggerPipeline, fetchSetupStatus } from '../services/api'
 import { formatDate, cn } from '../utils/helpers'
 import { getAutoRefreshInterval } from '../utils/appearance'
+import { openEventStream } from '../utils/eventStream'
+import { LIVE_STATUSES, applyPipelineEvent } from '../utils/pipelineEvents'
 import { PageLoader } from '../components/LoadingSpinner'
 import Alert from '../components/Alert'
 import { useAuth } from '../context/AuthContext'
@@ -94,6 +96,14 @@ const stageColors = {
   skipped: { bg: 'bg-white/[0.02]', border: 'border-white/[0.04]', text: 'text-steel-600', dot: 'bg-steel-700' },
 }
 
+// List columns plus stages for the stage rail; the detail view fetches
+// the full pipeline
+const LIST_FIELDS = [
+  'id', 'repo_url', 'repo_name', 'branch', 'commit_sha', 'commit_message', 'author',
+  'status', 'security_score', 'is_deployable', 'vulnerability_summary', 'duration_seconds',
+  'started_at', 'completed_at', 'created_at', 'stages',
+]
+
 const STAGE_ORDER = ['clone', 'build', 'sast_scan', 'gitleaks_scan', 'trivy_scan', 'dast_scan', 'policy_check', 'decision']
 
 const resolveStageKey = (key, stages) =>
@@ -1095,6 +1105,7 @@ export default function Pipeline() {
   const [error, setError] = useState(null)
   const [redirecting, setRedirecting] = useState(false)
   const [refreshSeconds, setRefreshSeconds] = useState(getAutoRefreshInterval(30))
+  const [streamUnavailable, setStreamUnavailable] = useState(false)
   const { isAuthenticated, loading: authLoading } = useAuth()
   const { selectedRepo, loadingRepos, repos } = useRepo()
   const [repoUrl, setRepoUrl] = useState('')
@@ -1149,7 +1160,7 @@ export default function Pipeline() {
     if (loadingRepos || !selectedRepo) return;
     try {
       const repoName = selectedRepo?.full_name || ''
-      const result = await fetchPipelines(20, repoName)
+      const result = await fetchPipelines(20, repoName, { fields: LIST_FIELDS })
       const list = result.pipelines || []
       setPipelines(list)
 
@@ -1217,13 +1228,44 @@ export default function Pipeline() {
     return () => window.removeEventListener('sentinelops:appearance-updated', handler)
   }, [])
 
+  // The stream handler outlives renders; read the latest list and loader through refs
+  const pipelinesRef = useRef(pipelines)
+  const loadPipelinesRef = useRef(loadPipelines)
+  useEffect(() => {
+    pipelinesRef.current = pipelines
+    loadPipelinesRef.current = loadPipelines
+  }, [pipelines, loadPipelines])
+
+  // Stage progress and scanner output are pushed over an event stream; poll
+  // only when the server cannot hold one open
+  useEffect(() => {
+    if (!isAuthenticated) return undefined
+    return openEventStream('/pipelines/events', {
+      onEvent: (type, data) => {
+        if (type === 'resync') {
+          if (pipelinesRef.current.some(p => LIVE_STATUSES.includes(p.status))) loadPipelinesRef.current()
+          return
+        }
+        if (type === 'status' && data.status === 'queued' && !pipelinesRef.current.some(p => p.id === data.pipeline_id)) {
+          loadPipelinesRef.current()
+          return
+        }
+        const apply = p => applyPipelineEvent(p, type, data)
+        setPipelines(prev => prev.map(apply))
+        setSelectedPipeline(apply)
+        setModalPipeline(apply)
+      },
+      onUnavailable: () => setStreamUnavailable(true),
+    })
+  }, [isAuthenticated])
+
   useEffect(() => {
-    const hasRunning = pipelines.some(p => ['running', 'queued'].includes(p.status))
-    if (hasRunning && refreshSeconds > 0) {
+    const hasRunning = pipelines.some(p => LIVE_STATUSES.includes(p.status))
+    if (streamUnavailable && hasRunning && refreshSeconds > 0) {
       const interval = setInterval(loadPipelines, refreshSeconds * 1000)
       return () => clearInterval(interval)
     }
-  }, [pipelines, loadPipelines, refreshSeconds])
+  }, [pipelines, loadPipelines, refreshSeconds, streamUnavailable])
 
   const handleTrigger = async () => {
     const activeUrl = selectedRepo?.html_url || repoUrl
@@ -1243,7 +1285,7 @@ export default function Pipeline() {
 
       await loadPipelines()
       if (res.pipeline_id) {
-        const list = (await fetchPipelines(20, selectedRepo?.full_name || '')).pipelines || []
+        const list = (await fetchPipelines(20, selectedRepo?.full_name || '', { fields: LIST_FIELDS })).pipelines || []
         const created = list.find(p => p.id === res.pipeline_id)
         if (created) {
           setSelectedPipeline(created)
@@ -1265,6 +1307,10 @@ export default function Pipeline() {
 
   const handleSelectPipeline = (p) => {
     setModalPipeline(p)
+    // List rows omit the policy snapshot and AI prediction shown in the detail view
+    fetchPipelineById(p.id)
+      .then(full => setModalPipeline(current => (current?.id === full.id ? full : current)))
+      .catch(err => console.error(err))
   }
 
   // Filtered pipelines
@@ -1471,7 +1517,7 @@ export default function Pipeline() {
 
       {/* ── Current Pipeline (Top) ─────────────────────────── */}
       <div className="glass-card overflow-visible relative z-10 cursor-pointer hover:ring-2 hover:ring-emerald-400/40 transition-all"
-        onClick={() => activePipeline && setModalPipeline(activePipeline)}
+        onClick={() => activePipeline && handleSelectPipeline(activePipeline)}
       >
         <div className="p-5 border-b border-white/[0.06] bg-gradient-to-r from-white/[0.01] to-transparent flex items-center justify-between gap-3">
           <div>
@@ -1,4 +1,4 @@
-import { useState, useEffect, useMemo } from 'react'
+import { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
 import {
   Bug,
@@ -27,9 +27,11 @@ import VulnerabilityModal from '../components/VulnerabilityModal'
 import SeverityPieChart from '../components/charts/SeverityPieChart'
 import VulnerabilityBarChart from '../components/charts/VulnerabilityBarChart'
 import { PageLoader } from '../components/LoadingSpinner'
+import LoadMoreButton from '../components/LoadMoreButton'
 import Alert from '../components/Alert'
 import PermissionGate from '../components/PermissionGate'
 import { useAuth } from '../context/AuthContext'
+import { useDebounce } from '../hooks/useData'
 
 // Language color mapping for dark theme badges
 const LANG_COLORS = {
@@ -72,6 +74,7 @@ export default function SASTReport() {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const [redirecting, setRedirecting] = useState(false)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [selectedVuln, setSelectedVuln] = useState(null)
   const [aiFixes, setAiFixes] = useState({})   // index -> fix data
   const [loadingFix, setLoadingFix] = useState(null) // index of the fix being generated
@@ -93,29 +96,23 @@ export default function SASTReport() {
   const rawTools = data?.tools_used
   const tools = Array.isArray(rawTools) ? rawTools : (rawTools ? Object.keys(rawTools) : [])
 
-  const filteredResults = useMemo(() => {
-    return results.filter(issue => {
-      if (filters.severity !== 'all' && issue.severity?.toUpperCase() !== filters.severity) {
-        return false
-      }
-      if (filters.language !== 'all' && issue.language !== filters.language) {
-        return false
-      }
-      if (filters.tool !== 'all' && issue.tool !== filters.tool) {
-        return false
-      }
-      if (filters.search) {
-        const searchLower = filters.search.toLowerCase()
-        return (
-          issue.message?.toLowerCase().includes(searchLower) ||
-          issue.file?.toLowerCase().includes(searchLower) ||
-          issue.rule_id?.toLowerCase().includes(searchLower) ||
-          issue.tool?.toLowerCase().includes(searchLower)
-        )
-      }
-      return true
-    })
-  }, [results, filters])
+  // Filters are applied by the server across the whole report; when they
+  // change, the findings are fetched again from the first page
+  const serverFilters = useDebounce(filters)
+
+  useEffect(() => {
+    if (!data) return
+    let cancelled = false
+    fetchSASTReport(selectedRepo?.full_name, { pipelineId: data.pipeline_id, filters: serverFilters })
+      .then(page => {
+        if (cancelled) return
+        setAiFixes({})
+        setExpandedFix(null)
+        setData(prev => ({ ...prev, results: page?.results || [], next_cursor: page?.next_cursor || null }))
+      })
+      .catch(err => console.error('SASTReport filter error:', err))
+    return () => { cancelled = true }
+  }, [serverFilters])
 
   useEffect(() => {
     if (!authLoading && isAuthenticated) {
@@ -136,7 +133,7 @@ export default function SASTReport() {
       }
 
       const [reportResult, langResult, pipelineResult] = await Promise.allSettled([
-        fetchSASTReport(selectedRepo?.full_name),
+        fetchSASTReport(selectedRepo?.full_name, { filters }),
         fetchSASTLanguages(),
         import('../services/api').then(m => m.fetchLatestPipeline()).catch(() => null)
       ])
@@ -173,6 +170,28 @@ export default function SASTReport() {
     }
   }
 
+  // Findings arrive most severe first, one page at a time
+  const loadMore = async () => {
+    if (!data?.next_cursor) return
+    setLoadingMore(true)
+    try {
+      const page = await fetchSASTReport(selectedRepo?.full_name, {
+        cursor: data.next_cursor,
+        pipelineId: data.pipeline_id,
+        filters: serverFilters,
+      })
+      setData(prev => ({
+        ...prev,
+        results: [...(prev?.results || []), ...(page?.results || [])],
+        next_cursor: page?.next_cursor || null,
+      }))
+    } catch (err) {
+      console.error('SASTReport load more error:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   if (authLoading || loading || redirecting) return <PageLoader />
 
   if (error === 'no-report') {
@@ -473,7 +492,7 @@ export default function SASTReport() {
 
           {/* Results count */}
           <div className="ml-auto text-steel-500 text-sm font-mono">
-            Showing <span className="font-medium text-steel-50">{filteredResults.length}</span> of {results.length} issues
+            Showing <span className="font-medium text-steel-50">{results.length}{data?.next_cursor ? '+' : ''}</span> issues
           </div>
         </div>
       </div>
@@ -484,13 +503,12 @@ export default function SASTReport() {
           <h3 className="text-lg font-semibold text-steel-50">Findings</h3>
         </div>
         <div className="space-y-2">
-          {filteredResults.length === 0 && (
+          {results.length === 0 && (
             <div className="text-center py-8 text-steel-500">No matching issues found. Great work!</div>
           )}
-          {filteredResults.map((issue, i) => {
-            const globalIndex = results.indexOf(issue)
-            const fix = aiFixes[globalIndex]
-            const isExpanded = expandedFix === globalIndex
+          {results.map((issue, i) => {
+            const fix = aiFixes[i]
+            const isExpanded = expandedFix === i
             const severity = (issue.severity || 'low').toLowerCase()
             return (
               <div key={i} className="rounded-xl border border-white/[0.06] bg-white/[0.02] overflow-hidden">
@@ -508,7 +526,7 @@ export default function SASTReport() {
                   <div className="flex items-center gap-2 shrink-0">
                     {fix && (
                       <button
-                        onClick={() => setExpandedFix(isExpanded ? null : globalIndex)}
+                        onClick={() => setExpandedFix(isExpanded ? null : i)}
                         className="flex items-center gap-1.5 px-2.5 py-1.5 rounded-lg text-xs font-medium bg-emerald-500/10 text-emerald-400 border border-emerald-500/20 hover:bg-emerald-500/20 transition-all"
                       >
                         {isExpanded ? <ChevronUp className="w-3.5 h-3.5" /> : <ChevronDown className="w-3.5 h-3.5" />}
@@ -518,16 +536,16 @@ export default function SASTReport() {
                     <PermissionGate permission="ai_fix.generate">
                       {!fix && pipelineId && (
                         <button
-                          onClick={() => handleGenerateFix(issue, globalIndex)}
-                          disabled={loadingFix === globalIndex}
+                          onClick={() => handleGenerateFix(issue, i)}
+                          disabled={loadingFix === i}
                           className="flex items-center gap-1.5 px-2.5 py-1.5 rounded-lg text-xs font-medium bg-violet-500/10 text-violet-400 border border-violet-500/20 hover:bg-violet-500/20 transition-all disabled:opacity-50"
                         >
-                          {loadingFix === globalIndex ? (
+                          {loadingFix === i ? (
                             <Loader2 className="w-3.5 h-3.5 animate-spin" />
                           ) : (
                             <Sparkles className="w-3.5 h-3.5" />
                           )}
-                          {loadingFix === globalIndex ? 'Generating...' : 'AI Fix'}
+                          {loadingFix === i ? 'Generating...' : 'AI Fix'}
                         </button>
                       )}
                     </PermissionGate>
@@ -564,6 +582,7 @@ export default function SASTReport() {
               </div>
             )
           })}
+          {data?.next_cursor && <LoadMoreButton onClick={loadMore} loading={loadingMore} />}
         </div>
       </div>
     </div>
@@ -21,8 +21,10 @@ import VulnerabilityModal from '../components/VulnerabilityModal'
 import SeverityPieChart from '../components/charts/SeverityPieChart'
 import VulnerabilityBarChart from '../components/charts/VulnerabilityBarChart'
 import { PageLoader } from '../components/LoadingSpinner'
+import LoadMoreButton from '../components/LoadMoreButton'
 import Alert from '../components/Alert'
 import { useAuth } from '../context/AuthContext'
+import { useDebounce } from '../hooks/useData'
 
 export default function TrivyReport() {
   const { selectedRepo } = useRepo()
@@ -31,6 +33,7 @@ export default function TrivyReport() {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const [redirecting, setRedirecting] = useState(false)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [selectedVuln, setSelectedVuln] = useState(null)
   const [cveDetails, setCveDetails] = useState({})  // cve_id -> enrichment data
   const [loadingCve, setLoadingCve] = useState(null)
@@ -47,28 +50,21 @@ export default function TrivyReport() {
     return data.Results.flatMap(result => result.Vulnerabilities || [])
   }, [data])
 
-  const filteredVulnerabilities = useMemo(() => {
-    return vulnerabilities.filter(vuln => {
-      if (filters.severity !== 'all' && vuln.Severity?.toUpperCase() !== filters.severity) {
-        return false
-      }
-      if (filters.hasfix === 'yes' && !vuln.FixedVersion) {
-        return false
-      }
-      if (filters.hasfix === 'no' && vuln.FixedVersion) {
-        return false
-      }
-      if (filters.search) {
-        const searchLower = filters.search.toLowerCase()
-        return (
-          vuln.VulnerabilityID?.toLowerCase().includes(searchLower) ||
-          vuln.PkgName?.toLowerCase().includes(searchLower) ||
-          vuln.Title?.toLowerCase().includes(searchLower)
-        )
-      }
-      return true
-    })
-  }, [vulnerabilities, filters])
+  // Filters are applied by the server across the whole report; when they
+  // change, the findings are fetched again from the first page
+  const serverFilters = useDebounce(filters)
+  const reportFilters = (f) => ({ severity: f.severity, fixable: f.hasfix, search: f.search })
+
+  useEffect(() => {
+    if (!data) return
+    let cancelled = false
+    fetchTrivyReport(selectedRepo?.full_name, { pipelineId: data.pipeline_id, filters: reportFilters(serverFilters) })
+      .then(page => {
+        if (!cancelled) setData(prev => ({ ...prev, Results: page?.Results || [], next_cursor: page?.next_cursor || null }))
+      })
+      .catch(err => console.error('TrivyReport filter error:', err))
+    return () => { cancelled = true }
+  }, [serverFilters])
 
   useEffect(() => {
     if (!authLoading && isAuthenticated) {
@@ -88,7 +84,7 @@ export default function TrivyReport() {
         return
       }
 
-      const result = await fetchTrivyReport(selectedRepo?.full_name)
+      const result = await fetchTrivyReport(selectedRepo?.full_name, { filters: reportFilters(filters) })
       setData(result)
       setLoading(false)
     } catch (err) {
@@ -102,6 +98,28 @@ export default function TrivyReport() {
     }
   }
 
+  // Findings arrive most severe first, one page at a time
+  const loadMore = async () => {
+    if (!data?.next_cursor) return
+    setLoadingMore(true)
+    try {
+      const page = await fetchTrivyReport(selectedRepo?.full_name, {
+        cursor: data.next_cursor,
+        pipelineId: data.pipeline_id,
+        filters: reportFilters(serverFilters),
+      })
+      setData(prev => ({
+        ...prev,
+        Results: [...(prev?.Results || []), ...(page?.Results || [])],
+        next_cursor: page?.next_cursor || null,
+      }))
+    } catch (err) {
+      console.error('TrivyReport load more error:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   // Show loader while loading, auth loading, or redirecting
   if (authLoading || loading || redirecting) return <PageLoader />
 
@@ -383,7 +401,7 @@ export default function TrivyReport() {
 
           {/* Results count */}
           <div className="ml-auto text-steel-500 text-sm font-mono">
-            Showing <span className="font-medium text-steel-50">{filteredVulnerabilities.length}</span> of {vulnerabilities.length} vulnerabilities
+            Showing <span className="font-medium text-steel-50">{vulnerabilities.length}{data?.next_cursor ? '+' : ''}</span> vulnerabilities
           </div>
         </div>
       </div>
@@ -406,7 +424,7 @@ export default function TrivyReport() {
               </tr>
             </thead>
             <tbody className="divide-y divide-white/[0.04]">
-              {filteredVulnerabilities.map((vuln, i) => {
+              {vulnerabilities.map((vuln, i) => {
                 const cveId = vuln.VulnerabilityID
                 const enrichment = cveDetails[cveId]
                 const isKev = enrichment?.is_actively_exploited
@@ -480,12 +498,13 @@ export default function TrivyReport() {
                   </>
                 )
               })}
-              {filteredVulnerabilities.length === 0 && (
+              {vulnerabilities.length === 0 && (
                 <tr><td colSpan={5} className="text-center py-8 text-steel-500">No matching vulnerabilities found.</td></tr>
               )}
             </tbody>
           </table>
         </div>
+        {data?.next_cursor && <LoadMoreButton onClick={loadMore} loading={loadingMore} />}
       </div>
     </div>
   )
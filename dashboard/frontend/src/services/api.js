@@ -73,10 +73,27 @@ export const fetchBanditReport = async (repoUrl) => {
   }
 }
 
-export const fetchSASTReport = async (repoUrl) => {
-  try {
-    const url = repoUrl ? `/sast?repo=${encodeURIComponent(repoUrl)}` : '/sast'
-    const response = await api.get(url)
+// Report endpoints return findings most severe first, one page at a time;
+// pass the previous response's next_cursor as `cursor` and its pipeline_id
+// as `pipelineId` for the next page, so it comes from the same run.
+// `filters` (severity, tool, language, file, cwe, cve, rule, fixable,
+// search) are applied by the server; 'all' and empty values are omitted.
+const reportUrl = (path, repoUrl, { cursor, limit, pipelineId, filters = {} } = {}) => {
+  const params = new URLSearchParams()
+  if (repoUrl) params.append('repo', repoUrl)
+  if (pipelineId) params.append('pipeline_id', pipelineId)
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value && value !== 'all') params.append(key, value)
+  })
+  if (cursor) params.append('cursor', cursor)
+  if (limit) params.append('limit', limit)
+  const query = params.toString()
+  return query ? `${path}?${query}` : path
+}
+
+export const fetchSASTReport = async (repoUrl, page = {}) => {
+  try {
+    const response = await api.get(reportUrl('/sast', repoUrl, page))
     return response.data
   } catch (error) {
     console.error('Error fetching SAST report:', error)
@@ -94,10 +111,9 @@ export const fetchSASTLanguages = async () => {
   }
 }
 
-export const fetchTrivyReport = async (repoUrl) => {
+export const fetchTrivyReport = async (repoUrl, page = {}) => {
   try {
-    const url = repoUrl ? `/trivy?repo=${encodeURIComponent(repoUrl)}` : '/trivy'
-    const response = await api.get(url)
+    const response = await api.get(reportUrl('/trivy', repoUrl, page))
     return response.data
   } catch (error) {
     console.error('Error fetching Trivy report:', error)
@@ -157,10 +173,17 @@ export const evaluatePolicy = async () => {
 }
 
 // Pipeline API endpoints
-export const fetchPipelines = async (limit = 20, repoUrl = null) => {
+// Newest first; pass `cursor` (the previous page's next_cursor) for older
+// runs, `fields` to choose the returned columns and `count` for the total
+export const fetchPipelines = async (limit = 20, repoUrl = null, { fields, cursor, count } = {}) => {
   try {
-    const url = repoUrl ? `/pipelines?limit=${limit}&repo=${encodeURIComponent(repoUrl)}` : `/pipelines?limit=${limit}`
-    const response = await api.get(url)
+    const params = new URLSearchParams()
+    params.append('limit', limit)
+    if (repoUrl) params.append('repo', repoUrl)
+    if (fields) params.append('fields', fields.join(','))
+    if (cursor) params.append('cursor', cursor)
+    if (count) params.append('count', 'true')
+    const response = await api.get(`/pipelines?${params.toString()}`)
     return response.data
   } catch (error) {
     console.error('Error fetching pipelines:', error)
@@ -214,10 +237,9 @@ export const triggerLocalScan = async (options) => {
 }
 
 // Gitleaks API endpoints
-export const fetchGitleaksReport = async (repoUrl) => {
+export const fetchGitleaksReport = async (repoUrl, page = {}) => {
   try {
-    const url = repoUrl ? `/gitleaks?repo=${encodeURIComponent(repoUrl)}` : '/gitleaks'
-    const response = await api.get(url)
+    const response = await api.get(reportUrl('/gitleaks', repoUrl, page))
     return response.data
   } catch (error) {
     if (error.response?.status === 404) return null
@@ -227,10 +249,9 @@ export const fetchGitleaksReport = async (repoUrl) => {
 }
 
 // DAST API endpoints
-export const fetchDastReport = async (repoUrl) => {
+export const fetchDastReport = async (repoUrl, page = {}) => {
   try {
-    const url = repoUrl ? `/dast?repo=${encodeURIComponent(repoUrl)}` : '/dast'
-    const response = await api.get(url)
+    const response = await api.get(reportUrl('/dast', repoUrl, page))
     return response.data
   } catch (error) {
     if (error.response?.status === 404) return null
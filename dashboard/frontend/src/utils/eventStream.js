@@ -0,0 +1,81 @@
+// Server-sent events over fetch, so the stream can carry the Authorization
+// header (EventSource cannot). Reconnects after the server closes the stream,
+// resuming from the last event id; gives up and calls onUnavailable when the
+// server refuses the stream (e.g. 503 when it is at capacity).
+
+const API_BASE = import.meta.env.VITE_API_URL
+  ? `${import.meta.env.VITE_API_URL}/api`
+  : '/api'
+
+const DEFAULT_RETRY_MS = 15000
+
+function parseFrame(frame) {
+  const event = { type: 'message', data: '', id: null, retry: null }
+  const data = []
+  for (const line of frame.split('\n')) {
+    if (!line || line.startsWith(':')) continue
+    const colon = line.indexOf(':')
+    const field = colon === -1 ? line : line.slice(0, colon)
+    const value = colon === -1 ? '' : line.slice(colon + 1).replace(/^ /, '')
+    if (field === 'event') event.type = value
+    else if (field === 'data') data.push(value)
+    else if (field === 'id') event.id = value
+    else if (field === 'retry') event.retry = Number(value)
+  }
+  event.data = data.join('\n')
+  return event
+}
+
+export function openEventStream(path, { onEvent, onUnavailable } = {}) {
+  const controller = new AbortController()
+  let lastEventId = null
+  let retryMs = DEFAULT_RETRY_MS
+  let timer = null
+
+  const connect = async () => {
+    const headers = { Accept: 'text/event-stream' }
+    const token = localStorage.getItem('token')
+    if (token) headers.Authorization = `Bearer ${token}`
+    if (lastEventId) headers['Last-Event-ID'] = lastEventId
+
+    try {
+      const response = await fetch(`${API_BASE}${path}`, { headers, signal: controller.signal })
+      if (!response.ok || !response.body) {
+        onUnavailable?.(response.status)
+        return
+      }
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+      for (;;) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true }).replace(/\r\n?/g, '\n')
+        let end
+        while ((end = buffer.indexOf('\n\n')) !== -1) {
+          const frame = parseFrame(buffer.slice(0, end))
+          buffer = buffer.slice(end + 2)
+          if (frame.retry) retryMs = frame.retry
+          if (frame.id) lastEventId = frame.id
+          if (frame.data) {
+            try {
+              onEvent?.(frame.type, JSON.parse(frame.data))
+            } catch (error) {
+              console.error('Bad event stream frame:', error)
+            }
+          }
+        }
+      }
+    } catch (error) {
+      if (controller.signal.aborted) return
+      console.error('Event stream error:', error)
+    }
+    if (!controller.signal.aborted) timer = setTimeout(connect, retryMs)
+  }
+
+  connect()
+  return () => {
+    controller.abort()
+    clearTimeout(timer)
+  }
+}
@@ -0,0 +1,27 @@
+// Folds live pipeline events (see /api/pipelines/events) into pipeline
+// objects as returned by the REST API.
+
+export const LIVE_STATUSES = ['queued', 'running']
+
+// Streamed tool output kept per stage; older output is dropped
+const MAX_LIVE_LOG_CHARS = 20000
+
+const appendLog = (logs, line) => [logs, line].filter(Boolean).join('\n').slice(-MAX_LIVE_LOG_CHARS)
+
+export function applyPipelineEvent(pipeline, type, data) {
+  if (!pipeline || pipeline.id !== data.pipeline_id) return pipeline
+  if (type === 'pipeline' || type === 'status') {
+    const { pipeline_id, ...fields } = data
+    return { ...pipeline, ...fields }
+  }
+  if (type === 'stage' || type === 'log') {
+    const { pipeline_id, stage: key, line, ...fields } = data
+    const stages = pipeline.stages || {}
+    const stage = stages[key] || { name: key, status: 'pending' }
+    return {
+      ...pipeline,
+      stages: { ...stages, [key]: { ...stage, ...fields, logs: appendLog(stage.logs, line) } },
+    }
+  }
+  return pipeline
+}
@@ -0,0 +1,147 @@
+"""
+SentinelOps HTTP caching
+Once a pipeline has finished its row, scan results and findings never
+change, so views of it are served with a strong ETag derived from the
+pipeline id, its completion time and the requesting user and role. A request whose If-None-Match still
+matches gets a 304 before any findings are queried or serialized.
+Responses addressed to an explicit pipeline are also marked immutable;
+"latest pipeline" views (no pipeline id in the request) can change when a
+new run finishes and are revalidated instead.
+
+JSON responses are compressed with brotli (when the ``brotli`` package is
+installed) or gzip, according to the client's Accept-Encoding. A
+compressed response carries its own ETag variant (``<etag>-br``) as
+strong validators must differ per encoding; conditional requests match
+either variant.
+"""
+
+import gzip
+import hashlib
+import os
+from collections import namedtuple
+from typing import Optional
+
+from flask import current_app, request
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+from models import Pipeline
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Browser cache lifetime of views of an explicitly requested finished pipeline
+HTTP_CACHE_MAX_AGE_SECONDS = int(os.getenv("HTTP_CACHE_MAX_AGE_SECONDS", "31536000"))
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true"
+RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+
+# Part of every ETag; bump it when the JSON of a cached endpoint changes
+CACHE_VERSION = "1"
+
+COMPRESSIBLE_MIMETYPES = frozenset({"application/json"})
+_ENCODING_SUFFIXES = ("-br", "-gzip")
+
+CachePolicy = namedtuple("CachePolicy", ["etag", "immutable"])
+
+
+def finished_pipeline_policy(pipeline, immutable: bool = True) -> Optional[CachePolicy]:
+    """Cache policy for a view of ``pipeline``, or None while it can still change.
+
+    ``pipeline`` needs ``id``, ``status`` and ``completed_at``. The ETag also
+    covers the request path and query string, so every page and filter of
+    a report is its own representation, and the JWT's user and role, so a
+    validator never matches across authorization scopes. Must be called
+    from a ``jwt_required`` view.
+    """
+    if pipeline.status not in Pipeline.FINISHED_STATUSES or not pipeline.completed_at:
+        return None
+    key = "\n".join((
+        CACHE_VERSION,
+        pipeline.id,
+        pipeline.completed_at.isoformat(),
+        request.path,
+        request.query_string.decode("latin-1"),
+        str(get_jwt_identity()),
+        str(get_jwt().get("role")),
+    ))
+    return CachePolicy(hashlib.sha256(key.encode()).hexdigest()[:32], immutable)
+
+
+def _strip_encoding(etag: str) -> str:
+    for suffix in _ENCODING_SUFFIXES:
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)]
+    return etag
+
+
+def is_not_modified(policy: Optional[CachePolicy]) -> bool:
+    """True if the request's If-None-Match already names this representation."""
+    if policy is None or not request.if_none_match:
+        return False
+    if request.if_none_match.star_tag:
+        return True
+    return any(
+        _strip_encoding(etag) == policy.etag
+        for etag in request.if_none_match.as_set(include_weak=True)
+    )
+
+
+def apply_cache_headers(response, policy: Optional[CachePolicy]):
+    """Set ETag and Cache-Control on a successful response; no-op without a policy."""
+    if policy is None:
+        return response
+    response.set_etag(policy.etag)
+    if policy.immutable:
+        response.headers["Cache-Control"] = f"private, max-age={HTTP_CACHE_MAX_AGE_SECONDS}, immutable"
+    else:
+        response.headers["Cache-Control"] = "private, no-cache"
+    # Views are authorized per user; never reuse one across tokens
+    response.vary.add("Authorization")
+    return response
+
+
+def not_modified(policy: CachePolicy):
+    """An empty 304 response carrying the policy's validators."""
+    return apply_cache_headers(current_app.response_class(status=304), policy)
+
+
+def _negotiate_encoding() -> Optional[str]:
+    accepted = request.accept_encodings
+    if BROTLI_AVAILABLE and accepted.quality("br") > 0:
+        return "br"
+    if accepted.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def compress_response(response):
+    """after_request hook: compress JSON bodies the client can decode."""
+    if (
+        not RESPONSE_COMPRESSION
+        or response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = _negotiate_encoding()
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < RESPONSE_COMPRESS_MIN_BYTES:
+        return response
+    if encoding == "br":
+        response.set_data(brotli.compress(data, quality=5))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
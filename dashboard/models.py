@@ -89,6 +89,9 @@ class User(db.Model):
     pipelines = db.relationship(
         "Pipeline", backref="owner", lazy=True, cascade="all, delete-orphan"
     )
+    pipeline_rollups = db.relationship(
+        "PipelineDailyRollup", lazy=True, cascade="all, delete-orphan"
+    )
 
     def to_dict(self, safe=True):
         """Return a JSON-serialisable dict. ``safe=True`` omits the password hash."""
@@ -251,14 +254,20 @@ class Policy(db.Model):
 
 class Notification(db.Model):
     __tablename__ = "notifications"
+    # A user's notifications are listed and pruned newest first; unread ones
+    # are counted from a partial index
+    __table_args__ = (
+        db.Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+        db.Index("ix_notifications_user_id_unread", "user_id", postgresql_where=db.text("NOT read")),
+    )
 
     id = db.Column(db.String(8), primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     type = db.Column(db.String(20), nullable=False)          # info / success / warning / critical
     title = db.Column(db.String(200), nullable=False)
     message = db.Column(db.Text, nullable=False)
     _extra_data = db.Column("extra_data", db.Text, default="{}")
-    read = db.Column(db.Boolean, default=False, index=True)
+    read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, nullable=False, default=utcnow, index=True)
 
     # ---- JSON helper for extra_data ----
@@ -308,10 +317,19 @@ class Pipeline(db.Model):
         self.ai_prediction = json.dumps(value) if value is not None else None
 
     __tablename__ = "pipelines"
+    # Per-user listings filter on the owner (and repository) and order by
+    # creation time; ``id`` is carried in the index so "latest pipeline"
+    # lookups are answered from the index alone (PostgreSQL INCLUDE).
+    __table_args__ = (
+        db.Index("ix_pipelines_user_id_created_at", "user_id", "created_at",
+                 postgresql_include=["id"]),
+        db.Index("ix_pipelines_user_id_github_repo_created_at", "user_id", "github_repo", "created_at",
+                 postgresql_include=["id"]),
+    )
 
     id = db.Column(db.String(8), primary_key=True)
     # Owner — every pipeline belongs to the user who triggered it
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     # Optionally linked to a specific UserRepository
     user_repo_id = db.Column(db.Integer, db.ForeignKey("user_repositories.id"), nullable=True)
     # GitHub Integration: Repo context for the pipeline (format: owner/repo)
@@ -337,6 +355,15 @@ class Pipeline(db.Model):
     completed_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, nullable=False, default=utcnow, index=True)
 
+    # Job queue: queued rows are claimed by workers, which hold a lease that
+    # their heartbeat keeps extending until the run finishes.
+    lease_owner = db.Column(db.String(128), nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    # Executor arguments captured at enqueue time (target dir, image, scan prefs)
+    _job_spec = db.Column("job_spec", db.Text, default="{}")
+
     # Relationships
     scan_results = db.relationship(
         "ScanResult", backref="pipeline", lazy=True, cascade="all, delete-orphan"
@@ -376,31 +403,66 @@ class Pipeline(db.Model):
     def policy_snapshot(self, value):
         self._policy_snapshot = _dump_json_col(value)
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "user_repo_id": self.user_repo_id,
-            "report_dir": self.report_dir,
-            "repo_url": self.repo_url,
-            "repo_name": self.repo_name,
-            "branch": self.branch,
-            "commit_sha": self.commit_sha,
-            "commit_message": self.commit_message,
-            "author": self.author,
-            "status": self.status,
-            "security_score": self.security_score,
-            "is_deployable": self.is_deployable,
-            "vulnerability_summary": self.vulnerability_summary,
-            "stages": self.stages,
-            "duration_seconds": self.duration_seconds,
-            "triggered_by": self.triggered_by,
-            "policy_snapshot": self.policy_snapshot,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "ai_prediction": self.ai_prediction_data,
-        }
+    @property
+    def job_spec(self):
+        return _load_json_col(self._job_spec)
+
+    @job_spec.setter
+    def job_spec(self, value):
+        self._job_spec = _dump_json_col(value)
+
+    # Terminal statuses; a finished pipeline's row and findings no longer change
+    FINISHED_STATUSES = ("success", "failed")
+
+    # API field -> (attribute to_dict reads, column it is stored in), in
+    # to_dict order
+    API_FIELDS = {
+        "id": ("id", "id"),
+        "user_id": ("user_id", "user_id"),
+        "user_repo_id": ("user_repo_id", "user_repo_id"),
+        "report_dir": ("report_dir", "report_dir"),
+        "repo_url": ("repo_url", "repo_url"),
+        "repo_name": ("repo_name", "repo_name"),
+        "branch": ("branch", "branch"),
+        "commit_sha": ("commit_sha", "commit_sha"),
+        "commit_message": ("commit_message", "commit_message"),
+        "author": ("author", "author"),
+        "status": ("status", "status"),
+        "security_score": ("security_score", "security_score"),
+        "is_deployable": ("is_deployable", "is_deployable"),
+        "vulnerability_summary": ("vulnerability_summary", "_vulnerability_summary"),
+        "stages": ("stages", "_stages"),
+        "duration_seconds": ("duration_seconds", "duration_seconds"),
+        "triggered_by": ("triggered_by", "_triggered_by"),
+        "policy_snapshot": ("policy_snapshot", "_policy_snapshot"),
+        "started_at": ("started_at", "started_at"),
+        "completed_at": ("completed_at", "completed_at"),
+        "created_at": ("created_at", "created_at"),
+        "ai_prediction": ("ai_prediction_data", "ai_prediction"),
+    }
+
+    # Fields shown in pipeline lists; the stage, trigger, policy and AI
+    # blobs are only needed for a single pipeline's detail view
+    LIST_FIELDS = (
+        "id", "repo_url", "repo_name", "branch", "commit_sha", "commit_message",
+        "author", "status", "security_score", "is_deployable",
+        "vulnerability_summary", "duration_seconds", "started_at",
+        "completed_at", "created_at",
+    )
+
+    @classmethod
+    def columns_for(cls, fields):
+        """Mapped columns needed to serialize ``fields`` (for load_only)."""
+        return [getattr(cls, cls.API_FIELDS[name][1]) for name in fields]
+
+    def to_dict(self, fields=None):
+        data = {}
+        for name in fields or self.API_FIELDS:
+            value = getattr(self, self.API_FIELDS[name][0])
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            data[name] = value
+        return data
 
     def __repr__(self):
         return f"<Pipeline {self.id!r} status={self.status!r}>"
@@ -412,11 +474,13 @@ class Pipeline(db.Model):
 
 class ScanResult(db.Model):
     __tablename__ = "scan_results"
+    # Report endpoints look up one scanner's result of one pipeline
+    __table_args__ = (
+        db.Index("ix_scan_results_pipeline_id_scanner_type", "pipeline_id", "scanner_type"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    pipeline_id = db.Column(
-        db.String(8), db.ForeignKey("pipelines.id"), nullable=False, index=True
-    )
+    pipeline_id = db.Column(db.String(8), db.ForeignKey("pipelines.id"), nullable=False)
     scanner_type = db.Column(db.String(30), nullable=False)  # sast, trivy, gitleaks, dast
     total_findings = db.Column(db.Integer, default=0)
     critical_count = db.Column(db.Integer, default=0)
@@ -462,14 +526,18 @@ class ScanResult(db.Model):
 
 class Vulnerability(db.Model):
     __tablename__ = "vulnerabilities"
+    # Findings of one scan are paged most severe first (keyset on rank, id)
+    __table_args__ = (
+        db.Index("ix_vulnerabilities_scan_result_id_severity_rank", "scan_result_id", "severity_rank", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    scan_result_id = db.Column(
-        db.Integer, db.ForeignKey("scan_results.id"), nullable=True, index=True
-    )
+    scan_result_id = db.Column(db.Integer, db.ForeignKey("scan_results.id"), nullable=True)
     source = db.Column(db.String(30), nullable=False)       # SAST, Trivy, Gitleaks, DAST
     tool = db.Column(db.String(50), default="")
     severity = db.Column(db.String(20), nullable=False, index=True)
+    # pipeline.findings.severity_rank(severity): 0 = CRITICAL ... 5 = unknown
+    severity_rank = db.Column(db.SmallInteger, nullable=False, default=5, server_default="5")
     title = db.Column(db.String(300), default="")
     message = db.Column(db.Text, default="")
     file_path = db.Column(db.String(500), default="")
@@ -511,13 +579,15 @@ class Vulnerability(db.Model):
 
 class Secret(db.Model):
     __tablename__ = "secrets"
+    __table_args__ = (
+        db.Index("ix_secrets_scan_result_id_severity_rank", "scan_result_id", "severity_rank", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    scan_result_id = db.Column(
-        db.Integer, db.ForeignKey("scan_results.id"), nullable=True, index=True
-    )
+    scan_result_id = db.Column(db.Integer, db.ForeignKey("scan_results.id"), nullable=True)
     rule_id = db.Column(db.String(100), nullable=False)
     severity = db.Column(db.String(20), default="HIGH")
+    severity_rank = db.Column(db.SmallInteger, nullable=False, default=5, server_default="5")
     file_path = db.Column(db.String(500), default="")
     line_number = db.Column(db.Integer, default=0)
     match = db.Column(db.String(200), default="")    # redacted
@@ -542,6 +612,41 @@ class Secret(db.Model):
         return f"<Secret {self.rule_id!r}>"
 
 
+# ---------------------------------------------------------------------------
+# Daily pipeline rollup (maintained by rollups.refresh_pipeline_rollup)
+# ---------------------------------------------------------------------------
+
+class PipelineDailyRollup(db.Model):
+    """Totals of one user's finished pipelines of one repository, per creation day."""
+    __tablename__ = "pipeline_daily_rollups"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "repo", "day", name="uq_pipeline_daily_rollups_user_id_repo_day"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    repo = db.Column(db.String(255), nullable=False, default="")   # Pipeline.github_repo, "" if none
+    day = db.Column(db.Date, nullable=False, index=True)
+    pipelines = db.Column(db.Integer, nullable=False, default=0)
+    succeeded = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    deployable = db.Column(db.Integer, nullable=False, default=0)
+    blocked = db.Column(db.Integer, nullable=False, default=0)      # succeeded but not deployable
+    score_sum = db.Column(db.Integer, nullable=False, default=0)
+    scored = db.Column(db.Integer, nullable=False, default=0)      # pipelines with a security score
+    duration_sum = db.Column(db.Float, nullable=False, default=0.0)
+    # Findings of the day's pipelines, from their ScanResult rows
+    critical = db.Column(db.Integer, nullable=False, default=0)
+    high = db.Column(db.Integer, nullable=False, default=0)
+    medium = db.Column(db.Integer, nullable=False, default=0)
+    low = db.Column(db.Integer, nullable=False, default=0)
+    secrets = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+
+    def __repr__(self):
+        return f"<PipelineDailyRollup user={self.user_id} repo={self.repo!r} day={self.day}>"
+
+
 # ---------------------------------------------------------------------------
 # Per-user settings (one row per user)
 # ---------------------------------------------------------------------------
@@ -583,6 +688,16 @@ class UserSettings(db.Model):
     def to_dict(self):
         return {s: self.get_section(s) for s in self._SECTION_MAP}
 
+    @classmethod
+    def for_user(cls, user) -> "UserSettings":
+        """Return (or create) the settings row for ``user``."""
+        if user.settings:
+            return user.settings
+        settings = cls(user_id=user.id)
+        db.session.add(settings)
+        db.session.commit()
+        return settings
+
     def __repr__(self):
         return f"<UserSettings user_id={self.user_id}>"
 
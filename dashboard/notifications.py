@@ -0,0 +1,290 @@
+"""
+SentinelOps notifications
+In-app notifications and e-mail delivery, shared by the web app and the
+standalone pipeline worker.
+"""
+
+import os
+import smtplib
+import ssl
+import uuid
+from email.message import EmailMessage
+from typing import List, Optional
+
+from flask import current_app
+from sqlalchemy import delete, func, select
+
+from database import db
+from events import broker as event_broker, user_channel
+from models import Notification, User, UserSettings, utcnow
+
+# Email configuration
+SMTP_HOST = os.environ.get("SMTP_HOST", "")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
+SMTP_USER = os.environ.get("SMTP_USER", "")
+SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "")
+SMTP_FROM = os.environ.get("SMTP_FROM", SMTP_USER or "no-reply@sentinelops.local")
+SMTP_USE_TLS = os.environ.get("SMTP_USE_TLS", "true").lower() == "true"
+SMTP_USE_SSL = os.environ.get("SMTP_USE_SSL", "false").lower() == "true"
+
+# In-app notifications kept per user; older ones are pruned on insert
+MAX_NOTIFICATIONS_PER_USER = 100
+
+
+def send_email(to_email: str, subject: str, body_text: str) -> bool:
+    if not to_email:
+        return False
+
+    # --- SMTP fallback ---
+    if not SMTP_HOST or not SMTP_FROM:
+        return False
+    try:
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = SMTP_FROM
+        message["To"] = to_email
+        message.set_content(body_text)
+
+        if SMTP_USE_SSL:
+            with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=15) as server:
+                if SMTP_USER and SMTP_PASSWORD:
+                    server.login(SMTP_USER, SMTP_PASSWORD)
+                server.send_message(message)
+        else:
+            with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=15) as server:
+                if SMTP_USE_TLS:
+                    server.starttls(context=ssl.create_default_context())
+                if SMTP_USER and SMTP_PASSWORD:
+                    server.login(SMTP_USER, SMTP_PASSWORD)
+                server.send_message(message)
+        return True
+    except Exception as exc:
+        current_app.logger.warning(f"Email delivery failed to {to_email}: {exc}")
+        return False
+
+
+def get_user_notification_prefs(user: User) -> dict:
+    defaults = {
+        "email": {
+            "pipelineSuccess": True,
+            "pipelineFailure": True,
+            "criticalVuln": True,
+            "secretDetected": True,
+            "deploymentBlocked": False,
+        },
+        "inApp": True,
+        "weeklySummary": True,
+        "realtimeWebhook": False,
+    }
+    settings = UserSettings.for_user(user)
+    prefs = settings.get_section("notifications") or {}
+    merged = {**defaults, **prefs}
+    if isinstance(prefs.get("email"), dict):
+        merged["email"] = {**defaults["email"], **prefs["email"]}
+    return merged
+
+
+def should_send_email_for_event(prefs: dict, event_key: Optional[str]) -> bool:
+    if not event_key:
+        return False
+    event_pref_map = {
+        "pipeline_success": "pipelineSuccess",
+        "pipeline_failure": "pipelineFailure",
+        "critical_vuln": "criticalVuln",
+        "secret_detected": "secretDetected",
+        "deployment_blocked": "deploymentBlocked",
+    }
+    email_key = event_pref_map.get(event_key)
+    if not email_key:
+        return False
+    email_prefs = prefs.get("email") or {}
+    return bool(email_prefs.get(email_key, False))
+
+
+def add_notifications(user_id: Optional[int], events: List[dict]) -> List[Notification]:
+    """Create a batch of notifications for one user in a single transaction.
+
+    Each event is a dict with ``type``, ``title``, ``message`` and optional
+    ``metadata`` and ``event_key``. The user and their preferences are
+    loaded once, in-app notifications are inserted together with the
+    pruning of the user's history, and once committed they are pushed to
+    the user's open event streams and e-mails are sent.
+    """
+    if user_id is None:
+        current_app.logger.warning(
+            "Skipped %d notification(s) because user_id is required for scoped delivery",
+            len(events),
+        )
+        return []
+
+    user = db.session.get(User, int(user_id))
+    if not user or not user.is_active or not events:
+        return []
+    prefs = get_user_notification_prefs(user)
+
+    created = []
+    payloads = []
+    if bool(prefs.get("inApp", True)):
+        for event in events:
+            notif = Notification(
+                id=str(uuid.uuid4())[:8],
+                user_id=user.id,
+                type=event["type"],
+                title=event["title"],
+                message=event["message"],
+                read=False,
+            )
+            notif.extra_data = {
+                **(event.get("metadata") or {}),
+                "owner_user_id": user.id,
+                "owner_username": user.username,
+            }
+            created.append(notif)
+        db.session.add_all(created)
+        db.session.flush()
+        payloads = [notif.to_dict() for notif in created]
+        prune_notifications([user.id])
+    db.session.commit()
+
+    # Push to the user's open notification streams (in every process when
+    # the event bridge is running)
+    for payload in payloads:
+        event_broker.publish(user_channel(user.id), "notification", payload)
+
+    for event in events:
+        if should_send_email_for_event(prefs, event.get("event_key")):
+            send_email(
+                user.email,
+                f"[SentinelOps] {event['title']}",
+                f"{event['message']}\n\nTimestamp: {utcnow().isoformat()}\n",
+            )
+
+    return created
+
+
+def add_notification(
+    notification_type: str,
+    title: str,
+    message: str,
+    metadata: dict = None,
+    user_id: Optional[int] = None,
+    event_key: Optional[str] = None,
+):
+    """Create in-app notifications (scoped by user preferences) and send email if enabled."""
+    return add_notifications(user_id, [{
+        "type": notification_type,
+        "title": title,
+        "message": message,
+        "metadata": metadata,
+        "event_key": event_key,
+    }])
+
+
+def prune_notifications(user_ids: List[int], keep: int = MAX_NOTIFICATIONS_PER_USER) -> int:
+    """Delete all but the newest ``keep`` notifications of each of ``user_ids``.
+
+    One set-based DELETE ranked per user; does not commit. Returns the number
+    of rows removed.
+    """
+    if not user_ids:
+        return 0
+    ranked = (
+        select(
+            Notification.id,
+            func.row_number().over(
+                partition_by=Notification.user_id,
+                order_by=(Notification.created_at.desc(), Notification.id.desc()),
+            ).label("position"),
+        )
+        .where(Notification.user_id.in_(user_ids))
+        .subquery()
+    )
+    result = db.session.execute(
+        delete(Notification)
+        .where(Notification.id.in_(select(ranked.c.id).where(ranked.c.position > keep)))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
+
+
+# Pipeline.to_dict fields check_and_notify_pipeline_completion reads
+PIPELINE_NOTIFICATION_FIELDS = ("id", "user_id", "status", "security_score", "is_deployable", "vulnerability_summary")
+
+# Track already-notified pipelines
+_notified_pipelines: set = set()
+
+
+def check_and_notify_pipeline_completion(pipeline):
+    global _notified_pipelines
+    if not pipeline:
+        return
+    pipeline_id = pipeline.get("id")
+    user_id = pipeline.get("user_id")
+    status = pipeline.get("status", "").lower()
+    if pipeline_id in _notified_pipelines or status not in ("success", "failed"):
+        return
+
+    _notified_pipelines.add(pipeline_id)
+    if len(_notified_pipelines) > 100:
+        _notified_pipelines = set(list(_notified_pipelines)[-50:])
+
+    security_score = pipeline.get("security_score", 0)
+    is_deployable = pipeline.get("is_deployable", False)
+    vuln_summary = pipeline.get("vulnerability_summary", {})
+
+    events = []
+    if status == "success":
+        if vuln_summary.get("critical", 0) > 0:
+            events.append({
+                "type": "critical",
+                "title": "Critical Vulnerabilities Detected",
+                "message": f"{vuln_summary.get('critical', 0)} critical vulnerabilities detected in pipeline {pipeline_id}.",
+                "metadata": {"pipeline_id": pipeline_id, "critical_count": vuln_summary.get("critical", 0)},
+                "event_key": "critical_vuln",
+            })
+
+        if (vuln_summary.get("secrets_found", 0) or vuln_summary.get("secrets", 0)) > 0:
+            secret_total = vuln_summary.get("secrets_found", 0) or vuln_summary.get("secrets", 0)
+            events.append({
+                "type": "warning",
+                "title": "Secret Detected",
+                "message": f"{secret_total} secret finding(s) detected in pipeline {pipeline_id}.",
+                "metadata": {"pipeline_id": pipeline_id, "secret_count": secret_total},
+                "event_key": "secret_detected",
+            })
+
+        if is_deployable:
+            events.append({
+                "type": "success",
+                "title": "Deployment Approved",
+                "message": f"Pipeline passed security checks. Score: {security_score}/100",
+                "metadata": {"pipeline_id": pipeline_id, "security_score": security_score},
+                "event_key": "pipeline_success",
+            })
+        else:
+            reasons = []
+            if security_score < 70:
+                reasons.append(f"Score {security_score} below threshold")
+            if vuln_summary.get("critical", 0) > 0:
+                reasons.append(f"{vuln_summary['critical']} critical vulnerabilities")
+            if vuln_summary.get("high", 0) > 5:
+                reasons.append(f"{vuln_summary['high']} high severity issues")
+            reason_text = "; ".join(reasons) if reasons else "Security requirements not met"
+            events.append({
+                "type": "critical",
+                "title": "Deployment Blocked",
+                "message": f"Pipeline blocked. {reason_text}. Score: {security_score}/100",
+                "metadata": {"pipeline_id": pipeline_id, "security_score": security_score, "reasons": reasons},
+                "event_key": "deployment_blocked",
+            })
+    else:
+        events.append({
+            "type": "warning",
+            "title": "Pipeline Failed",
+            "message": "Security scan failed to complete",
+            "metadata": {"pipeline_id": pipeline_id},
+            "event_key": "pipeline_failure",
+        })
+
+    # All of a pipeline's notifications go out in one transaction
+    add_notifications(user_id, events)
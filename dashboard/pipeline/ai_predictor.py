@@ -3,6 +3,8 @@ import json
 import logging
 import random
 
+from .report_store import open_report, report_exists
+
 logger = logging.getLogger('SentinelOps.AIPredictor')
 
 GEMINI_MODEL = "gemini-2.5-flash"
@@ -25,7 +27,8 @@ def predict_vulnerabilities(input_data):
     """
     AI-based vulnerability prediction using the Google Gemini API (google-genai SDK).
     Args:
-        input_data (dict): Paths to scan reports.
+        input_data (dict): Repository details plus either ``findings`` (the
+            run's normalized findings brief) or paths to scan reports.
     Returns:
         dict: Prediction results with risk_score, likely_vulnerable_areas, suggestions.
     """
@@ -53,22 +56,26 @@ def predict_vulnerabilities(input_data):
             "Scan summaries:",
         ]
 
-        for rkey, rname in [
-            ("sast_report_path", "SAST"),
-            ("trivy_report_path", "Trivy"),
-            ("gitleaks_report_path", "Gitleaks"),
-            ("dast_report_path", "DAST"),
-        ]:
-            rpath = input_data.get(rkey)
-            if rpath and os.path.exists(rpath):
-                try:
-                    with open(rpath, "r") as f:
-                        content = f.read()
-                    if len(content) > 20000:
-                        content = content[:20000] + "\n...[TRUNCATED]"
-                    prompt_parts.append(f"[{rname}]\n{content}")
-                except Exception:
-                    pass
+        findings = input_data.get("findings")
+        if findings:
+            prompt_parts.append(json.dumps(findings, separators=(",", ":")))
+        else:
+            for rkey, rname in [
+                ("sast_report_path", "SAST"),
+                ("trivy_report_path", "Trivy"),
+                ("gitleaks_report_path", "Gitleaks"),
+                ("dast_report_path", "DAST"),
+            ]:
+                rpath = input_data.get(rkey)
+                if rpath and report_exists(rpath):
+                    try:
+                        with open_report(rpath) as f:
+                            content = f.read()
+                        if len(content) > 20000:
+                            content = content[:20000] + "\n...[TRUNCATED]"
+                        prompt_parts.append(f"[{rname}]\n{content}")
+                    except Exception:
+                        pass
 
         response = client.models.generate_content(
             model=GEMINI_MODEL,
@@ -525,7 +525,7 @@ def run_dast_scan(
                     scan_type, f"Could not start container: {msg}",
                 )
                 with open(output_path, "w") as f:
-                    json.dump(report, f, indent=2)
+                    json.dump(report, f, separators=(",", ":"))
                 return report
 
             container_started = True
@@ -539,7 +539,7 @@ def run_dast_scan(
                     scan_type, f"Container did not become ready on port {app_port}",
                 )
                 with open(output_path, "w") as f:
-                    json.dump(report, f, indent=2)
+                    json.dump(report, f, separators=(",", ":"))
                 return report
 
         if not target_url:
@@ -548,7 +548,7 @@ def run_dast_scan(
                 "No target URL or container image provided",
             )
             with open(output_path, "w") as f:
-                json.dump(report, f, indent=2)
+                json.dump(report, f, separators=(",", ":"))
             return report
 
         # Run ZAP if Docker is available
@@ -579,7 +579,7 @@ def run_dast_scan(
         )
 
         with open(output_path, "w") as f:
-            json.dump(report, f, indent=2)
+            json.dump(report, f, separators=(",", ":"))
         logger.info(f"DAST report saved to {output_path}")
 
         return report
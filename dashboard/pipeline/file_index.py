@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Workspace file index for SentinelOps
+Walks a checked-out repository once and records every file's relative path,
+size, extension and language. Pipeline stages (language detection,
+ShellCheck, the fallback secret scanner, Trivy metadata) read the index
+instead of each walking and stat-ing the tree again.
+"""
+
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+def relative_path(path: str, root: str) -> str:
+    """``path`` relative to ``root``; relative paths and paths outside ``root`` are returned as-is."""
+    if not path or not os.path.isabs(path):
+        return path
+    rel = os.path.relpath(path, root)
+    return path if rel == ".." or rel.startswith(".." + os.sep) else rel
+
+
+class FileEntry:
+    """One regular file in the index. ``path`` is relative to the index root."""
+
+    __slots__ = ("path", "size", "ext", "language", "excluded")
+
+    def __init__(self, path: str, size: int, ext: str, language: Optional[str], excluded: bool):
+        self.path = path
+        self.size = size
+        self.ext = ext
+        self.language = language
+        self.excluded = excluded
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+
+class FileIndex:
+    """Files under ``root`` found by a single directory walk.
+
+    ``.git`` is never descended into. Files below any directory named in
+    ``exclude_dirs`` are kept (they count towards ``total_size``) but
+    flagged ``excluded`` and skipped by :meth:`files` by default.
+    """
+
+    __slots__ = ("root", "entries", "total_size")
+
+    def __init__(self, root: str, entries: List[FileEntry]):
+        self.root = root
+        self.entries = entries
+        self.total_size = sum(entry.size for entry in entries)
+
+    @classmethod
+    def build(
+        cls,
+        root: str,
+        ext_languages: Optional[Dict[str, str]] = None,
+        exclude_dirs: Iterable[str] = (),
+    ) -> "FileIndex":
+        ext_languages = ext_languages or {}
+        exclude_dirs = frozenset(exclude_dirs)
+        entries: List[FileEntry] = []
+        # (absolute dir, relative dir, inside an excluded dir)
+        stack = [(root, "", False)]
+        while stack:
+            abs_dir, rel_dir, excluded = stack.pop()
+            try:
+                with os.scandir(abs_dir) as it:
+                    dir_entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in dir_entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir():
+                        if entry.name != ".git":
+                            subdirs.append((entry.path, rel_path, excluded or entry.name in exclude_dirs))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    size = entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+                ext = os.path.splitext(entry.name)[1].lower()
+                entries.append(FileEntry(rel_path, size, ext, ext_languages.get(ext), excluded))
+            # Reverse so directories are visited in name order
+            stack.extend(reversed(subdirs))
+        return cls(root, entries)
+
+    def files(self, extensions: Optional[Iterable[str]] = None,
+              include_excluded: bool = False) -> Iterator[FileEntry]:
+        """Entries, optionally limited to the given (lowercase) extensions."""
+        wanted = frozenset(extensions) if extensions is not None else None
+        for entry in self.entries:
+            if entry.excluded and not include_excluded:
+                continue
+            if wanted is not None and entry.ext not in wanted:
+                continue
+            yield entry
+
+    def by_language(self) -> Dict[str, List[str]]:
+        """Relative paths of non-excluded files, grouped by language."""
+        languages: Dict[str, List[str]] = {}
+        for entry in self.files():
+            if entry.language:
+                languages.setdefault(entry.language, []).append(entry.path)
+        return languages
+
+    def abspath(self, entry: FileEntry) -> str:
+        return os.path.join(self.root, entry.path)
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Normalized findings model for SentinelOps
+Each scanner report of a run (unified SAST or Bandit, Trivy, Gitleaks, ZAP)
+is parsed once into compact ``Finding`` records plus a per-scanner
+``ScanSummary``. Scoring, the AI prompt, the decision report, database
+ingestion and the report API all read this model instead of re-parsing
+the raw reports.
+
+A finished run stores the model next to its reports:
+
+  - findings-summary.json  per-scanner totals and severity counts (small)
+  - findings.json          every finding, stored column-wise
+
+Findings are streamed from the raw reports to findings.json and on to the
+database one at a time; only totals and the most severe findings are kept
+in memory.
+"""
+
+import heapq
+import json
+import os
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .file_index import relative_path
+from .json_stream import iter_json_values
+from .report_store import load_report, report_exists
+
+FINDINGS_FILE = "findings.json"
+FINDINGS_SUMMARY_FILE = "findings-summary.json"
+SCHEMA_VERSION = 1
+
+SOURCES = ("SAST", "Trivy", "Gitleaks", "DAST")
+
+# Most severe findings kept in memory for the AI prompt
+TOP_FINDINGS = 100
+
+# Severity buckets stored on ScanResult rows; anything else counts as LOW
+SEVERITY_BUCKETS = ("CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO")
+
+_SEVERITY_ORDER = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
+
+# Sort key stored with each ingested finding so findings can be paged most
+# severe first; ZAP reports "Informational"
+SEVERITY_RANKS = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3, "INFO": 4, "INFORMATIONAL": 4}
+UNKNOWN_SEVERITY_RANK = 5
+
+# CVSS used for a Trivy finding that carries no vendor score
+_SEVERITY_CVSS = {"CRITICAL": 9.5, "HIGH": 8.0, "MEDIUM": 5.5, "LOW": 2.0}
+
+# Parts of the large reports that are read; everything else is skipped
+# while streaming
+_SAST_PREFIXES = ("results.item", "metrics", "languages_detected", "tools_used")
+_TRIVY_PREFIXES = ("ArtifactName", "Results.item.Target", "Results.item.Vulnerabilities.item")
+_SAVED_PREFIXES = ("schema_version", "columns", "findings.item")
+
+
+def severity_rank(severity: str) -> int:
+    return SEVERITY_RANKS.get((severity or "").upper(), UNKNOWN_SEVERITY_RANK)
+
+
+class Finding:
+    """One normalized finding. Fields that don't apply to a scanner are empty."""
+
+    __slots__ = (
+        "source", "tool", "severity", "title", "message", "file", "line",
+        "rule_id", "language", "url", "cwe_id", "vulnerability_id",
+        "fixed_version", "cvss", "match", "commit", "author",
+    )
+
+    def __init__(self, source: str, tool: str = "", severity: str = "LOW", title: str = "",
+                 message: str = "", file: str = "", line: int = 0, rule_id: str = "",
+                 language: str = "", url: str = "", cwe_id: str = "", vulnerability_id: str = "",
+                 fixed_version: str = "", cvss: float = 0.0, match: str = "", commit: str = "",
+                 author: str = ""):
+        self.source = source
+        self.tool = tool
+        self.severity = severity
+        self.title = title
+        self.message = message
+        self.file = file
+        self.line = line
+        self.rule_id = rule_id
+        self.language = language
+        self.url = url
+        self.cwe_id = cwe_id
+        self.vulnerability_id = vulnerability_id
+        self.fixed_version = fixed_version
+        self.cvss = cvss
+        self.match = match
+        self.commit = commit
+        self.author = author
+
+    def to_row(self) -> list:
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_row(cls, columns: List[str], row: list) -> "Finding":
+        return cls(**dict(zip(columns, row)))
+
+
+class ScanSummary:
+    """Totals for one scanner's report.
+
+    ``counts`` maps the scanner's own severity labels (including ones such as
+    UNKNOWN or INFORMATIONAL) to the number of findings; ``meta`` carries the
+    report-level fields the API shows (tool, languages, target URL, ...).
+    """
+
+    __slots__ = ("source", "total", "counts", "raw_report", "meta")
+
+    def __init__(self, source: str, total: int = 0, counts: Optional[Dict[str, int]] = None,
+                 raw_report: str = "", meta: Optional[Dict[str, Any]] = None):
+        self.source = source
+        self.total = total
+        self.counts = counts or {}
+        self.raw_report = raw_report
+        self.meta = meta or {}
+
+    def count(self, severity: str) -> int:
+        return self.counts.get(severity, 0)
+
+    def bucketed(self) -> Dict[str, int]:
+        """Counts folded into SEVERITY_BUCKETS, unknown labels as LOW."""
+        buckets = dict.fromkeys(SEVERITY_BUCKETS, 0)
+        for severity, n in self.counts.items():
+            buckets[severity if severity in buckets else "LOW"] += n
+        return buckets
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "counts": self.counts,
+            "raw_report": self.raw_report,
+            "meta": self.meta,
+        }
+
+    @classmethod
+    def from_dict(cls, source: str, data: Dict[str, Any]) -> "ScanSummary":
+        return cls(source, data.get("total", 0), data.get("counts"),
+                   data.get("raw_report", ""), data.get("meta"))
+
+
+# ── Per-scanner parsers ─────────────────────────────────────────
+
+def _sast_finding(item: dict) -> Finding:
+    cwe = item.get("cwe") or item.get("issue_cwe") or {}
+    return Finding(
+        "SAST",
+        tool=item.get("tool") or "",
+        severity=(item.get("severity") or item.get("issue_severity") or "LOW").upper(),
+        title=item.get("rule_name") or item.get("message") or item.get("issue_text") or "",
+        message=item.get("message") or item.get("issue_text") or item.get("code") or "",
+        file=item.get("file") or item.get("filename") or item.get("path") or "",
+        line=int(item.get("line") or item.get("line_number") or 0),
+        rule_id=item.get("rule_id") or item.get("test_id") or "",
+        language=item.get("language") or "",
+        url=item.get("more_info") or item.get("url") or "",
+        cwe_id=str((cwe.get("id") if isinstance(cwe, dict) else "") or ""),
+    )
+
+
+def _iter_sast(reports_dir: str, scan: ScanSummary) -> Iterator[Finding]:
+    # Unified SAST report, or the Bandit-only report of older runs
+    raw_report = next(
+        (name for name in ("sast-report.json", "bandit-report.json")
+         if report_exists(os.path.join(reports_dir, name))),
+        None,
+    )
+    fields: Dict[str, Any] = {}
+    counts: Counter = Counter()
+    if raw_report:
+        try:
+            for prefix, value in iter_json_values(os.path.join(reports_dir, raw_report), _SAST_PREFIXES):
+                if prefix == "results.item":
+                    finding = _sast_finding(value)
+                    counts[finding.severity] += 1
+                    yield finding
+                else:
+                    fields[prefix] = value
+        except (OSError, ValueError):
+            # Keep what was read before the report turned out truncated
+            pass
+        if raw_report == "bandit-report.json":
+            fields.setdefault("languages_detected", ["python"])
+            fields.setdefault("tools_used", ["bandit"])
+
+    metrics = fields.get("metrics") or {}
+    totals = metrics.get("totals", {})
+    if totals:
+        scan.counts = {
+            "CRITICAL": totals.get("critical", 0),
+            "HIGH": totals.get("high", 0),
+            "MEDIUM": totals.get("medium", 0),
+            "LOW": totals.get("low", 0),
+            "INFO": totals.get("info", 0),
+        }
+        scan.total = totals.get("total", sum(scan.counts.values()))
+    else:
+        scan.counts = dict(counts)
+        scan.total = sum(counts.values())
+    scan.raw_report = raw_report or "sast-report.json"
+    scan.meta = {
+        "languages_detected": fields.get("languages_detected", []),
+        "tools_used": fields.get("tools_used", []),
+        "by_language": metrics.get("by_language", {}),
+        "by_tool": metrics.get("by_tool", {}),
+    }
+
+
+def _trivy_cvss(vuln: dict, severity: str) -> float:
+    score = 0.0
+    for scores in (vuln.get("CVSS") or {}).values():
+        if "V3Score" in scores:
+            score = max(score, scores.get("V3Score") or 0.0)
+        elif "V2Score" in scores:
+            score = max(score, scores.get("V2Score") or 0.0)
+    return score or _SEVERITY_CVSS.get(severity, 0.0)
+
+
+def _trivy_finding(vuln: dict, target: str) -> Finding:
+    severity = (vuln.get("Severity") or "UNKNOWN").upper()
+    return Finding(
+        "Trivy",
+        tool="trivy",
+        severity=severity,
+        title=vuln.get("Title") or vuln.get("VulnerabilityID") or "",
+        message=vuln.get("Description") or "",
+        file=vuln.get("PkgName") or target or "",
+        rule_id=vuln.get("VulnerabilityID") or "",
+        url=vuln.get("PrimaryURL") or "",
+        vulnerability_id=vuln.get("VulnerabilityID") or "",
+        fixed_version=vuln.get("FixedVersion") or "",
+        cvss=float(_trivy_cvss(vuln, severity)),
+    )
+
+
+def _iter_trivy(reports_dir: str, scan: ScanSummary, source_root: Optional[str] = None) -> Iterator[Finding]:
+    scan.raw_report = "trivy-report.json"
+    counts: Counter = Counter()
+    target = ""
+    try:
+        for prefix, value in iter_json_values(os.path.join(reports_dir, scan.raw_report), _TRIVY_PREFIXES):
+            if prefix == "Results.item.Target":
+                target = relative_path(value, source_root) if source_root else value
+            elif prefix == "ArtifactName":
+                scan.meta["artifact"] = value
+            else:
+                finding = _trivy_finding(value, target)
+                counts[finding.severity] += 1
+                yield finding
+        scan.meta.setdefault("artifact", "")
+    except (OSError, ValueError):
+        pass
+    scan.counts = dict(counts)
+    scan.total = sum(counts.values())
+
+
+def _iter_gitleaks(reports_dir: str, scan: ScanSummary) -> Iterator[Finding]:
+    scan.raw_report = "gitleaks-report.json"
+    data = load_report(os.path.join(reports_dir, scan.raw_report)) or {}
+    counts: Counter = Counter()
+    for s in data.get("results", []) or []:
+        finding = Finding(
+            "Gitleaks",
+            tool=data.get("tool") or "gitleaks",
+            severity=(s.get("severity") or "MEDIUM").upper(),
+            title=s.get("description") or s.get("rule_id") or "",
+            file=s.get("file") or "",
+            line=int(s.get("line") or 0),
+            rule_id=s.get("rule_id") or "",
+            match=s.get("match") or "",
+            commit=s.get("commit") or "",
+            author=s.get("author") or "",
+        )
+        counts[finding.severity] += 1
+        yield finding
+    scan.counts = dict(counts)
+    scan.total = sum(counts.values())
+    scan.meta = {"tool": data["tool"], "tool_available": data.get("tool_available", False)} if data else {}
+
+
+def _iter_dast(reports_dir: str, scan: ScanSummary) -> Iterator[Finding]:
+    scan.raw_report = "dast-report.json"
+    data = load_report(os.path.join(reports_dir, scan.raw_report)) or {}
+    counts: Counter = Counter()
+    for alert in data.get("results", []) or []:
+        urls = alert.get("urls") or []
+        finding = Finding(
+            "DAST",
+            tool="zap",
+            severity=(alert.get("risk") or "LOW").upper(),
+            title=alert.get("alert") or alert.get("name") or "",
+            message=alert.get("description") or alert.get("desc") or "",
+            file=(urls[0] if urls else alert.get("url")) or "",
+            url=alert.get("reference") or "",
+            cwe_id=str(alert.get("cweid") or ""),
+        )
+        counts[finding.severity] += 1
+        yield finding
+    scan.counts = dict(counts)
+    scan.total = sum(counts.values())
+    scan.meta = {
+        "tool": data["tool"],
+        "tool_available": data.get("tool_available", False),
+        "target_url": data.get("target_url", ""),
+    } if data else {}
+
+
+def iter_report_findings(reports_dir: str, source_root: Optional[str] = None,
+                         scans: Optional[Dict[str, ScanSummary]] = None) -> Iterator[Finding]:
+    """Findings parsed from a run's raw scanner reports, one at a time.
+
+    ``source_root`` is the scanned checkout; paths below it in the raw
+    Trivy report are made relative. The SAST and secrets reports are
+    written with relative paths by their scanners. When ``scans`` is
+    given, each scanner's ScanSummary is added to it once its report has
+    been consumed.
+    """
+    parsers = (
+        ("SAST", lambda scan: _iter_sast(reports_dir, scan)),
+        ("Trivy", lambda scan: _iter_trivy(reports_dir, scan, source_root)),
+        ("Gitleaks", lambda scan: _iter_gitleaks(reports_dir, scan)),
+        ("DAST", lambda scan: _iter_dast(reports_dir, scan)),
+    )
+    for source, parse in parsers:
+        scan = ScanSummary(source)
+        yield from parse(scan)
+        if scans is not None:
+            scans[source] = scan
+
+
+class Findings:
+    """Totals of one pipeline run's findings, grouped by scanner.
+
+    Individual findings are not kept: the model holds each scanner's
+    ScanSummary, the highest CVSS per scanner and the TOP_FINDINGS most
+    severe findings, so its size does not depend on the size of the
+    reports. Every finding is streamed to findings.json instead.
+    """
+
+    __slots__ = ("scans", "top", "cvss", "_seen")
+
+    def __init__(self, scans: Optional[Dict[str, ScanSummary]] = None):
+        self.scans = scans if scans is not None else {}
+        # Bounded heap of (inverted rank key, Finding); the root is the least severe kept
+        self.top: List[Tuple[tuple, Finding]] = []
+        self.cvss: Dict[str, float] = {}
+        self._seen = 0
+
+    def add(self, finding: Finding) -> None:
+        """Fold one finding into the per-scanner maximum CVSS and the top findings."""
+        if finding.cvss > self.cvss.get(finding.source, 0.0):
+            self.cvss[finding.source] = finding.cvss
+        self._seen += 1
+        # Most severe, then highest CVSS, then first seen; inverted for the min-heap
+        key = (-_SEVERITY_ORDER.get(finding.severity, 4), finding.cvss, -self._seen)
+        if len(self.top) < TOP_FINDINGS:
+            heapq.heappush(self.top, (key, finding))
+        elif key > self.top[0][0]:
+            heapq.heapreplace(self.top, (key, finding))
+
+    @classmethod
+    def from_reports(cls, reports_dir: str, source_root: Optional[str] = None,
+                     save: bool = False) -> "Findings":
+        """Stream each scanner report in ``reports_dir`` once.
+
+        With ``save``, every finding is appended to findings.json as it is
+        parsed (the file is renamed into place once complete; OSError
+        propagates). findings-summary.json is written by :meth:`save_summary`
+        once the caller has finished amending the scans' meta.
+        """
+        findings = cls()
+        stream = iter_report_findings(reports_dir, source_root, findings.scans)
+        if not save:
+            for finding in stream:
+                findings.add(finding)
+            return findings
+
+        path = os.path.join(reports_dir, FINDINGS_FILE)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps({"schema_version": SCHEMA_VERSION, "columns": list(Finding.__slots__)},
+                                   separators=(",", ":"))[:-1])
+                f.write(',"findings":[')
+                for index, finding in enumerate(stream):
+                    findings.add(finding)
+                    if index:
+                        f.write(",")
+                    f.write(json.dumps(finding.to_row(), separators=(",", ":")))
+                f.write("]}")
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return findings
+
+    def save_summary(self, reports_dir: str) -> None:
+        with open(os.path.join(reports_dir, FINDINGS_SUMMARY_FILE), "w") as f:
+            json.dump(self.summary_dict(), f, separators=(",", ":"))
+
+    def scan(self, source: str) -> ScanSummary:
+        if source not in self.scans:
+            self.scans[source] = ScanSummary(source)
+        return self.scans[source]
+
+    def max_cvss(self, source: str) -> float:
+        return self.cvss.get(source, 0.0)
+
+    def summary_dict(self) -> Dict[str, Any]:
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "scans": {source: scan.to_dict() for source, scan in self.scans.items()},
+        }
+
+    def brief(self, limit: int = TOP_FINDINGS) -> Dict[str, Any]:
+        """Scanner totals plus the ``limit`` (at most TOP_FINDINGS) most severe findings, for prompts."""
+        ranked = [finding for _, finding in sorted(self.top, reverse=True)]
+        return {
+            "scans": {source: {"total": scan.total, "counts": scan.counts} for source, scan in self.scans.items()},
+            "top_findings": [
+                {
+                    "source": f.source,
+                    "severity": f.severity,
+                    "title": f.title[:200],
+                    "file": f.file,
+                    "line": f.line,
+                    "rule_id": f.rule_id,
+                }
+                for f in ranked[:limit]
+            ],
+        }
+
+
+def _iter_saved_findings(path: str) -> Iterator[Finding]:
+    columns: List[str] = []
+    for prefix, value in iter_json_values(path, _SAVED_PREFIXES):
+        if prefix == "schema_version":
+            if value != SCHEMA_VERSION:
+                raise ValueError(f"Unsupported findings schema {value} in {path}")
+        elif prefix == "columns":
+            columns = value
+        else:
+            yield Finding.from_row(columns, value)
+
+
+def iter_findings(reports_dir: str) -> Iterator[Finding]:
+    """A run's findings one at a time, streamed from findings.json when present."""
+    path = os.path.join(reports_dir, FINDINGS_FILE)
+    if report_exists(path):
+        yield from _iter_saved_findings(path)
+    else:
+        yield from iter_report_findings(reports_dir)
+
+
+def scans_from_summary(summary: Optional[Dict[str, Any]]) -> Optional[Dict[str, ScanSummary]]:
+    """Decode a findings-summary.json document; None if absent or outdated."""
+    if not summary or summary.get("schema_version") != SCHEMA_VERSION:
+        return None
+    return {source: ScanSummary.from_dict(source, scan) for source, scan in summary.get("scans", {}).items()}
+
+
+def load_scan_summaries(reports_dir: str) -> Dict[str, ScanSummary]:
+    """Per-scanner summaries of a run without keeping individual findings."""
+    scans = scans_from_summary(load_report(os.path.join(reports_dir, FINDINGS_SUMMARY_FILE)))
+    if scans is None:
+        scans = {}
+        for _ in iter_report_findings(reports_dir, scans=scans):
+            pass
+    return scans
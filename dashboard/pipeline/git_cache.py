@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Git mirror cache for SentinelOps
+Keeps one bare mirror per repository under GIT_CACHE_DIR, keyed by the
+normalized repository URL. A run updates the mirror with an incremental
+``git fetch`` and then makes its working copy with a local clone, which
+hardlinks the object store instead of downloading it again.
+
+  - Per-repository locking: fetches take an exclusive lock, checkouts a
+    shared one, so concurrent runs of the same repository never see a
+    half-updated mirror.
+  - LRU eviction: least recently used mirrors are deleted once the cache
+    grows past GIT_CACHE_MAX_BYTES. Each fetch records the mirror's size
+    in a ``<mirror>.size`` sidecar, so :func:`evict_mirrors` never walks a
+    mirror; the worker pool runs it periodically, not on every checkout.
+
+Credentials embedded in a URL are only passed on the command line of each
+fetch, never written to the mirror's config.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - non-POSIX hosts
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger("SentinelOps.GitCache")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.absolute()
+
+GIT_CACHE_ENABLED = os.getenv("GIT_CACHE_ENABLED", "true").lower() == "true"
+GIT_CACHE_DIR = os.getenv("GIT_CACHE_DIR", str(PROJECT_ROOT / "runtime" / "git-cache"))
+GIT_CACHE_MAX_BYTES = int(os.getenv("GIT_CACHE_MAX_BYTES", str(10 * 1024 ** 3)))
+GIT_FETCH_TIMEOUT_SECONDS = int(os.getenv("GIT_FETCH_TIMEOUT_SECONDS", "600"))
+
+# Refs mirrored from the remote
+_FETCH_REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+
+# Fallback for hosts without fcntl: serializes access within this process only
+_process_locks: dict = {}
+_process_locks_guard = threading.Lock()
+
+
+def normalize_repo_url(repo_url: str) -> str:
+    """Canonical form of a repository URL used as the cache key.
+
+    Drops credentials, scheme, a trailing ``.git`` and slash, and lowercases
+    the host, so ``https://token@github.com/Org/App.git`` and
+    ``https://github.com/Org/App`` share one mirror.
+    """
+    url = repo_url.strip()
+    if "://" not in url and ":" in url and "@" in url.split(":", 1)[0]:
+        # scp-like syntax: git@github.com:org/repo.git
+        host_part, path = url.split(":", 1)
+        host = host_part.split("@", 1)[1]
+    else:
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        if parts.port:
+            host = f"{host}:{parts.port}"
+        path = parts.path
+    path = path.strip("/")
+    if path.endswith(".git"):
+        path = path[:-4]
+    return f"{host.lower()}/{path}"
+
+
+def mirror_path(repo_url: str, cache_dir: str = GIT_CACHE_DIR) -> str:
+    key = normalize_repo_url(repo_url)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    name = key.rsplit("/", 1)[-1] or "repo"
+    return os.path.join(cache_dir, f"{name}-{digest}.git")
+
+
+@contextmanager
+def _repo_lock(path: str, exclusive: bool, blocking: bool = True) -> Iterator[bool]:
+    """Hold the lock guarding the mirror at ``path``; yields whether it was acquired."""
+    if not FCNTL_AVAILABLE:
+        with _process_locks_guard:
+            lock = _process_locks.setdefault(path, threading.Lock())
+        acquired = lock.acquire(blocking)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+        return
+
+    with open(path + ".lock", "a") as handle:
+        flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        if not blocking:
+            flags |= fcntl.LOCK_NB
+        try:
+            fcntl.flock(handle, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _git(args, cwd: Optional[str] = None, timeout: int = GIT_FETCH_TIMEOUT_SECONDS) -> str:
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, timeout=timeout,
+        env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _record_mirror_size(path: str) -> None:
+    # count-objects sums the pack and loose object sizes without walking them
+    stats = {}
+    for line in _git(["count-objects", "-v"], cwd=path, timeout=60).splitlines():
+        key, _, value = line.partition(": ")
+        stats[key] = value
+    size = sum(int(stats.get(key) or 0) for key in ("size", "size-pack", "size-garbage")) * 1024
+    tmp = f"{path}.size.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp, "w") as f:
+        f.write(str(size))
+    os.replace(tmp, path + ".size")
+
+
+def _mirror_size(path: str) -> int:
+    """Size recorded by the mirror's last fetch; walked only if none was recorded."""
+    try:
+        with open(path + ".size") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return _dir_size(path)
+
+
+def _update_mirror(repo_url: str, path: str) -> None:
+    if not os.path.isdir(path):
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        _git(["init", "--bare", "--quiet", tmp_path])
+        os.replace(tmp_path, path)
+        logger.info(f"Created git mirror for {normalize_repo_url(repo_url)}")
+    _git(["fetch", "--prune", "--quiet", "--no-tags", repo_url, *_FETCH_REFSPECS], cwd=path)
+    try:
+        _record_mirror_size(path)
+    except (RuntimeError, OSError, ValueError, subprocess.TimeoutExpired) as exc:
+        logger.warning(f"Could not record size of git mirror {os.path.basename(path)}: {exc}")
+
+
+def evict_mirrors(cache_dir: str = GIT_CACHE_DIR, max_bytes: int = GIT_CACHE_MAX_BYTES) -> int:
+    """Delete least recently used mirrors until the cache fits ``max_bytes``.
+
+    Sizes come from each mirror's ``.size`` sidecar. Mirrors in use by a
+    run (lock held) are skipped. Returns the number of mirrors removed.
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+    mirrors = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_dir() and entry.name.endswith(".git"):
+            mirrors.append((entry.stat().st_mtime, entry.path, _mirror_size(entry.path)))
+    total = sum(size for _, _, size in mirrors)
+    removed = 0
+    for _, path, size in sorted(mirrors):
+        if total <= max_bytes:
+            break
+        with _repo_lock(path, exclusive=True, blocking=False) as acquired:
+            if not acquired:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            try:
+                os.remove(path + ".size")
+            except OSError:
+                pass
+        total -= size
+        removed += 1
+        logger.info(f"Evicted git mirror {os.path.basename(path)} ({size} bytes)")
+    return removed
+
+
+def checkout_from_cache(repo_url: str, branch: str, dest: str,
+                        cache_dir: str = GIT_CACHE_DIR) -> Tuple[bool, str]:
+    """Fetch ``repo_url`` into its mirror and check ``branch`` out into ``dest``.
+
+    ``dest`` must be absent or empty. Returns ``(success, message)``; on
+    failure ``dest`` is left empty so the caller can fall back to a plain
+    clone.
+    """
+    if not GIT_CACHE_ENABLED:
+        return False, "Git cache disabled"
+    os.makedirs(cache_dir, exist_ok=True)
+    path = mirror_path(repo_url, cache_dir)
+    started = time.monotonic()
+    try:
+        with _repo_lock(path, exclusive=True):
+            _update_mirror(repo_url, path)
+        fetch_seconds = time.monotonic() - started
+        with _repo_lock(path, exclusive=False):
+            # Local clones hardlink the mirror's objects, so the checkout
+            # survives the mirror being evicted later.
+            _git(["clone", "--quiet", "--local", "--single-branch",
+                  "--branch", branch, path, dest])
+            os.utime(path)
+    except (RuntimeError, OSError, subprocess.TimeoutExpired) as exc:
+        if os.path.isdir(dest):
+            for entry in os.listdir(dest):
+                target = os.path.join(dest, entry)
+                if os.path.isdir(target) and not os.path.islink(target):
+                    shutil.rmtree(target, ignore_errors=True)
+                else:
+                    os.remove(target)
+        logger.warning(f"Git cache checkout failed for {normalize_repo_url(repo_url)}: {exc}")
+        return False, str(exc)
+
+    logger.info(
+        f"Checked out {normalize_repo_url(repo_url)}@{branch} from cache "
+        f"(fetch {fetch_seconds:.1f}s, total {time.monotonic() - started:.1f}s)"
+    )
+    return True, "Checked out from git cache"
@@ -7,6 +7,7 @@ Uses Gitleaks (https://github.com/gitleaks/gitleaks) as the underlying engine.
 Falls back to regex-based scanning if Gitleaks is not installed.
 """
 
+import hashlib
 import json
 import os
 import re
@@ -14,9 +15,11 @@ import subprocess
 import logging
 import shutil
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
+from .file_index import FileIndex, relative_path
+from .scan_cache import tool_version
+
 logger = logging.getLogger("SentinelOps.Gitleaks")
 
 # Directories to skip during scanning
@@ -104,6 +107,15 @@ def is_gitleaks_available() -> bool:
     return shutil.which("gitleaks") is not None
 
 
+def secrets_scan_fingerprint() -> Dict[str, Any]:
+    """Engine version and rule configuration (used in scan cache keys)."""
+    if is_gitleaks_available():
+        return {"engine": "gitleaks", "version": tool_version("gitleaks", ("version",))}
+    rules = json.dumps([_FALLBACK_PATTERNS, sorted(_SCAN_EXTENSIONS), sorted(_SKIP_FILES),
+                        sorted(EXCLUDE_DIRS)])
+    return {"engine": "regex-fallback", "rules": hashlib.sha256(rules.encode("utf-8")).hexdigest()}
+
+
 def run_gitleaks(
     repo_path: str,
     output_path: str,
@@ -161,7 +173,7 @@ def run_gitleaks(
             normalised.append({
                 "rule_id": rule_id,
                 "description": f_item.get("Description", f_item.get("description", rule_id)),
-                "file": f_item.get("File", f_item.get("file", "")),
+                "file": relative_path(f_item.get("File", f_item.get("file", "")), repo_path),
                 "line": f_item.get("StartLine", f_item.get("startLine", 0)),
                 "end_line": f_item.get("EndLine", f_item.get("endLine", 0)),
                 "secret": _redact_secret(secret_val),
@@ -223,49 +235,45 @@ _SKIP_FILES = {
 }
 
 
-def _run_fallback_scan(repo_path: str) -> List[dict]:
+def _run_fallback_scan(repo_path: str, file_index: FileIndex | None = None) -> List[dict]:
     """Simple regex-based secret scanner — fallback when Gitleaks is not installed."""
     logger.info("Running fallback regex-based secret scanner")
     findings = []
-    repo = Path(repo_path)
-
-    for root, dirs, files in os.walk(repo):
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-        for fname in files:
-            if fname in _SKIP_FILES:
-                continue
-            ext = Path(fname).suffix.lower()
-            # Also scan dotfiles like .env
-            if ext not in _SCAN_EXTENSIONS and not fname.startswith(".env"):
-                continue
-
-            fpath = os.path.join(root, fname)
-            rel_path = os.path.relpath(fpath, repo_path)
-
-            try:
-                with open(fpath, 'r', errors='ignore') as f:
-                    for line_num, line in enumerate(f, 1):
-                        for rule_id, pattern in _FALLBACK_PATTERNS:
-                            match = re.search(pattern, line)
-                            if match:
-                                secret_val = match.group(0)
-                                findings.append({
-                                    "rule_id": rule_id,
-                                    "description": rule_id.replace("-", " ").title(),
-                                    "file": rel_path,
-                                    "line": line_num,
-                                    "end_line": line_num,
-                                    "secret": _redact_secret(secret_val),
-                                    "match": _redact_secret(secret_val, 8),
-                                    "severity": _classify_severity(rule_id),
-                                    "entropy": 0,
-                                    "commit": "",
-                                    "author": "",
-                                    "tags": ["fallback-scanner"],
-                                })
-                                break  # one match per line
-            except (IOError, UnicodeDecodeError):
-                continue
+    if file_index is None:
+        file_index = FileIndex.build(repo_path, exclude_dirs=EXCLUDE_DIRS)
+
+    for entry in file_index.files():
+        fname = entry.name
+        if fname in _SKIP_FILES:
+            continue
+        # Also scan dotfiles like .env
+        if entry.ext not in _SCAN_EXTENSIONS and not fname.startswith(".env"):
+            continue
+
+        try:
+            with open(file_index.abspath(entry), 'r', errors='ignore') as f:
+                for line_num, line in enumerate(f, 1):
+                    for rule_id, pattern in _FALLBACK_PATTERNS:
+                        match = re.search(pattern, line)
+                        if match:
+                            secret_val = match.group(0)
+                            findings.append({
+                                "rule_id": rule_id,
+                                "description": rule_id.replace("-", " ").title(),
+                                "file": entry.path,
+                                "line": line_num,
+                                "end_line": line_num,
+                                "secret": _redact_secret(secret_val),
+                                "match": _redact_secret(secret_val, 8),
+                                "severity": _classify_severity(rule_id),
+                                "entropy": 0,
+                                "commit": "",
+                                "author": "",
+                                "tags": ["fallback-scanner"],
+                            })
+                            break  # one match per line
+        except (IOError, UnicodeDecodeError):
+            continue
 
     return findings
 
@@ -315,6 +323,7 @@ def _build_report(
 def run_secrets_scan(
     repo_path: str,
     reports_dir: str,
+    file_index: FileIndex | None = None,
 ) -> Dict[str, Any]:
     """
     Run secret detection on a repository.
@@ -324,6 +333,7 @@ def run_secrets_scan(
     Args:
         repo_path:   Path to the cloned repository
         reports_dir: Directory to save report files
+        file_index:  Index of *repo_path* to reuse for the regex fallback
 
     Returns:
         Unified secrets report dictionary
@@ -338,12 +348,12 @@ def run_secrets_scan(
 
         if not success:
             logger.warning(f"Gitleaks failed: {message}, falling back to regex scanner")
-            findings = _run_fallback_scan(repo_path)
+            findings = _run_fallback_scan(repo_path, file_index)
             tool_used = "regex-fallback"
             message = f"Gitleaks failed ({message}), used regex fallback: {len(findings)} finding(s)"
     else:
         logger.info("Gitleaks not installed — using regex fallback scanner")
-        findings = _run_fallback_scan(repo_path)
+        findings = _run_fallback_scan(repo_path, file_index)
         tool_used = "regex-fallback"
         tool_available = False
         message = f"Regex fallback scan found {len(findings)} potential secret(s)"
@@ -352,7 +362,7 @@ def run_secrets_scan(
 
     # Save report
     with open(output_path, "w") as f:
-        json.dump(report, f, indent=2)
+        json.dump(report, f, separators=(",", ":"))
     logger.info(f"Secrets report saved to {output_path}")
 
     return report
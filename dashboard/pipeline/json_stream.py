@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON reading for large scanner reports
+Full OS image scans can produce multi-hundred-MB Trivy and Semgrep reports.
+``iter_json_values`` yields only the parts of a document a caller asks for,
+one value at a time, so the rest of the document is never held in memory.
+
+Paths use ijson's prefix syntax: object keys joined by dots, ``item`` for
+array elements (``Results.item.Vulnerabilities.item``). When ijson is not
+installed the whole file is loaded with ``json.load`` and walked instead;
+results are identical, only peak memory differs. Gzipped reports are
+decompressed on the fly (see report_store).
+"""
+
+import json
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+from .report_store import open_report
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+def _walk(node: Any, prefix: str, wanted: Callable[[str], bool]) -> Iterator[Tuple[str, Any]]:
+    if wanted(prefix):
+        yield prefix, node
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            yield from _walk(value, f"{prefix}.{key}" if prefix else key, wanted)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value, f"{prefix}.item" if prefix else "item", wanted)
+
+
+def _stream(f, wanted: Callable[[str], bool]) -> Iterator[Tuple[str, Any]]:
+    builder = None
+    root = None
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builder is None:
+            if event in ("map_key", "end_map", "end_array") or not wanted(prefix):
+                continue
+            if event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                root = prefix
+                builder.event(event, value)
+            else:
+                yield prefix, value
+            continue
+        builder.event(event, value)
+        if prefix == root and event in ("end_map", "end_array"):
+            yield root, builder.value
+            builder = None
+
+
+def iter_json_values(path: str, prefixes: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+    """Yield ``(prefix, value)`` for each value at one of ``prefixes``, in document order.
+
+    Values below a yielded value are not reported separately. Raises
+    OSError or ValueError if the file is missing or is not valid JSON.
+    """
+    wanted = frozenset(prefixes).__contains__
+    if not IJSON_AVAILABLE:
+        with open_report(path) as f:
+            document = json.load(f)
+        yield from _walk(document, "", wanted)
+        return
+    with open_report(path, binary=True) as f:
+        try:
+            yield from _stream(f, wanted)
+        except (ijson.JSONError, EOFError) as exc:
+            raise ValueError(f"Invalid JSON in {path}: {exc}") from exc
@@ -14,11 +14,12 @@ import tempfile
 import logging
 import re
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 
 # Configure logging
@@ -50,16 +51,100 @@ DEFAULT_DECISION_REPORT = REPORTS_DIR / "security_decision.json"
 # Timeouts (seconds)
 TRIVY_TIMEOUT_SECONDS = int(os.getenv("TRIVY_TIMEOUT_SECONDS", "600"))
 
+# Maximum number of pipeline stages that may run at the same time
+PIPELINE_STAGE_CONCURRENCY = max(1, int(os.getenv("PIPELINE_STAGE_CONCURRENCY", "4")))
+
+# Tool output lines longer than this are cut before being streamed
+LOG_LINE_MAX_CHARS = 500
+
 # Temp workspace prefix
 WORKSPACE_PREFIX = "sentinelops_scan_"
 
+# Suffix of the staging directory a run writes its reports into before the
+# directory is atomically renamed to its final location
+PARTIAL_SUFFIX = ".partial"
+
 # Import multi-language SAST scanner
-from .sast_scanner import run_sast_scan, detect_languages, LANGUAGE_INFO
+from .sast_scanner import (
+    run_sast_scan, detect_languages, LANGUAGE_INFO, build_file_index, sast_report_files,
+    sast_tool_fingerprint,
+)
 
 # Import Gitleaks and DAST scanners
-from .gitleaks_scanner import run_secrets_scan
+from .gitleaks_scanner import run_secrets_scan, secrets_scan_fingerprint
 from .dast_scanner import run_dast_scan
 from .ai_predictor import predict_vulnerabilities
+from .findings import Findings
+from .git_cache import checkout_from_cache
+from .report_store import compress_reports, load_report
+from .scan_cache import (
+    restore_scan, ruleset_epoch, scan_cache_key, source_tree_id, store_scan, tool_version,
+)
+
+def publish_reports_dir(staging_dir: str, final_dir: str) -> str:
+    """Compress a run's staging report directory and move it to ``final_dir``.
+
+    A previous directory at ``final_dir`` (e.g. from a retried run) is moved
+    aside first, so readers see either the old or the new reports, never a
+    mix of both.
+    """
+    saved = compress_reports(staging_dir)
+    if saved:
+        logger.info(f"Compressed reports in {staging_dir}, saved {saved} bytes")
+    os.makedirs(os.path.dirname(final_dir), exist_ok=True)
+    stale_dir = None
+    if os.path.exists(final_dir):
+        stale_dir = f"{final_dir}.stale-{uuid.uuid4().hex[:8]}"
+        os.replace(final_dir, stale_dir)
+    os.replace(staging_dir, final_dir)
+    if stale_dir:
+        shutil.rmtree(stale_dir, ignore_errors=True)
+    return final_dir
+
+
+def run_tool(cmd: List[str], timeout: float, on_line: Optional[Callable[[str], None]] = None,
+             **kwargs) -> subprocess.CompletedProcess:
+    """``subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)``
+    that also hands each stdout/stderr line to ``on_line`` as the tool prints it.
+
+    Output is still captured in full and returned; on timeout the tool is
+    killed and TimeoutExpired raised, as with subprocess.run.
+    """
+    if on_line is None:
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, **kwargs)
+
+    stdout: List[str] = []
+    stderr: List[str] = []
+
+    def pump(stream, sink):
+        for line in stream:
+            sink.append(line)
+            try:
+                on_line(line.rstrip("\n")[:LOG_LINE_MAX_CHARS])
+            except Exception:
+                # Best-effort streaming; never lose the tool's output
+                pass
+
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          text=True, errors="replace", **kwargs) as proc:
+        readers = [
+            threading.Thread(target=pump, args=(proc.stdout, stdout), daemon=True),
+            threading.Thread(target=pump, args=(proc.stderr, stderr), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            for reader in readers:
+                reader.join()
+            raise subprocess.TimeoutExpired(cmd, timeout, "".join(stdout), "".join(stderr))
+        for reader in readers:
+            reader.join()
+    return subprocess.CompletedProcess(cmd, proc.returncode, "".join(stdout), "".join(stderr))
+
 
 class StageStatus(str, Enum):
     PENDING = "pending"
@@ -85,6 +170,50 @@ class PipelineStage:
     logs: str = ""
     error: Optional[str] = None
 
+@dataclass(frozen=True)
+class StageSpec:
+    """A node in the pipeline stage graph.
+
+    ``run`` names the PipelineExecutor method implementing the stage.
+    ``requires`` and ``provides`` are keys of the per-run context: a stage
+    starts once all of its inputs exist. A failing ``fatal`` stage fails the
+    pipeline; any other failure is logged and its outputs are left empty.
+    ``stage`` is the pipeline stage the node reports to when it differs
+    from ``key``.
+    """
+    key: str
+    run: str
+    requires: Tuple[str, ...] = ()
+    provides: Tuple[str, ...] = ()
+    fatal: bool = False
+    stage: Optional[str] = None
+
+
+_SCAN_OUTPUTS = ("sast_report", "gitleaks_report", "trivy_report", "dast_report")
+
+# Clone feeds the build and the source-only scanners (SAST, Gitleaks and the
+# Trivy filesystem scan), which run concurrently. The Trivy image scan and
+# DAST wait for the build so they can target the image when one was
+# produced; the report consumers wait for every scanner.
+PIPELINE_STAGES: Tuple[StageSpec, ...] = (
+    StageSpec("clone", "_stage_clone", provides=("source", "file_index", "tree_id"), fatal=True),
+    StageSpec("build", "_stage_build", requires=("source",), provides=("image",)),
+    StageSpec("sast_scan", "_stage_sast", requires=("source",), provides=("sast_report",), fatal=True),
+    StageSpec("gitleaks_scan", "_stage_gitleaks", requires=("source",), provides=("gitleaks_report",)),
+    StageSpec("trivy_fs", "_stage_trivy_fs", requires=("source",),
+              provides=("trivy_fs_report", "trivy_metadata"), stage="trivy_scan"),
+    StageSpec("trivy_image", "_stage_trivy_image", requires=("image", "trivy_fs_report"),
+              provides=("trivy_report", "trivy_metadata"), stage="trivy_scan"),
+    StageSpec("dast_scan", "_stage_dast", requires=("source", "image"), provides=("dast_report",)),
+    StageSpec("normalize_reports", "_stage_normalize_reports", requires=("source",) + _SCAN_OUTPUTS,
+              provides=("reports", "findings")),
+    StageSpec("ai_prediction", "_stage_ai_prediction", requires=("reports",), provides=("ai_prediction",)),
+    StageSpec("policy_check", "_stage_policy_check", requires=("reports",),
+              provides=("vulnerability_summary",), fatal=True),
+    StageSpec("decision", "_stage_decision", requires=("vulnerability_summary",), provides=("decision",),
+              fatal=True),
+)
+
 @dataclass
 class PipelineRun:
     id: str
@@ -104,6 +233,9 @@ class PipelineRun:
     is_deployable: Optional[bool] = None
     vulnerability_summary: Optional[Dict] = None
     ai_prediction: Optional[Dict] = None
+    report_dir: Optional[str] = None
+    # Normalized findings of the finished run; not serialized
+    findings: Optional[Findings] = None
 
     def __post_init__(self):
         if self.stages is None:
@@ -127,26 +259,53 @@ class PipelineRun:
             "max_cvss_score": self.max_cvss_score,
             "is_deployable": self.is_deployable,
             "vulnerability_summary": self.vulnerability_summary,
-            "ai_prediction": self.ai_prediction
+            "ai_prediction": self.ai_prediction,
+            "report_dir": self.report_dir,
         }
 
 
 class PipelineExecutor:
     """Executes security scanning pipeline"""
     
-    def __init__(self, reports_dir: str, on_update=None):
+    def __init__(self, reports_dir: str, on_update=None, workspace_root: Optional[str] = None,
+                 on_event=None):
         self.reports_dir = reports_dir
+        self.workspace_root = workspace_root
         self.current_runs: Dict[str, PipelineRun] = {}
         self.on_update = on_update
+        # on_event(pipeline, event, data) receives live progress: a "stage"
+        # event per stage transition and a "log" event per line of tool output
+        self.on_event = on_event
+        # Stages of one run execute on several threads; serialize stage
+        # mutations and the persisted snapshots taken from them.
+        self._stage_lock = threading.RLock()
+        if workspace_root:
+            os.makedirs(workspace_root, exist_ok=True)
 
     def _notify_update(self, pipeline: PipelineRun) -> None:
         if not self.on_update:
             return
         try:
-            self.on_update(pipeline)
+            with self._stage_lock:
+                self.on_update(pipeline)
         except Exception:
             # Best-effort updates; never break the pipeline
             pass
+
+    def _emit(self, pipeline: PipelineRun, event: str, data: Dict[str, Any]) -> None:
+        if not self.on_event:
+            return
+        try:
+            self.on_event(pipeline, event, {"pipeline_id": pipeline.id, **data})
+        except Exception:
+            # Best-effort events; never break the pipeline
+            pass
+
+    def _tail(self, pipeline: PipelineRun, stage_name: str) -> Optional[Callable[[str], None]]:
+        """run_tool ``on_line`` callback streaming a stage's tool output as "log" events."""
+        if not self.on_event:
+            return None
+        return lambda line: self._emit(pipeline, "log", {"stage": stage_name, "line": line})
     
     def create_pipeline(self, repo_url: str, branch: str, commit_sha: str,
                        commit_message: str, author: str, pipeline_id: Optional[str] = None) -> PipelineRun:
@@ -189,6 +348,11 @@ class PipelineExecutor:
     def update_stage(self, pipeline_id: str, stage_name: str, 
                     status: StageStatus, logs: str = "", error: str = None):
         """Update a pipeline stage status"""
+        with self._stage_lock:
+            self._update_stage_locked(pipeline_id, stage_name, status, logs, error)
+
+    def _update_stage_locked(self, pipeline_id: str, stage_name: str,
+                             status: StageStatus, logs: str, error: Optional[str]):
         if pipeline_id in self.current_runs:
             pipeline = self.current_runs[pipeline_id]
             if stage_name in pipeline.stages:
@@ -214,315 +378,64 @@ class PipelineExecutor:
                         end = datetime.fromisoformat(stage["finished_at"])
                         stage["duration_seconds"] = (end - start).total_seconds()
                 self._notify_update(pipeline)
+                # The accumulated logs are not resent; clients append ``line``
+                self._emit(pipeline, "stage", {
+                    "stage": stage_name,
+                    "line": event_line,
+                    **{key: stage.get(key) for key in (
+                        "name", "status", "started_at", "finished_at", "duration_seconds", "error",
+                    )},
+                })
     
-    def run_pipeline(self, pipeline: PipelineRun, repo_url: str = None, 
+    def run_pipeline(self, pipeline: PipelineRun, repo_url: str = None,
                     target_dir: str = None, image_name: str = None,
-                    scan_prefs: Dict[str, Any] = None):
-        """Execute the full pipeline"""
+                    scan_prefs: Dict[str, Any] = None, reports_dir: str = None,
+                    baseline_dir: str = None):
+        """Execute the full pipeline.
+
+        Stages are scheduled from PIPELINE_STAGES: every stage whose inputs
+        are available runs, so SAST, Gitleaks and the image build proceed in
+        parallel once the repository is cloned.
+
+        Reports are written to a private ``<reports_dir>.partial`` staging
+        directory and renamed into place when the run finishes, so a
+        pipeline's report directory is either absent or complete.
+        ``reports_dir`` defaults to ``<executor reports_dir>/<pipeline id>``.
+
+        ``baseline_dir`` is the report directory of the last successful run
+        of the same repository and branch; SAST then only rescans the files
+        changed since that run's commit.
+        """
         scan_prefs = scan_prefs or {}
-        scanners = scan_prefs.get('scanners', {'sast': True, 'dast': True, 'trivy': True, 'gitleaks': True})
-        fast_scan = scan_prefs.get('fastScanMode', False)
+        # Pipelines may be created by another executor (e.g. the web tier's)
+        # and handed to a worker's executor; track them here so stage
+        # updates resolve.
+        self.current_runs[pipeline.id] = pipeline
         pipeline.status = PipelineStatus.RUNNING
         pipeline.started_at = datetime.now().isoformat()
         self._notify_update(pipeline)
-        
-        work_dir = target_dir or tempfile.mkdtemp(prefix="sentinelops_")
+
+        work_dir = target_dir or tempfile.mkdtemp(prefix="sentinelops_", dir=self.workspace_root)
         cleanup_dir = target_dir is None
-        
-        try:
-            # Stage 1: Clone Repository
-            if repo_url:
-                self.update_stage(pipeline.id, "clone", StageStatus.RUNNING)
-                try:
-                    result = subprocess.run(
-                        ["git", "clone", "--depth", "1", "--branch", pipeline.branch, repo_url, work_dir],
-                        capture_output=True, text=True, timeout=TRIVY_TIMEOUT_SECONDS
-                    )
-                    if result.returncode != 0:
-                        raise Exception(result.stderr)
-                    self.update_stage(pipeline.id, "clone", StageStatus.SUCCESS, 
-                                    f"Cloned {repo_url} successfully")
-                except Exception as e:
-                    self.update_stage(pipeline.id, "clone", StageStatus.FAILED, error=str(e))
-                    raise
-            else:
-                self.update_stage(pipeline.id, "clone", StageStatus.SKIPPED, "Using local directory")
-            
-            # Stage 2: Build Docker Image
-            self.update_stage(pipeline.id, "build", StageStatus.RUNNING)
-            dockerfile_path = os.path.join(work_dir, "Dockerfile")
-            has_dockerfile = os.path.exists(dockerfile_path)
-            docker_available = shutil.which("docker") is not None
-            built_image_name = None
-            
-            if not has_dockerfile:
-                self.update_stage(pipeline.id, "build", StageStatus.SKIPPED,
-                                "No Dockerfile found — Trivy will scan filesystem instead")
-            elif not docker_available:
-                self.update_stage(
-                    pipeline.id,
-                    "build",
-                    StageStatus.SKIPPED,
-                    "Docker CLI not installed — skipping image build and continuing with filesystem scans"
-                )
-            else:
-                try:
-                    build_image = image_name or f"sentinelops-scan-{pipeline.id}"
-                    result = subprocess.run(
-                        ["docker", "buildx", "build", "--load",
-                         "-f", dockerfile_path, "-t", build_image, work_dir],
-                        capture_output=True, text=True, timeout=900
-                    )
-                    if result.returncode != 0:
-                        raise Exception(result.stderr)
-                    built_image_name = build_image
-                    self.update_stage(pipeline.id, "build", StageStatus.SUCCESS,
-                                    f"Built image: {build_image}")
-                except subprocess.TimeoutExpired:
-                    self.update_stage(pipeline.id, "build", StageStatus.FAILED, 
-                                    error="Docker build timed out after 900 seconds — continuing with filesystem scans")
-                    logger.warning("⚠ Docker build timed out — pipeline will continue without image scans")
-                except FileNotFoundError:
-                    self.update_stage(
-                        pipeline.id,
-                        "build",
-                        StageStatus.SKIPPED,
-                        "Docker CLI not installed — skipping image build and continuing with filesystem scans"
-                    )
-                    logger.warning("⚠ Docker CLI not installed — skipping image build")
-                except Exception as e:
-                    self.update_stage(pipeline.id, "build", StageStatus.FAILED, error=str(e))
-                    logger.warning(f"⚠ Docker build failed: {e} — continuing with filesystem scans")
-            
-            # Stage 3: Multi-Language SAST Scan
-            if scanners.get('sast', True):
-                self.update_stage(pipeline.id, "sast_scan", StageStatus.RUNNING)
-                try:
-                    sast_report = run_sast_scan(work_dir, self.reports_dir)
-                    tools_used = [t for t, info in sast_report.get('tools_used', {}).items() if info.get('success')]
-                    langs = list(sast_report.get('languages_detected', {}).keys())
-                    total_issues = sast_report.get('metrics', {}).get('totals', {}).get('total', 0)
-                    self.update_stage(pipeline.id, "sast_scan", StageStatus.SUCCESS,
-                                    f"SAST scan completed: {total_issues} issues found across {len(langs)} language(s) using {', '.join(tools_used) or 'no tools'}")
-                except Exception as e:
-                    self.update_stage(pipeline.id, "sast_scan", StageStatus.FAILED, error=str(e))
-                    raise
-            else:
-                self.update_stage(pipeline.id, "sast_scan", StageStatus.SKIPPED, "Disabled by Scan Preferences")
-            
-            # Define report paths for later stages
-            bandit_report_path = os.path.join(self.reports_dir, "bandit-report.json")
-            
-            # Stage 4: Gitleaks Secret Detection
-            if scanners.get('gitleaks', True):
-                self.update_stage(pipeline.id, "gitleaks_scan", StageStatus.RUNNING)
-                try:
-                    gitleaks_report = run_secrets_scan(work_dir, self.reports_dir)
-                    secrets_count = gitleaks_report.get('total_secrets', 0)
-                    tool_used = gitleaks_report.get('tool', 'unknown')
-                    self.update_stage(pipeline.id, "gitleaks_scan", StageStatus.SUCCESS,
-                                    f"Secret scan ({tool_used}): {secrets_count} secret(s) found")
-                except Exception as e:
-                    self.update_stage(pipeline.id, "gitleaks_scan", StageStatus.FAILED, error=str(e))
-                    # Don't fail pipeline for gitleaks errors
-                    logger.warning(f"Gitleaks scan failed: {e}")
-                    gitleaks_report = {}
-            else:
-                self.update_stage(pipeline.id, "gitleaks_scan", StageStatus.SKIPPED, "Disabled by Scan Preferences")
-            
-            # Stage 5: Trivy Container Scan
-            trivy_report_path = os.path.join(self.reports_dir, "trivy-report.json")
-            if scanners.get('trivy', True):
-                self.update_stage(pipeline.id, "trivy_scan", StageStatus.RUNNING)
-
-                try:
-                    trivy_common_flags = [
-                        "--format", "json",
-                        "--timeout", f"{TRIVY_TIMEOUT_SECONDS}s",
-                        "--scanners", "vuln",
-                        "--no-progress",
-                        "--quiet",
-                    ]
-
-                    if built_image_name:
-                        # Scan the built Docker image
-                        scan_target = built_image_name
-                        trivy_cmd = [
-                            "trivy", "image", *trivy_common_flags,
-                            "--output", trivy_report_path, scan_target,
-                        ]
-                        scan_mode_msg = f"image scan for {scan_target}"
-                    else:
-                        # No Docker image — scan filesystem for dependency vulnerabilities
-                        scan_target = work_dir
-                        trivy_cmd = [
-                            "trivy", "fs", *trivy_common_flags,
-                            "--skip-dirs", ".git",
-                            "--skip-dirs", "node_modules",
-                            "--skip-dirs", "venv",
-                            "--skip-dirs", ".venv",
-                            "--skip-dirs", "__pycache__",
-                            "--skip-dirs", "dist",
-                            "--skip-dirs", "build",
-                            "--output", trivy_report_path, scan_target,
-                        ]
-                        scan_mode_msg = (
-                            f"filesystem scan on {os.path.basename(work_dir)} "
-                            "(dependency source scan; base-image OS CVEs require Docker image scan)"
-                        )
-
-                    result = subprocess.run(
-                        trivy_cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=TRIVY_TIMEOUT_SECONDS + 30,  # small buffer over Trivy's internal timeout
-                    )
-                    if result.returncode != 0 and "No such image" not in result.stderr:
-                        raise Exception(result.stderr)
-                        
-                    # Inject metadata for fs scan so the frontend displays it correctly
-                    if not built_image_name and os.path.exists(trivy_report_path):
-                        try:
-                            with open(trivy_report_path, "r") as f:
-                                trivy_data = json.load(f)
-                            
-                            trivy_data["ArtifactName"] = pipeline.repo_name
-                            
-                            total_size = 0
-                            for dirpath, _, filenames in os.walk(work_dir):
-                                for f in filenames:
-                                    fp = os.path.join(dirpath, f)
-                                    if not os.path.islink(fp):
-                                        total_size += os.path.getsize(fp)
-                            
-                            if "Metadata" not in trivy_data:
-                                trivy_data["Metadata"] = {}
-                            trivy_data["Metadata"]["Size"] = total_size
-                            if "OS" not in trivy_data["Metadata"]:
-                                trivy_data["Metadata"]["OS"] = {"Family": "Source", "Name": "Repository"}
-                                
-                            with open(trivy_report_path, "w") as f:
-                                json.dump(trivy_data, f, indent=2)
-                        except Exception as e:
-                            logger.warning(f"Failed to inject Trivy fs metadata: {e}")
-
-                    self.update_stage(pipeline.id, "trivy_scan", StageStatus.SUCCESS,
-                                    f"Trivy {scan_mode_msg} completed")
-                except subprocess.TimeoutExpired:
-                    msg = f"Trivy {scan_mode_msg} timed out after {TRIVY_TIMEOUT_SECONDS}s"
-                    self.update_stage(pipeline.id, "trivy_scan", StageStatus.FAILED, error=msg)
-                    logger.warning(msg)
-                    # Continue pipeline even if Trivy timed out
-                except FileNotFoundError:
-                    msg = "Trivy not installed; skipping Trivy stage"
-                    self.update_stage(pipeline.id, "trivy_scan", StageStatus.SKIPPED, logs=msg)
-                    logger.warning(msg)
-                except Exception as e:
-                    self.update_stage(pipeline.id, "trivy_scan", StageStatus.FAILED, error=str(e))
-                    logger.warning(f"Trivy scan failed but pipeline will continue: {e}")
-            else:
-                self.update_stage(pipeline.id, "trivy_scan", StageStatus.SKIPPED, "Disabled by Scan Preferences")
-            
-            # Stage 6: DAST Scan
-            # Priority: explicit scan prefs -> env var -> image-based local scan
-            configured_dast_url = (
-                (scan_prefs.get("dastTargetUrl") if isinstance(scan_prefs, dict) else None)
-                or os.getenv("DAST_TARGET_URL", "")
-            ).strip()
-
-            if scanners.get('dast', True) and not fast_scan and (built_image_name or configured_dast_url):
-                self.update_stage(pipeline.id, "dast_scan", StageStatus.RUNNING)
-                try:
-                    dockerfile_path = os.path.join(work_dir, "Dockerfile")
-                    dast_report = run_dast_scan(
-                        target_url=configured_dast_url or None,
-                        reports_dir=self.reports_dir,
-                        scan_type="baseline",
-                        image_name=built_image_name if not configured_dast_url else None,
-                        dockerfile_path=dockerfile_path if os.path.exists(dockerfile_path) else None,
-                    )
-                    dast_alerts = dast_report.get('total_alerts', 0)
-                    self.update_stage(pipeline.id, "dast_scan", StageStatus.SUCCESS,
-                                    f"DAST scan completed: {dast_alerts} alert(s) found")
-                except Exception as e:
-                    self.update_stage(pipeline.id, "dast_scan", StageStatus.FAILED, error=str(e))
-                    logger.warning(f"DAST scan failed: {e}")
-                    dast_report = {}
-            else:
-                reason = "Disabled by Scan Preferences" if not scanners.get('dast', True) else "Fast Scan Mode enabled"
-                if not built_image_name and not configured_dast_url:
-                    reason = "No Docker image and no DAST target URL (set DAST_TARGET_URL or scan_prefs.dastTargetUrl)"
-                self.update_stage(pipeline.id, "dast_scan", StageStatus.SKIPPED, reason)
-                dast_report = {}
-            
-            # Strip local temp path from all scanning reports to show relative paths
-            try:
-                for report_file in ["sast-report.json", "bandit-report.json", "gitleaks-report.json", "trivy-report.json", "dast-report.json"]:
-                    rp = os.path.join(self.reports_dir, report_file)
-                    if os.path.exists(rp):
-                        with open(rp, 'r') as f:
-                            content = f.read()
-                        wd = work_dir + "/" if not work_dir.endswith("/") else work_dir
-                        content = content.replace(wd, "")
-                        with open(rp, 'w') as f:
-                            f.write(content)
-            except Exception as e:
-                logger.warning(f"Failed to strip temp paths from reports: {e}")
+        final_reports_dir = reports_dir or os.path.join(self.reports_dir, pipeline.id)
+        staging_dir = final_reports_dir + PARTIAL_SUFFIX
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir, exist_ok=True)
+        ctx: Dict[str, Any] = {
+            "repo_url": repo_url,
+            "work_dir": work_dir,
+            "reports_dir": staging_dir,
+            "baseline_dir": baseline_dir,
+            "image_name": image_name,
+            "scan_prefs": scan_prefs,
+            "scanners": scan_prefs.get('scanners', {'sast': True, 'dast': True, 'trivy': True, 'gitleaks': True}),
+            "fast_scan": scan_prefs.get('fastScanMode', False),
+        }
 
-            # Stage 7: AI Vulnerability Prediction
-            self.update_stage(pipeline.id, "ai_prediction", StageStatus.RUNNING)
-            try:
-                # Example: Gather relevant data for prediction (code, scan summaries, etc.)
-                ai_input = {
-                    "repo_name": pipeline.repo_name,
-                    "branch": pipeline.branch,
-                    "commit_sha": pipeline.commit_sha,
-                    "sast_report_path": os.path.join(self.reports_dir, "sast-report.json"),
-                    "trivy_report_path": os.path.join(self.reports_dir, "trivy-report.json"),
-                    "gitleaks_report_path": os.path.join(self.reports_dir, "gitleaks-report.json"),
-                    "dast_report_path": os.path.join(self.reports_dir, "dast-report.json"),
-                }
-                ai_prediction = predict_vulnerabilities(ai_input)
-                pipeline.ai_prediction = ai_prediction
-                # Save AI prediction to a report file for later use
-                ai_report_path = os.path.join(self.reports_dir, "ai-prediction.json")
-                with open(ai_report_path, "w") as f:
-                    json.dump(ai_prediction, f, indent=2)
-                self.update_stage(pipeline.id, "ai_prediction", StageStatus.SUCCESS, f"AI prediction risk score: {ai_prediction.get('risk_score')}")
-            except Exception as e:
-                self.update_stage(pipeline.id, "ai_prediction", StageStatus.FAILED, error=str(e))
-                logger.warning(f"AI prediction failed: {e}")
+        try:
+            self._run_stage_graph(pipeline, ctx)
+            pipeline.report_dir = publish_reports_dir(staging_dir, final_reports_dir)
 
-            # Stage 8: Policy Evaluation
-            self.update_stage(pipeline.id, "policy_check", StageStatus.RUNNING)
-            try:
-                gitleaks_report_path = os.path.join(self.reports_dir, "gitleaks-report.json")
-                dast_report_path = os.path.join(self.reports_dir, "dast-report.json")
-                vuln_summary = self._analyze_vulnerabilities(
-                    bandit_report_path, trivy_report_path,
-                    gitleaks_path=gitleaks_report_path,
-                    dast_path=dast_report_path,
-                )
-                pipeline.vulnerability_summary = vuln_summary
-                pipeline.security_score = vuln_summary.get('security_score', 0)
-                pipeline.max_cvss_score = vuln_summary.get('max_cvss_score', 0.0)
-                self.update_stage(pipeline.id, "policy_check", StageStatus.SUCCESS,
-                                f"Security Score: {pipeline.security_score}/100")
-            except Exception as e:
-                self.update_stage(pipeline.id, "policy_check", StageStatus.FAILED, error=str(e))
-                raise
-            
-            # Stage 8: Deployment Decision
-            self.update_stage(pipeline.id, "decision", StageStatus.RUNNING)
-            is_deployable = self._evaluate_deployment(pipeline.security_score, vuln_summary)
-            pipeline.is_deployable = is_deployable
-            
-            decision_msg = "✅ APPROVED for deployment" if is_deployable else "❌ BLOCKED - Security requirements not met"
-            self.update_stage(pipeline.id, "decision", StageStatus.SUCCESS, decision_msg)
-            
-            # Generate security decision report
-            self._generate_decision_report(pipeline)
-            
             # Pipeline completed successfully
             pipeline.status = PipelineStatus.SUCCESS
             pipeline.finished_at = datetime.now().isoformat()
@@ -530,8 +443,13 @@ class PipelineExecutor:
             end = datetime.fromisoformat(pipeline.finished_at)
             pipeline.duration_seconds = (end - start).total_seconds()
             self._notify_update(pipeline)
-            
+
         except Exception as e:
+            # Keep whatever the failed run produced for troubleshooting
+            try:
+                pipeline.report_dir = publish_reports_dir(staging_dir, final_reports_dir)
+            except OSError as publish_error:
+                logger.warning(f"Failed to publish reports for {pipeline.id}: {publish_error}")
             pipeline.status = PipelineStatus.FAILED
             pipeline.finished_at = datetime.now().isoformat()
             if pipeline.started_at:
@@ -539,21 +457,428 @@ class PipelineExecutor:
                 end = datetime.fromisoformat(pipeline.finished_at)
                 pipeline.duration_seconds = (end - start).total_seconds()
             self._notify_update(pipeline)
-        
+
         finally:
             # Cleanup
             if cleanup_dir and os.path.exists(work_dir):
                 shutil.rmtree(work_dir, ignore_errors=True)
-        
+
         return pipeline
-    
-    def _analyze_vulnerabilities(self, bandit_path: str, trivy_path: str,
-                                   gitleaks_path: str = None, dast_path: str = None) -> Dict[str, Any]:
-        """Analyze vulnerability reports and calculate security score.
+
+    def _run_stage_graph(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> None:
+        """Run PIPELINE_STAGES as a dependency graph.
+
+        A stage is submitted as soon as every key in its ``requires`` is in
+        ``ctx``; the dict it returns is merged into ``ctx``. When a fatal stage
+        raises, nothing new is scheduled, in-flight stages are allowed to
+        finish and the error is re-raised.
+        """
+        pending = list(PIPELINE_STAGES)
+        running: Dict[Future, StageSpec] = {}
+        failure: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(max_workers=PIPELINE_STAGE_CONCURRENCY,
+                                thread_name_prefix=f"pipeline-{pipeline.id}") as pool:
+            while pending or running:
+                if failure is None:
+                    for spec in [s for s in pending if all(k in ctx for k in s.requires)]:
+                        pending.remove(spec)
+                        running[pool.submit(getattr(self, spec.run), pipeline, ctx)] = spec
+
+                if not running:
+                    if failure is None and pending:
+                        missing = sorted({k for s in pending for k in s.requires if k not in ctx})
+                        raise PipelineError(f"Pipeline stages blocked on unavailable inputs: {', '.join(missing)}")
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    spec = running.pop(future)
+                    try:
+                        outputs = future.result() or {}
+                    except Exception as e:
+                        if spec.fatal:
+                            failure = failure or e
+                            continue
+                        logger.warning(f"Stage {spec.key} failed: {e}")
+                        self.update_stage(pipeline.id, spec.stage or spec.key, StageStatus.FAILED, error=str(e))
+                        outputs = {}
+                    for key in spec.provides:
+                        ctx[key] = outputs.get(key)
+
+        if failure is not None:
+            raise failure
+
+    def _stage_clone(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        repo_url = ctx["repo_url"]
+        work_dir = ctx["work_dir"]
+        if not repo_url:
+            self.update_stage(pipeline.id, "clone", StageStatus.SKIPPED, "Using local directory")
+            return self._source_outputs(work_dir)
+
+        self.update_stage(pipeline.id, "clone", StageStatus.RUNNING)
+        try:
+            success, message = clone_repository(repo_url, pipeline.branch, work_dir)
+            if not success:
+                raise Exception(message)
+            self.update_stage(pipeline.id, "clone", StageStatus.SUCCESS,
+                            f"Cloned {repo_url} successfully ({message})")
+        except Exception as e:
+            self.update_stage(pipeline.id, "clone", StageStatus.FAILED, error=str(e))
+            raise
+        return self._source_outputs(work_dir)
+
+    @staticmethod
+    def _source_outputs(work_dir: str) -> Dict[str, Any]:
+        # Walk the checkout once; later stages read this index and tree id
+        # instead of the tree (the id also keys the scan cache)
+        return {"source": work_dir, "file_index": build_file_index(work_dir),
+                "tree_id": source_tree_id(work_dir)}
+
+    def _stage_build(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        work_dir = ctx["source"]
+        self.update_stage(pipeline.id, "build", StageStatus.RUNNING)
+        dockerfile_path = os.path.join(work_dir, "Dockerfile")
+        has_dockerfile = os.path.exists(dockerfile_path)
+        docker_available = shutil.which("docker") is not None
+        built_image_name = None
+
+        if not has_dockerfile:
+            self.update_stage(pipeline.id, "build", StageStatus.SKIPPED,
+                            "No Dockerfile found — Trivy will scan filesystem instead")
+        elif not docker_available:
+            self.update_stage(
+                pipeline.id,
+                "build",
+                StageStatus.SKIPPED,
+                "Docker CLI not installed — skipping image build and continuing with filesystem scans"
+            )
+        else:
+            try:
+                build_image = ctx["image_name"] or f"sentinelops-scan-{pipeline.id}"
+                result = run_tool(
+                    ["docker", "buildx", "build", "--load",
+                     "-f", dockerfile_path, "-t", build_image, work_dir],
+                    timeout=900, on_line=self._tail(pipeline, "build"),
+                )
+                if result.returncode != 0:
+                    raise Exception(result.stderr)
+                built_image_name = build_image
+                self.update_stage(pipeline.id, "build", StageStatus.SUCCESS,
+                                f"Built image: {build_image}")
+            except subprocess.TimeoutExpired:
+                self.update_stage(pipeline.id, "build", StageStatus.FAILED,
+                                error="Docker build timed out after 900 seconds — continuing with filesystem scans")
+                logger.warning("⚠ Docker build timed out — pipeline will continue without image scans")
+            except FileNotFoundError:
+                self.update_stage(
+                    pipeline.id,
+                    "build",
+                    StageStatus.SKIPPED,
+                    "Docker CLI not installed — skipping image build and continuing with filesystem scans"
+                )
+                logger.warning("⚠ Docker CLI not installed — skipping image build")
+            except Exception as e:
+                self.update_stage(pipeline.id, "build", StageStatus.FAILED, error=str(e))
+                logger.warning(f"⚠ Docker build failed: {e} — continuing with filesystem scans")
+        return {"image": built_image_name}
+
+    def _stage_sast(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        if not ctx["scanners"].get('sast', True):
+            self.update_stage(pipeline.id, "sast_scan", StageStatus.SKIPPED, "Disabled by Scan Preferences")
+            return {}
+
+        self.update_stage(pipeline.id, "sast_scan", StageStatus.RUNNING)
+        try:
+            cache_key = scan_cache_key(ctx["tree_id"], "sast", sast_tool_fingerprint())
+            cache_hit = restore_scan(cache_key, ctx["reports_dir"]) is not None
+            if cache_hit:
+                with open(os.path.join(ctx["reports_dir"], "sast-report.json")) as f:
+                    sast_report = json.load(f)
+            else:
+                sast_report = run_sast_scan(ctx["source"], ctx["reports_dir"],
+                                            baseline=self._load_sast_baseline(ctx.get("baseline_dir")),
+                                            file_index=ctx.get("file_index"),
+                                            tree_id=ctx["tree_id"])
+                # Only complete scans are reusable; a tool that errored is retried next run
+                if all(info.get('success') is not False for info in sast_report.get('tools_used', {}).values()):
+                    store_scan(cache_key, "sast", ctx["reports_dir"], sast_report_files())
+            tools_used = [t for t, info in sast_report.get('tools_used', {}).items() if info.get('success')]
+            langs = list(sast_report.get('languages_detected', {}).keys())
+            total_issues = sast_report.get('metrics', {}).get('totals', {}).get('total', 0)
+            scan_note = ""
+            if cache_hit:
+                scan_note = " (cache hit)"
+            elif sast_report.get('scan_mode') == "incremental":
+                scan_note = (f" (incremental: {sast_report.get('changed_files', 0)} file(s) changed since "
+                             f"{(sast_report.get('baseline_commit') or '')[:7]})")
+            self.update_stage(pipeline.id, "sast_scan", StageStatus.SUCCESS,
+                            f"SAST scan completed: {total_issues} issues found across {len(langs)} language(s) using {', '.join(tools_used) or 'no tools'}"
+                            + scan_note)
+        except Exception as e:
+            self.update_stage(pipeline.id, "sast_scan", StageStatus.FAILED, error=str(e))
+            raise
+        return {"sast_report": sast_report}
+
+    @staticmethod
+    def _load_sast_baseline(baseline_dir: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The unified SAST report of a previous run, if it can seed an incremental scan."""
+        if not baseline_dir:
+            return None
+        baseline = load_report(os.path.join(baseline_dir, "sast-report.json"))
+        return baseline if isinstance(baseline, dict) else None
+
+    def _stage_gitleaks(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        if not ctx["scanners"].get('gitleaks', True):
+            self.update_stage(pipeline.id, "gitleaks_scan", StageStatus.SKIPPED, "Disabled by Scan Preferences")
+            return {}
+
+        self.update_stage(pipeline.id, "gitleaks_scan", StageStatus.RUNNING)
+        try:
+            fingerprint = secrets_scan_fingerprint()
+            cache_key = scan_cache_key(ctx["tree_id"], "secrets", fingerprint)
+            cache_hit = restore_scan(cache_key, ctx["reports_dir"]) is not None
+            if cache_hit:
+                with open(os.path.join(ctx["reports_dir"], "gitleaks-report.json")) as f:
+                    gitleaks_report = json.load(f)
+            else:
+                gitleaks_report = run_secrets_scan(ctx["source"], ctx["reports_dir"], ctx.get("file_index"))
+                # A regex fallback after a Gitleaks error is not what the key describes
+                if gitleaks_report.get('tool') == fingerprint["engine"]:
+                    store_scan(cache_key, "secrets", ctx["reports_dir"], ["gitleaks-report.json"])
+            secrets_count = gitleaks_report.get('total_secrets', 0)
+            tool_used = gitleaks_report.get('tool', 'unknown')
+            self.update_stage(pipeline.id, "gitleaks_scan", StageStatus.SUCCESS,
+                            f"Secret scan ({tool_used}): {secrets_count} secret(s) found"
+                            + (" (cache hit)" if cache_hit else ""))
+        except Exception as e:
+            self.update_stage(pipeline.id, "gitleaks_scan", StageStatus.FAILED, error=str(e))
+            # Don't fail pipeline for gitleaks errors
+            logger.warning(f"Gitleaks scan failed: {e}")
+            gitleaks_report = {}
+        return {"gitleaks_report": gitleaks_report}
+
+    def _stage_trivy_fs(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        if not ctx["scanners"].get('trivy', True):
+            self.update_stage(pipeline.id, "trivy_scan", StageStatus.SKIPPED, "Disabled by Scan Preferences")
+            return {}
+        # An image about to be built is scanned instead, by _stage_trivy_image
+        work_dir = ctx["source"]
+        if os.path.exists(os.path.join(work_dir, "Dockerfile")) and shutil.which("docker"):
+            return {}
+        outputs = self._run_trivy(pipeline, ctx, None)
+        return {"trivy_fs_report": outputs["trivy_report"], "trivy_metadata": outputs["trivy_metadata"]}
+
+    def _stage_trivy_image(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        if not ctx["scanners"].get('trivy', True):
+            return {}
+        if ctx["trivy_fs_report"] and not ctx["image"]:
+            return {"trivy_report": ctx["trivy_fs_report"], "trivy_metadata": ctx["trivy_metadata"]}
+        # The built image, or the filesystem when the planned build failed
+        return self._run_trivy(pipeline, ctx, ctx["image"])
+
+    def _run_trivy(self, pipeline: PipelineRun, ctx: Dict[str, Any],
+                   built_image_name: Optional[str]) -> Dict[str, Any]:
+        trivy_report_path = os.path.join(ctx["reports_dir"], "trivy-report.json")
+        work_dir = ctx["source"]
+        self.update_stage(pipeline.id, "trivy_scan", StageStatus.RUNNING)
+
+        scan_mode_msg = "scan"
+        trivy_metadata = None
+        try:
+            # Keyed on the source tree, so only filesystem scans are cached: a
+            # freshly built image may pull newer base layers.
+            cache_key = None
+            if not built_image_name:
+                cache_key = scan_cache_key(ctx["tree_id"], "trivy", tool_version("trivy"), {
+                    "mode": "fs",
+                    "artifact": pipeline.repo_name,
+                    "vuln_db_epoch": ruleset_epoch(),
+                })
+                # Filesystem scans report the checkout's path as the
+                # artifact; describe the repository instead
+                file_index = ctx.get("file_index") or build_file_index(work_dir)
+                trivy_metadata = {
+                    "artifact": pipeline.repo_name,
+                    "size": file_index.total_size,
+                    "os": {"Family": "Source", "Name": "Repository"},
+                }
+            if restore_scan(cache_key, ctx["reports_dir"]) is not None:
+                self.update_stage(pipeline.id, "trivy_scan", StageStatus.SUCCESS,
+                                f"Trivy filesystem scan on {os.path.basename(work_dir)} completed (cache hit)")
+                return {"trivy_report": trivy_report_path, "trivy_metadata": trivy_metadata}
+
+            trivy_common_flags = [
+                "--format", "json",
+                "--timeout", f"{TRIVY_TIMEOUT_SECONDS}s",
+                "--scanners", "vuln",
+                "--no-progress",
+                "--quiet",
+            ]
+
+            if built_image_name:
+                # Scan the built Docker image
+                scan_target = built_image_name
+                trivy_cmd = [
+                    "trivy", "image", *trivy_common_flags,
+                    "--output", trivy_report_path, scan_target,
+                ]
+                scan_mode_msg = f"image scan for {scan_target}"
+            else:
+                # No Docker image — scan filesystem for dependency vulnerabilities
+                scan_target = work_dir
+                trivy_cmd = [
+                    "trivy", "fs", *trivy_common_flags,
+                    "--skip-dirs", ".git",
+                    "--skip-dirs", "node_modules",
+                    "--skip-dirs", "venv",
+                    "--skip-dirs", ".venv",
+                    "--skip-dirs", "__pycache__",
+                    "--skip-dirs", "dist",
+                    "--skip-dirs", "build",
+                    "--output", trivy_report_path, scan_target,
+                ]
+                scan_mode_msg = (
+                    f"filesystem scan on {os.path.basename(work_dir)} "
+                    "(dependency source scan; base-image OS CVEs require Docker image scan)"
+                )
+
+            result = run_tool(
+                trivy_cmd,
+                timeout=TRIVY_TIMEOUT_SECONDS + 30,  # small buffer over Trivy's internal timeout
+                on_line=self._tail(pipeline, "trivy_scan"),
+            )
+            if result.returncode != 0 and "No such image" not in result.stderr:
+                raise Exception(result.stderr)
+
+            if result.returncode == 0:
+                store_scan(cache_key, "trivy", ctx["reports_dir"], ["trivy-report.json"])
+
+            self.update_stage(pipeline.id, "trivy_scan", StageStatus.SUCCESS,
+                            f"Trivy {scan_mode_msg} completed")
+        except subprocess.TimeoutExpired:
+            msg = f"Trivy {scan_mode_msg} timed out after {TRIVY_TIMEOUT_SECONDS}s"
+            self.update_stage(pipeline.id, "trivy_scan", StageStatus.FAILED, error=msg)
+            logger.warning(msg)
+            # Continue pipeline even if Trivy timed out
+        except FileNotFoundError:
+            msg = "Trivy not installed; skipping Trivy stage"
+            self.update_stage(pipeline.id, "trivy_scan", StageStatus.SKIPPED, logs=msg)
+            logger.warning(msg)
+        except Exception as e:
+            self.update_stage(pipeline.id, "trivy_scan", StageStatus.FAILED, error=str(e))
+            logger.warning(f"Trivy scan failed but pipeline will continue: {e}")
+        return {"trivy_report": trivy_report_path, "trivy_metadata": trivy_metadata}
+
+    def _stage_dast(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        # Priority: explicit scan prefs -> env var -> image-based local scan
+        scan_prefs = ctx["scan_prefs"]
+        scanners = ctx["scanners"]
+        built_image_name = ctx["image"]
+        configured_dast_url = (
+            (scan_prefs.get("dastTargetUrl") if isinstance(scan_prefs, dict) else None)
+            or os.getenv("DAST_TARGET_URL", "")
+        ).strip()
+
+        if scanners.get('dast', True) and not ctx["fast_scan"] and (built_image_name or configured_dast_url):
+            self.update_stage(pipeline.id, "dast_scan", StageStatus.RUNNING)
+            try:
+                dockerfile_path = os.path.join(ctx["source"], "Dockerfile")
+                dast_report = run_dast_scan(
+                    target_url=configured_dast_url or None,
+                    reports_dir=ctx["reports_dir"],
+                    scan_type="baseline",
+                    image_name=built_image_name if not configured_dast_url else None,
+                    dockerfile_path=dockerfile_path if os.path.exists(dockerfile_path) else None,
+                )
+                dast_alerts = dast_report.get('total_alerts', 0)
+                self.update_stage(pipeline.id, "dast_scan", StageStatus.SUCCESS,
+                                f"DAST scan completed: {dast_alerts} alert(s) found")
+            except Exception as e:
+                self.update_stage(pipeline.id, "dast_scan", StageStatus.FAILED, error=str(e))
+                logger.warning(f"DAST scan failed: {e}")
+                dast_report = {}
+        else:
+            reason = "Disabled by Scan Preferences" if not scanners.get('dast', True) else "Fast Scan Mode enabled"
+            if not built_image_name and not configured_dast_url:
+                reason = "No Docker image and no DAST target URL (set DAST_TARGET_URL or scan_prefs.dastTargetUrl)"
+            self.update_stage(pipeline.id, "dast_scan", StageStatus.SKIPPED, reason)
+            dast_report = {}
+        return {"dast_report": dast_report}
+
+    def _stage_normalize_reports(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        # Stream every report once into findings.json (read back by DB
+        # ingestion); scoring, the AI prompt and the decision report read
+        # the totals kept by the model. Scanners record repository-relative
+        # paths, so the raw reports are left as written.
+        try:
+            findings = Findings.from_reports(ctx["reports_dir"], source_root=ctx["source"], save=True)
+        except OSError as e:
+            logger.warning(f"Failed to save normalized findings: {e}")
+            findings = Findings.from_reports(ctx["reports_dir"], source_root=ctx["source"])
+        if ctx.get("trivy_metadata"):
+            findings.scan("Trivy").meta.update(ctx["trivy_metadata"])
+        try:
+            findings.save_summary(ctx["reports_dir"])
+        except OSError as e:
+            logger.warning(f"Failed to save findings summary: {e}")
+        pipeline.findings = findings
+        return {"reports": ctx["reports_dir"], "findings": findings}
+
+    def _stage_ai_prediction(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        self.update_stage(pipeline.id, "ai_prediction", StageStatus.RUNNING)
+        ai_prediction = None
+        try:
+            # Example: Gather relevant data for prediction (code, scan summaries, etc.)
+            ai_input = {
+                "repo_name": pipeline.repo_name,
+                "branch": pipeline.branch,
+                "commit_sha": pipeline.commit_sha,
+                "findings": ctx["findings"].brief(),
+            }
+            ai_prediction = predict_vulnerabilities(ai_input)
+            pipeline.ai_prediction = ai_prediction
+            # Save AI prediction to a report file for later use
+            ai_report_path = os.path.join(ctx["reports_dir"], "ai-prediction.json")
+            with open(ai_report_path, "w") as f:
+                json.dump(ai_prediction, f, separators=(",", ":"))
+            self.update_stage(pipeline.id, "ai_prediction", StageStatus.SUCCESS, f"AI prediction risk score: {ai_prediction.get('risk_score')}")
+        except Exception as e:
+            self.update_stage(pipeline.id, "ai_prediction", StageStatus.FAILED, error=str(e))
+            logger.warning(f"AI prediction failed: {e}")
+        return {"ai_prediction": ai_prediction}
+
+    def _stage_policy_check(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        self.update_stage(pipeline.id, "policy_check", StageStatus.RUNNING)
+        try:
+            vuln_summary = self._analyze_vulnerabilities(ctx["findings"])
+            pipeline.vulnerability_summary = vuln_summary
+            pipeline.security_score = vuln_summary.get('security_score', 0)
+            pipeline.max_cvss_score = vuln_summary.get('max_cvss_score', 0.0)
+            self.update_stage(pipeline.id, "policy_check", StageStatus.SUCCESS,
+                            f"Security Score: {pipeline.security_score}/100")
+        except Exception as e:
+            self.update_stage(pipeline.id, "policy_check", StageStatus.FAILED, error=str(e))
+            raise
+        return {"vulnerability_summary": vuln_summary}
+
+    def _stage_decision(self, pipeline: PipelineRun, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        self.update_stage(pipeline.id, "decision", StageStatus.RUNNING)
+        is_deployable = self._evaluate_deployment(pipeline.security_score, ctx["vulnerability_summary"])
+        pipeline.is_deployable = is_deployable
+
+        decision_msg = "✅ APPROVED for deployment" if is_deployable else "❌ BLOCKED - Security requirements not met"
+        self.update_stage(pipeline.id, "decision", StageStatus.SUCCESS, decision_msg)
+
+        # Generate security decision report
+        self._generate_decision_report(pipeline, ctx["reports_dir"], findings=ctx["findings"])
+        return {"decision": is_deployable}
+
+    def _analyze_vulnerabilities(self, findings: Findings) -> Dict[str, Any]:
+        """Calculate the vulnerability summary and security score of a run.
         
-        Reads the unified SAST report (sast-report.json) when available,
-        falling back to bandit-report.json for backward compatibility.
-        Also integrates Gitleaks (secrets) and DAST (ZAP) results.
+        Counts come from the run's normalized findings (unified SAST report,
+        or bandit-report.json for older runs, plus Gitleaks and DAST).
         Separates code vulnerabilities (SAST) from base image/dependency
         vulnerabilities (Trivy) and applies different weights.
         """
@@ -590,148 +915,60 @@ class PipelineExecutor:
             'max_cvss_score': 0.0,
         }
         
-        # Try unified SAST report first, then fall back to Bandit-only
-        sast_report_path = os.path.join(os.path.dirname(bandit_path), 'sast-report.json')
-        try:
-            if os.path.exists(sast_report_path):
-                with open(sast_report_path, 'r') as f:
-                    sast_data = json.load(f)
-                metrics = sast_data.get('metrics', {}).get('totals', {})
-                summary['sast_issues'] = metrics.get('total', 0)
-                summary['sast_high'] = metrics.get('high', 0)
-                summary['sast_medium'] = metrics.get('medium', 0)
-                summary['sast_low'] = metrics.get('low', 0)
-                
-                # CVSS tracking for SAST
-                if summary['sast_high'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 8.0)
-                elif summary['sast_medium'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 5.5)
-                elif summary['sast_low'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 2.0)
-                
-                # Backward compat
-                summary['bandit_issues'] = summary['sast_issues']
-                summary['bandit_high'] = summary['sast_high']
-                summary['bandit_medium'] = summary['sast_medium']
-                summary['bandit_low'] = summary['sast_low']
-                summary['high'] += summary['sast_high']
-                summary['medium'] += summary['sast_medium']
-                summary['low'] += summary['sast_low']
-                summary['languages_detected'] = list(sast_data.get('languages_detected', {}).keys())
-                summary['tools_used'] = [t for t, info in sast_data.get('tools_used', {}).items() if info.get('success')]
-            else:
-                # Fallback: read bandit report directly
-                with open(bandit_path, 'r') as f:
-                    bandit_data = json.load(f)
-                    results = bandit_data.get('results', [])
-                    summary['sast_issues'] = len(results)
-                    summary['bandit_issues'] = len(results)
-                    for issue in results:
-                        severity = issue.get('issue_severity', '').upper()
-                        if severity == 'HIGH':
-                            summary['high'] += 1
-                            summary['sast_high'] += 1
-                            summary['bandit_high'] += 1
-                        elif severity == 'MEDIUM':
-                            summary['medium'] += 1
-                            summary['sast_medium'] += 1
-                            summary['bandit_medium'] += 1
-                        elif severity == 'LOW':
-                            summary['low'] += 1
-                            summary['sast_low'] += 1
-                            summary['bandit_low'] += 1
-                    
-                    # CVSS tracking for Bandit Fallback
-                    if summary['bandit_high'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 8.0)
-                    elif summary['bandit_medium'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 5.5)
-                    elif summary['bandit_low'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 2.0)
-        except Exception as e:
-            print(f"Error reading SAST/Bandit report: {e}")
-        
-        # Analyze Trivy report (image/dependency vulnerabilities)
-        try:
-            with open(trivy_path, 'r') as f:
-                trivy_data = json.load(f)
-                
-                for result in trivy_data.get('Results', []):
-                    for vuln in result.get('Vulnerabilities', []):
-                        severity = vuln.get('Severity', 'UNKNOWN').upper()
-                        
-                        # Extract CVSS
-                        cvss_data = vuln.get("CVSS", {})
-                        v_cvss = 0.0
-                        for vendor, scores in cvss_data.items():
-                            if "V3Score" in scores: v_cvss = max(v_cvss, scores.get("V3Score", 0.0))
-                            elif "V2Score" in scores: v_cvss = max(v_cvss, scores.get("V2Score", 0.0))
-                        if v_cvss == 0.0:
-                            if severity == 'CRITICAL': v_cvss = 9.5
-                            elif severity == 'HIGH': v_cvss = 8.0
-                            elif severity == 'MEDIUM': v_cvss = 5.5
-                            elif severity == 'LOW': v_cvss = 2.0
-                        summary['max_cvss_score'] = max(summary['max_cvss_score'], v_cvss)
-                        
-                        if severity == 'CRITICAL':
-                            summary['critical'] += 1
-                            summary['trivy_critical'] += 1
-                        elif severity == 'HIGH':
-                            summary['high'] += 1
-                            summary['trivy_high'] += 1
-                        elif severity == 'MEDIUM':
-                            summary['medium'] += 1
-                            summary['trivy_medium'] += 1
-                        elif severity == 'LOW':
-                            summary['low'] += 1
-                            summary['trivy_low'] += 1
-        except Exception as e:
-            print(f"Error reading Trivy report: {e}")
-        
-        # Analyze Gitleaks report (secrets)
-        if gitleaks_path:
-            try:
-                if os.path.exists(gitleaks_path):
-                    with open(gitleaks_path, 'r') as f:
-                        gitleaks_data = json.load(f)
-                    secrets = gitleaks_data.get('results', [])
-                    summary['secrets_found'] = len(secrets)
-                    for secret in secrets:
-                        sev = secret.get('severity', 'MEDIUM').upper()
-                        if sev == 'CRITICAL':
-                            summary['secrets_critical'] += 1
-                            summary['critical'] += 1
-                            summary['max_cvss_score'] = max(summary['max_cvss_score'], 9.5)
-                        elif sev == 'HIGH':
-                            summary['secrets_high'] += 1
-                            summary['high'] += 1
-                            summary['max_cvss_score'] = max(summary['max_cvss_score'], 8.0)
-                        else:
-                            summary['secrets_medium'] += 1
-                            summary['medium'] += 1
-                            summary['max_cvss_score'] = max(summary['max_cvss_score'], 5.5)
-            except Exception as e:
-                print(f"Error reading Gitleaks report: {e}")
-        
-        # Analyze DAST report (ZAP)
-        if dast_path:
-            try:
-                if os.path.exists(dast_path):
-                    with open(dast_path, 'r') as f:
-                        dast_data = json.load(f)
-                    dast_alerts = dast_data.get('results', [])
-                    summary['dast_alerts'] = len(dast_alerts)
-                    for alert in dast_alerts:
-                        risk = alert.get('risk', 'LOW').upper()
-                        if risk == 'HIGH':
-                            summary['dast_high'] += 1
-                            summary['high'] += 1
-                            summary['max_cvss_score'] = max(summary['max_cvss_score'], 8.0)
-                        elif risk == 'MEDIUM':
-                            summary['dast_medium'] += 1
-                            summary['medium'] += 1
-                            summary['max_cvss_score'] = max(summary['max_cvss_score'], 5.5)
-                        elif risk == 'LOW':
-                            summary['dast_low'] += 1
-                            summary['low'] += 1
-                            summary['max_cvss_score'] = max(summary['max_cvss_score'], 2.0)
-            except Exception as e:
-                print(f"Error reading DAST report: {e}")
+        # SAST (unified report or Bandit fallback)
+        sast = findings.scan("SAST")
+        summary['sast_issues'] = sast.total
+        summary['sast_high'] = sast.count('HIGH')
+        summary['sast_medium'] = sast.count('MEDIUM')
+        summary['sast_low'] = sast.count('LOW')
+        if summary['sast_high'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 8.0)
+        elif summary['sast_medium'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 5.5)
+        elif summary['sast_low'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 2.0)
+        # Backward compat
+        summary['bandit_issues'] = summary['sast_issues']
+        summary['bandit_high'] = summary['sast_high']
+        summary['bandit_medium'] = summary['sast_medium']
+        summary['bandit_low'] = summary['sast_low']
+        summary['high'] += summary['sast_high']
+        summary['medium'] += summary['sast_medium']
+        summary['low'] += summary['sast_low']
+        languages = sast.meta.get('languages_detected')
+        if isinstance(languages, dict):
+            summary['languages_detected'] = list(languages.keys())
+        tools = sast.meta.get('tools_used')
+        if isinstance(tools, dict):
+            summary['tools_used'] = [t for t, info in tools.items() if info.get('success')]
+        
+        # Trivy (image/dependency vulnerabilities)
+        trivy = findings.scan("Trivy")
+        summary['max_cvss_score'] = max(summary['max_cvss_score'], findings.max_cvss("Trivy"))
+        summary['trivy_vulns'] = trivy.total
+        for sev in ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW'):
+            summary[f'trivy_{sev.lower()}'] = trivy.count(sev)
+            summary[sev.lower()] += trivy.count(sev)
+        
+        # Gitleaks (secrets)
+        secrets = findings.scan("Gitleaks")
+        summary['secrets_found'] = secrets.total
+        summary['secrets_critical'] = secrets.count('CRITICAL')
+        summary['secrets_high'] = secrets.count('HIGH')
+        summary['secrets_medium'] = secrets.total - summary['secrets_critical'] - summary['secrets_high']
+        summary['critical'] += summary['secrets_critical']
+        summary['high'] += summary['secrets_high']
+        summary['medium'] += summary['secrets_medium']
+        if summary['secrets_critical'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 9.5)
+        elif summary['secrets_high'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 8.0)
+        elif summary['secrets_medium'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 5.5)
+        
+        # DAST (ZAP)
+        dast = findings.scan("DAST")
+        summary['dast_alerts'] = dast.total
+        for sev in ('HIGH', 'MEDIUM', 'LOW'):
+            summary[f'dast_{sev.lower()}'] = dast.count(sev)
+            summary[sev.lower()] += dast.count(sev)
+        if summary['dast_high'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 8.0)
+        elif summary['dast_medium'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 5.5)
+        elif summary['dast_low'] > 0: summary['max_cvss_score'] = max(summary['max_cvss_score'], 2.0)
         
         summary['total'] = summary['critical'] + summary['high'] + summary['medium'] + summary['low']
         
@@ -835,8 +1072,9 @@ class PipelineExecutor:
 
         return True
     
-    def _generate_decision_report(self, pipeline: PipelineRun,
-                                   policy_dict: Dict[str, Any] = None):
+    def _generate_decision_report(self, pipeline: PipelineRun, reports_dir: str,
+                                   policy_dict: Dict[str, Any] = None,
+                                   findings: Optional[Findings] = None):
         """Generate security decision JSON report."""
         policy = self._load_policy(policy_dict)
         min_score = policy.get("minScore", 70)
@@ -853,6 +1091,11 @@ class PipelineExecutor:
             "decision": "APPROVED" if pipeline.is_deployable else "BLOCKED",
             "reasons": [],
         }
+        if findings is not None:
+            decision_report["scanners"] = {
+                source: {"total": scan.total, "counts": scan.counts}
+                for source, scan in findings.scans.items()
+            }
 
         if not pipeline.is_deployable:
             if (pipeline.security_score or 0) < min_score:
@@ -869,9 +1112,9 @@ class PipelineExecutor:
                     f"Too many high vulnerabilities: {vuln['high']}"
                 )
 
-        decision_path = os.path.join(self.reports_dir, "security_decision.json")
+        decision_path = os.path.join(reports_dir, "security_decision.json")
         with open(decision_path, 'w') as f:
-            json.dump(decision_report, f, indent=2)
+            json.dump(decision_report, f, separators=(",", ":"))
     
     def get_pipeline(self, pipeline_id: str) -> Optional[Dict]:
         """Get a specific pipeline run"""
@@ -1054,6 +1297,9 @@ def clone_repository(repo_url: str, branch: str, workspace_path: str) -> Tuple[b
     """
     Clone a Git repository to the workspace.
     
+    Checks the branch out of the local git mirror cache when possible and
+    falls back to a shallow clone from the remote.
+    
     Args:
         repo_url: URL of the repository to clone
         branch: Branch to clone
@@ -1064,6 +1310,10 @@ def clone_repository(repo_url: str, branch: str, workspace_path: str) -> Tuple[b
     """
     logger.info(f"Cloning repository: {repo_url} (branch: {branch})")
     
+    cached, cache_message = checkout_from_cache(repo_url, branch, workspace_path)
+    if cached:
+        return True, cache_message
+    
     try:
         result = subprocess.run(
             ["git", "clone", "--depth", "1", "--branch", branch, repo_url, workspace_path],
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+On-disk report storage for SentinelOps
+A finished run's report directory is compressed when it is published:
+every JSON report of at least REPORT_COMPRESS_MIN_BYTES is replaced by a
+gzip copy (``<name>.json.gz``). Readers go through :func:`open_report` /
+:func:`load_report`, which accept the plain name and transparently open
+whichever variant exists, so directories written before compression was
+enabled keep working.
+
+Retention is two-tiered. Raw scanner reports are deleted
+REPORT_RAW_RETENTION_DAYS after a run; the normalized findings, their
+summary, the unified SAST report and the decision/AI reports
+(RETAINED_REPORTS) are kept until REPORT_RETENTION_DAYS, when the whole
+directory goes. Findings are also
+ingested into the database, so dropping raw reports only loses the
+scanners' original output. :func:`collect_report_garbage` applies the
+policy and reports what it reclaimed; the worker pool runs it
+periodically.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import time
+from typing import IO, Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger("SentinelOps.ReportStore")
+
+REPORT_COMPRESSION = os.getenv("REPORT_COMPRESSION", "gzip").strip().lower()
+REPORT_COMPRESS_MIN_BYTES = int(os.getenv("REPORT_COMPRESS_MIN_BYTES", "4096"))
+# 0 keeps reports forever
+REPORT_RAW_RETENTION_DAYS = float(os.getenv("REPORT_RAW_RETENTION_DAYS", "30"))
+REPORT_RETENTION_DAYS = float(os.getenv("REPORT_RETENTION_DAYS", "365"))
+REPORT_GC_INTERVAL_SECONDS = float(os.getenv("REPORT_GC_INTERVAL_SECONDS", "3600"))
+
+GZIP_SUFFIX = ".gz"
+
+# Kept for the full retention period; everything else in a run's
+# directory is a raw report
+RETAINED_REPORTS = frozenset({
+    "findings.json",
+    "findings-summary.json",
+    # Source context for AI fix suggestions (/api/pipelines/<id>/fix)
+    "sast-report.json",
+    "security_decision.json",
+    "ai-prediction.json",
+})
+
+# Staging and superseded directories left behind by a crashed run are
+# removed once nothing has touched them for this long
+ORPHAN_DIR_SUFFIXES = (".partial", ".stale-")
+ORPHAN_DIR_MAX_AGE_SECONDS = 24 * 3600
+
+_DAY_SECONDS = 24 * 3600
+
+
+def resolve_report(path: str) -> Optional[str]:
+    """The file that stores report ``path`` (plain or gzip), or None."""
+    if os.path.isfile(path):
+        return path
+    if os.path.isfile(path + GZIP_SUFFIX):
+        return path + GZIP_SUFFIX
+    return None
+
+
+def report_exists(path: str) -> bool:
+    return resolve_report(path) is not None
+
+
+def open_report(path: str, binary: bool = False) -> IO:
+    """Open report ``path`` for reading, decompressing it if stored gzipped.
+
+    Raises FileNotFoundError if neither variant exists.
+    """
+    stored = resolve_report(path)
+    if stored is None:
+        raise FileNotFoundError(path)
+    if stored.endswith(GZIP_SUFFIX):
+        return gzip.open(stored, "rb") if binary else gzip.open(stored, "rt", encoding="utf-8")
+    return open(stored, "rb") if binary else open(stored, encoding="utf-8")
+
+
+def load_report(path: str) -> Optional[Any]:
+    """Parsed JSON of report ``path``, or None if it is missing or unreadable."""
+    try:
+        with open_report(path) as f:
+            return json.load(f)
+    except (OSError, EOFError, ValueError):
+        return None
+
+
+def remove_report(path: str) -> None:
+    """Delete both stored variants of report ``path``."""
+    for stored in (path, path + GZIP_SUFFIX):
+        try:
+            os.remove(stored)
+        except FileNotFoundError:
+            pass
+
+
+def compress_reports(reports_dir: str) -> int:
+    """Gzip the JSON reports in ``reports_dir`` in place; returns bytes saved.
+
+    Only called on a run's private staging directory, before it is
+    published, so no reader can see a report disappear.
+    """
+    if REPORT_COMPRESSION != "gzip":
+        return 0
+    saved = 0
+    for entry in os.scandir(reports_dir):
+        if not entry.name.endswith(".json") or not entry.is_file():
+            continue
+        size = entry.stat().st_size
+        if size < REPORT_COMPRESS_MIN_BYTES:
+            continue
+        target = entry.path + GZIP_SUFFIX
+        tmp = target + ".tmp"
+        try:
+            with open(entry.path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(tmp, target)
+            os.remove(entry.path)
+        except OSError as exc:
+            logger.warning(f"Could not compress {entry.path}: {exc}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            continue
+        saved += size - os.path.getsize(target)
+    return saved
+
+
+def _scan_dir(path: str) -> Tuple[list, float]:
+    """Regular files directly in ``path`` and the newest of their mtimes."""
+    files = []
+    newest = 0.0
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                files.append((entry, stat.st_size))
+                newest = max(newest, stat.st_mtime)
+    return files, newest
+
+
+def _report_dirs(root: str) -> Iterator[str]:
+    """Directories below ``root`` that hold report files (not ``root`` itself)."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        if dirpath != root and filenames:
+            yield dirpath
+
+
+def _base_name(name: str) -> str:
+    return name[:-len(GZIP_SUFFIX)] if name.endswith(GZIP_SUFFIX) else name
+
+
+def collect_report_garbage(root: str, now: Optional[float] = None) -> Dict[str, Any]:
+    """Apply the retention policy to every report directory below ``root``.
+
+    The age of a directory is that of its newest file, so deleting raw
+    reports does not restart the clock for the rest. The "latest" reports
+    directly in ``root`` are never touched. Returns the bytes, files and
+    directories reclaimed plus the paths of the deleted directories and of
+    the deleted raw reports (by their plain ``.json`` name).
+    """
+    now = time.time() if now is None else now
+    raw_cutoff = now - REPORT_RAW_RETENTION_DAYS * _DAY_SECONDS if REPORT_RAW_RETENTION_DAYS > 0 else None
+    dir_cutoff = now - REPORT_RETENTION_DAYS * _DAY_SECONDS if REPORT_RETENTION_DAYS > 0 else None
+    result: Dict[str, Any] = {
+        "bytes_reclaimed": 0, "files_removed": 0, "dirs_removed": 0,
+        "removed_dirs": [], "removed_reports": [],
+    }
+    if not os.path.isdir(root):
+        return result
+
+    for path in list(_report_dirs(root)):
+        try:
+            files, newest = _scan_dir(path)
+        except OSError:
+            continue
+        orphan = any(suffix in os.path.basename(path) for suffix in ORPHAN_DIR_SUFFIXES)
+        if orphan:
+            expired = newest < now - ORPHAN_DIR_MAX_AGE_SECONDS
+        else:
+            expired = dir_cutoff is not None and newest < dir_cutoff
+        if expired:
+            shutil.rmtree(path, ignore_errors=True)
+            if os.path.exists(path):
+                continue
+            result["bytes_reclaimed"] += sum(size for _, size in files)
+            result["files_removed"] += len(files)
+            result["dirs_removed"] += 1
+            if not orphan:
+                result["removed_dirs"].append(path)
+            continue
+        if raw_cutoff is None or newest >= raw_cutoff:
+            continue
+        for entry, size in files:
+            if _base_name(entry.name) in RETAINED_REPORTS:
+                continue
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            result["bytes_reclaimed"] += size
+            result["files_removed"] += 1
+            result["removed_reports"].append(os.path.join(path, _base_name(entry.name)))
+
+    if result["files_removed"]:
+        logger.info(
+            f"Report GC reclaimed {result['bytes_reclaimed']} bytes "
+            f"({result['files_removed']} files, {result['dirs_removed']} directories)"
+        )
+    return result
@@ -25,11 +25,22 @@ import logging
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from .file_index import FileIndex, relative_path
+from .json_stream import iter_json_values
+from .scan_cache import git_output, ruleset_epoch, tool_version
 
 logger = logging.getLogger("SentinelOps.SAST")
 
+# Maximum number of SAST tool processes run at the same time
+SAST_CPU_BUDGET = max(1, int(os.getenv("SAST_CPU_BUDGET", str(os.cpu_count() or 2))))
+
+# Incremental scans fall back to a full scan above this many changed files
+SAST_INCREMENTAL_MAX_FILES = int(os.getenv("SAST_INCREMENTAL_MAX_FILES", "1000"))
+
 # ═══════════════════════════════════════════════════════════════════
 # LANGUAGE DETECTION
 # ═══════════════════════════════════════════════════════════════════
@@ -79,27 +90,32 @@ LANGUAGE_INFO = {
 }
 
 
-def detect_languages(repo_path: str) -> Dict[str, Dict[str, Any]]:
+# Extension → language (a file belongs to one language)
+EXTENSION_LANGUAGES: Dict[str, str] = {}
+for _lang, _exts in LANGUAGE_EXTENSIONS.items():
+    for _ext in _exts:
+        EXTENSION_LANGUAGES.setdefault(_ext, _lang)
+
+
+def build_file_index(repo_path: str) -> FileIndex:
+    """Index *repo_path* once with SAST languages and excluded directories."""
+    return FileIndex.build(repo_path, EXTENSION_LANGUAGES, EXCLUDE_DIRS)
+
+
+def detect_languages(repo_path: str, file_index: FileIndex | None = None) -> Dict[str, Dict[str, Any]]:
     """
     Detect programming languages in a repository by scanning file extensions.
 
+    Args:
+        repo_path:  Path to the repository
+        file_index: Index of *repo_path* to reuse (built if not given)
+
     Returns:
         Dict mapping language name → { files: [paths], count: int, info: {...} }
     """
-    languages: Dict[str, List[str]] = defaultdict(list)
-    repo = Path(repo_path)
-
-    for root, dirs, files in os.walk(repo):
-        # Skip excluded directories (in-place modification)
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-
-        for fname in files:
-            ext = Path(fname).suffix.lower()
-            for lang, exts in LANGUAGE_EXTENSIONS.items():
-                if ext in exts:
-                    rel_path = os.path.relpath(os.path.join(root, fname), repo_path)
-                    languages[lang].append(rel_path)
-                    break  # a file belongs to one language
+    if file_index is None:
+        file_index = build_file_index(repo_path)
+    languages = file_index.by_language()
 
     result = {}
     for lang, file_list in languages.items():
@@ -153,13 +169,24 @@ def _normalise_severity(raw: str) -> str:
 
 # ── Bandit (Python) ──────────────────────────────────────────────
 
-def run_bandit(repo_path: str, output_path: str) -> Tuple[bool, str, List[dict]]:
-    """Run Bandit on Python files and return normalised issues."""
+def _target_paths(repo_path: str, targets: List[str] | None) -> List[str]:
+    """Absolute paths to scan: the given repo-relative *targets*, or the whole repo."""
+    if targets is None:
+        return [repo_path]
+    return [os.path.join(repo_path, t) for t in targets]
+
+
+def run_bandit(
+    repo_path: str,
+    output_path: str,
+    targets: List[str] | None = None,
+) -> Tuple[bool, str, List[dict]]:
+    """Run Bandit on Python files (or only *targets*) and return normalised issues."""
     logger.info("Running Bandit (Python SAST)…")
     try:
         result = subprocess.run(
             [
-                "bandit", "-r", repo_path,
+                "bandit", "-r", *_target_paths(repo_path, targets),
                 "-f", "json", "-o", output_path,
                 "--exclude", ",".join(EXCLUDE_DIRS),
             ],
@@ -169,13 +196,10 @@ def run_bandit(repo_path: str, output_path: str) -> Tuple[bool, str, List[dict]]
         if result.returncode not in (0, 1):
             return False, f"Bandit error: {result.stderr.strip()}", []
 
-        raw = {}
-        if os.path.exists(output_path):
-            with open(output_path) as f:
-                raw = json.load(f)
+        raw_results = iter_json_values(output_path, ("results.item",)) if os.path.exists(output_path) else ()
 
         issues = []
-        for r in raw.get("results", []):
+        for _, r in raw_results:
             issues.append({
                 "tool": "bandit",
                 "language": "python",
@@ -184,7 +208,7 @@ def run_bandit(repo_path: str, output_path: str) -> Tuple[bool, str, List[dict]]
                 "severity": _normalise_severity(r.get("issue_severity", "")),
                 "confidence": _normalise_severity(r.get("issue_confidence", "")),
                 "message": r.get("issue_text", ""),
-                "file": r.get("filename", ""),
+                "file": relative_path(r.get("filename", ""), repo_path),
                 "line": r.get("line_number", 0),
                 "col": r.get("col_offset", 0),
                 "code": r.get("code", ""),
@@ -228,10 +252,12 @@ def run_semgrep(
     repo_path: str,
     output_path: str,
     languages: List[str] | None = None,
+    targets: List[str] | None = None,
 ) -> Tuple[bool, str, List[dict]]:
     """
     Run Semgrep with the p/default + p/security-audit rulesets.
     If *languages* is given, only scan those; otherwise auto-detect.
+    If *targets* is given, only those repo-relative files are scanned.
     """
     logger.info("Running Semgrep (multi-language SAST)…")
     try:
@@ -248,7 +274,7 @@ def run_semgrep(
         for d in EXCLUDE_DIRS:
             cmd.extend(["--exclude", d])
 
-        cmd.append(repo_path)
+        cmd.extend(_target_paths(repo_path, targets))
 
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
 
@@ -260,13 +286,12 @@ def run_semgrep(
                 return False, f"Semgrep error: {stderr[:500]}", []
             return False, "Semgrep scan failed with unknown error", []
 
-        raw = {}
-        if os.path.exists(output_path):
-            with open(output_path) as f:
-                raw = json.load(f)
+        # Stream the results: Semgrep output for large repositories can run
+        # to hundreds of MB
+        raw_results = iter_json_values(output_path, ("results.item",)) if os.path.exists(output_path) else ()
 
         issues = []
-        for r in raw.get("results", []):
+        for _, r in raw_results:
             extra = r.get("extra", {})
             metadata = extra.get("metadata", {})
 
@@ -293,7 +318,7 @@ def run_semgrep(
                 "severity": _normalise_severity(extra.get("severity", "WARNING")),
                 "confidence": _normalise_severity(metadata.get("confidence", "MEDIUM")),
                 "message": extra.get("message", ""),
-                "file": r.get("path", ""),
+                "file": relative_path(r.get("path", ""), repo_path),
                 "line": r.get("start", {}).get("line", 0),
                 "col": r.get("start", {}).get("col", 0),
                 "end_line": r.get("end", {}).get("line", 0),
@@ -331,12 +356,23 @@ def _extract_semgrep_cwe(metadata: dict) -> dict:
 
 # ── Gosec (Go) ──────────────────────────────────────────────────
 
-def run_gosec(repo_path: str, output_path: str) -> Tuple[bool, str, List[dict]]:
-    """Run Gosec security scanner for Go code."""
+def run_gosec(
+    repo_path: str,
+    output_path: str,
+    targets: List[str] | None = None,
+) -> Tuple[bool, str, List[dict]]:
+    """Run Gosec security scanner for Go code.
+
+    Gosec analyses whole packages, so *targets* selects the packages
+    (directories) containing those files.
+    """
     logger.info("Running Gosec (Go security scanner)…")
+    packages = ["./..."]
+    if targets is not None:
+        packages = sorted({"./" + (os.path.dirname(t) or ".") for t in targets})
     try:
         result = subprocess.run(
-            ["gosec", "-fmt=json", f"-out={output_path}", "./..."],
+            ["gosec", "-fmt=json", f"-out={output_path}", *packages],
             capture_output=True, text=True, timeout=300,
             cwd=repo_path,
         )
@@ -358,7 +394,7 @@ def run_gosec(repo_path: str, output_path: str) -> Tuple[bool, str, List[dict]]:
                 "severity": _normalise_severity(r.get("severity", "")),
                 "confidence": _normalise_severity(r.get("confidence", "")),
                 "message": r.get("details", ""),
-                "file": r.get("file", ""),
+                "file": relative_path(r.get("file", ""), repo_path),
                 "line": int(r.get("line", 0)),
                 "col": int(r.get("column", 0)),
                 "code": r.get("code", ""),
@@ -378,12 +414,16 @@ def run_gosec(repo_path: str, output_path: str) -> Tuple[bool, str, List[dict]]:
 
 # ── Flawfinder (C/C++) ──────────────────────────────────────────
 
-def run_flawfinder(repo_path: str, output_path: str) -> Tuple[bool, str, List[dict]]:
-    """Run Flawfinder on C/C++ source files."""
+def run_flawfinder(
+    repo_path: str,
+    output_path: str,
+    targets: List[str] | None = None,
+) -> Tuple[bool, str, List[dict]]:
+    """Run Flawfinder on C/C++ source files (or only *targets*)."""
     logger.info("Running Flawfinder (C/C++ SAST)…")
     try:
         result = subprocess.run(
-            ["flawfinder", "--json", repo_path],
+            ["flawfinder", "--json", *_target_paths(repo_path, targets)],
             capture_output=True, text=True, timeout=300,
         )
 
@@ -394,7 +434,7 @@ def run_flawfinder(repo_path: str, output_path: str) -> Tuple[bool, str, List[di
         raw = json.loads(raw_output)
         # Save report
         with open(output_path, "w") as f:
-            json.dump(raw, f, indent=2)
+            f.write(raw_output)
 
         issues = []
         for r in raw if isinstance(raw, list) else raw.get("results", []):
@@ -406,7 +446,7 @@ def run_flawfinder(repo_path: str, output_path: str) -> Tuple[bool, str, List[di
                 "severity": _map_flawfinder_level(r.get("level", 0)),
                 "confidence": "MEDIUM",
                 "message": r.get("warning", r.get("description", "")),
-                "file": r.get("filename", r.get("file", "")),
+                "file": relative_path(r.get("filename", r.get("file", "")), repo_path),
                 "line": int(r.get("line", r.get("lineno", 0))),
                 "col": int(r.get("column", r.get("col", 0))),
                 "code": r.get("context", ""),
@@ -435,17 +475,25 @@ def _map_flawfinder_level(level: int) -> str:
 
 # ── ShellCheck (Shell/Bash) ─────────────────────────────────────
 
-def run_shellcheck(repo_path: str, output_path: str) -> Tuple[bool, str, List[dict]]:
-    """Run ShellCheck on shell scripts."""
+def run_shellcheck(
+    repo_path: str,
+    output_path: str,
+    targets: List[str] | None = None,
+) -> Tuple[bool, str, List[dict]]:
+    """Run ShellCheck on shell scripts (or only *targets*)."""
     logger.info("Running ShellCheck (shell script linter)…")
     try:
         # Collect shell files
         shell_files = []
-        for root, dirs, files in os.walk(repo_path):
-            dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-            for f in files:
-                if f.endswith((".sh", ".bash", ".zsh")):
-                    shell_files.append(os.path.join(root, f))
+        if targets is not None:
+            shell_files = [p for p in _target_paths(repo_path, targets)
+                           if p.endswith((".sh", ".bash", ".zsh"))]
+        else:
+            for root, dirs, files in os.walk(repo_path):
+                dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+                for f in files:
+                    if f.endswith((".sh", ".bash", ".zsh")):
+                        shell_files.append(os.path.join(root, f))
 
         if not shell_files:
             return True, "No shell files found", []
@@ -461,7 +509,7 @@ def run_shellcheck(repo_path: str, output_path: str) -> Tuple[bool, str, List[di
 
         findings = json.loads(raw_output)
         with open(output_path, "w") as f:
-            json.dump(findings, f, indent=2)
+            f.write(raw_output)
 
         issues = []
         for r in findings:
@@ -473,7 +521,7 @@ def run_shellcheck(repo_path: str, output_path: str) -> Tuple[bool, str, List[di
                 "severity": _normalise_severity(r.get("level", "warning")),
                 "confidence": "HIGH",
                 "message": r.get("message", ""),
-                "file": r.get("file", ""),
+                "file": relative_path(r.get("file", ""), repo_path),
                 "line": r.get("line", 0),
                 "col": r.get("column", 0),
                 "end_line": r.get("endLine", 0),
@@ -535,6 +583,41 @@ TOOL_DISPLAY = {
 }
 
 
+# Arguments that print each tool's version (used in scan cache keys)
+TOOL_VERSION_ARGS = {
+    "bandit":      ("--version",),
+    "semgrep":     ("--version",),
+    "gosec":       ("-version",),
+    "flawfinder":  ("--version",),
+    "shellcheck":  ("--version",),
+}
+
+
+def sast_tool_fingerprint() -> Dict[str, Any]:
+    """Versions of the installed SAST tools plus the rule configuration.
+
+    Any change (a tool installed, upgraded or removed, or a new day of
+    Semgrep's ``--config auto`` registry rules) changes the fingerprint.
+    """
+    return {
+        "tools": {
+            name: tool_version(name, TOOL_VERSION_ARGS[name])
+            for name in TOOL_RUNNERS
+            if _is_tool_available(name)
+        },
+        "semgrep_config": "auto",
+        "ruleset_epoch": ruleset_epoch(),
+        "exclude_dirs": sorted(EXCLUDE_DIRS),
+    }
+
+
+def sast_report_files() -> List[str]:
+    """Report file names run_sast_scan may write into its reports_dir."""
+    return ["sast-report.json", "bandit-report.json"] + [
+        f"{name}-report.json" for name in TOOL_RUNNERS if name != "bandit"
+    ]
+
+
 def select_tools(detected_languages: Dict[str, Any]) -> Dict[str, List[str]]:
     """
     Given detected languages, determine which tools to run.
@@ -577,31 +660,140 @@ def select_tools(detected_languages: Dict[str, Any]) -> Dict[str, List[str]]:
 # MAIN SCAN ORCHESTRATOR
 # ═══════════════════════════════════════════════════════════════════
 
+def _language_of(path: str) -> Optional[str]:
+    return EXTENSION_LANGUAGES.get(Path(path).suffix.lower())
+
+
+def _changed_files_since(
+    repo_path: str,
+    baseline: Dict[str, Any] | None,
+    fingerprint: Dict[str, Any],
+    tree_id: str | None,
+) -> Optional[Set[str]]:
+    """
+    Repo-relative files changed since the commit *baseline* was scanned at.
+
+    Returns None when an incremental scan is not possible and the whole
+    repository must be scanned: no usable baseline, different tools or
+    rules, a dirty or non-git working copy (no *tree_id*), a baseline
+    commit missing from the checkout (e.g. shallow clone, force push) or
+    too many changes.
+    """
+    if not baseline:
+        return None
+    base_commit = baseline.get("source_commit")
+    if not base_commit:
+        return None
+    if baseline.get("tool_fingerprint") != fingerprint:
+        logger.info("SAST tools or rules changed since the baseline scan; running a full scan")
+        return None
+    if tree_id is None:
+        return None
+    if git_output(repo_path, "cat-file", "-e", f"{base_commit}^{{commit}}") is None:
+        logger.info(f"Baseline commit {base_commit[:7]} not in checkout; running a full scan")
+        return None
+    diff = git_output(repo_path, "diff", "--name-only", "--relative", "--no-renames", "-z",
+                      base_commit, "HEAD")
+    if diff is None:
+        return None
+    changed = {path for path in diff.split("\0") if path}
+    if len(changed) > SAST_INCREMENTAL_MAX_FILES:
+        logger.info(f"{len(changed)} files changed since baseline; running a full scan")
+        return None
+    return changed
+
+
+def _scan_targets(repo_path: str, changed: Set[str], tool_languages: List[str]) -> List[str]:
+    """Changed files that still exist and belong to one of *tool_languages*."""
+    targets = []
+    for path in sorted(changed):
+        if EXCLUDE_DIRS.intersection(Path(path).parts[:-1]):
+            continue
+        if _language_of(path) in tool_languages and os.path.isfile(os.path.join(repo_path, path)):
+            targets.append(path)
+    return targets
+
+
+def _carried_issues(
+    tool_name: str,
+    prior_issues: List[dict],
+    changed: Set[str],
+    targets: List[str],
+) -> List[dict]:
+    """
+    Baseline issues of *tool_name* in files this run did not rescan.
+
+    Gosec analyses whole packages, so an issue anywhere in the directory
+    of one of its *targets* is superseded by the new run as well.
+    """
+    packages = {os.path.dirname(t) for t in targets} if tool_name == "gosec" else set()
+    return [
+        issue for issue in prior_issues
+        if issue.get("file") not in changed
+        and os.path.dirname(issue.get("file") or "") not in packages
+    ]
+
+
 def run_sast_scan(
     repo_path: str,
     reports_dir: str,
     languages: Dict[str, Any] | None = None,
+    baseline: Dict[str, Any] | None = None,
+    file_index: FileIndex | None = None,
+    tree_id: str | None = None,
 ) -> Dict[str, Any]:
     """
     Run all applicable SAST tools on a repository.
 
+    With a *baseline* (the unified report of an earlier scan of the same
+    repository and branch) the scan is incremental: tools only look at
+    files changed since the baseline's commit and findings for untouched
+    files are carried forward. A full scan runs instead whenever the tool
+    versions or rules differ from the baseline's.
+
     Args:
         repo_path:   Path to the cloned repository
         reports_dir: Directory to save report files
         languages:   Pre-detected languages (or None to auto-detect)
+        baseline:    Previous unified SAST report (or None for a full scan)
+        file_index:  Index of *repo_path* shared with other pipeline stages
+        tree_id:     source_tree_id() of *repo_path*; without it (dirty or
+                     unknown working copy) the scan is never incremental
 
     Returns:
         Unified SAST report dictionary
     """
     os.makedirs(reports_dir, exist_ok=True)
+    fingerprint = sast_tool_fingerprint()
+    head = git_output(repo_path, "rev-parse", "HEAD")
+    scan_info = {
+        "source_commit": head.strip() if head else None,
+        "tool_fingerprint": fingerprint,
+        "scan_mode": "full",
+    }
 
     # Step 1: Detect languages
     if languages is None:
-        languages = detect_languages(repo_path)
+        languages = detect_languages(repo_path, file_index)
 
     if not languages:
         logger.warning("No supported programming languages detected")
-        return _build_empty_report(repo_path)
+        return {**_build_empty_report(repo_path), **scan_info}
+
+    changed = _changed_files_since(repo_path, baseline, fingerprint, tree_id)
+    prior_issues: Dict[str, List[dict]] = defaultdict(list)
+    prior_tools: Dict[str, Any] = {}
+    if changed is not None:
+        for issue in baseline.get("results", []):
+            prior_issues[issue.get("tool", "")].append(issue)
+        prior_tools = baseline.get("tools_used", {})
+        scan_info.update({
+            "scan_mode": "incremental",
+            "baseline_commit": baseline.get("source_commit"),
+            "changed_files": len(changed),
+        })
+        logger.info(f"Incremental SAST scan: {len(changed)} file(s) changed since "
+                    f"{baseline['source_commit'][:7]}")
 
     logger.info(f"Detected languages: {', '.join(languages.keys())}")
 
@@ -613,47 +805,62 @@ def run_sast_scan(
     available_tools = {name: _is_tool_available(name) for name in TOOL_RUNNERS}
     logger.info(f"Tool availability: {available_tools}")
 
-    # Step 4: Run each tool and collect issues
-    all_issues: List[dict] = []
+    # Step 4: Run the tools concurrently (bounded by SAST_CPU_BUDGET) and
+    # merge in tool_plan order so de-duplication matches a serial run
     tool_results: Dict[str, Dict[str, Any]] = {}
+    tool_issues: Dict[str, List[dict]] = {}
     bandit_raw_path = os.path.join(reports_dir, "bandit-report.json")
 
+    jobs = []
     for tool_name, tool_languages in tool_plan.items():
-        runner = TOOL_RUNNERS.get(tool_name)
-        if not runner:
+        if tool_name not in TOOL_RUNNERS:
             continue
-
         output_path = os.path.join(reports_dir, f"{tool_name}-report.json")
         # For bandit, keep backward-compatible filename
         if tool_name == "bandit":
             output_path = bandit_raw_path
 
-        try:
-            success, message, issues = runner(repo_path, output_path)
-            tool_results[tool_name] = {
-                "success": success,
-                "message": message,
-                "issues_count": len(issues),
-                "languages": tool_languages,
-                "available": True,
-                "report_path": output_path,
-                "display": TOOL_DISPLAY.get(tool_name, {"name": tool_name, "description": ""}),
-            }
-            if success:
-                all_issues.extend(issues)
-                logger.info(f"  ✓ {tool_name}: {message}")
-            else:
-                logger.warning(f"  ✗ {tool_name}: {message}")
-        except Exception as e:
-            logger.error(f"  ✗ {tool_name} failed unexpectedly: {e}")
-            tool_results[tool_name] = {
-                "success": False,
-                "message": str(e),
-                "issues_count": 0,
-                "languages": tool_languages,
-                "available": True,
-                "display": TOOL_DISPLAY.get(tool_name, {"name": tool_name, "description": ""}),
-            }
+        targets = None
+        # A tool the baseline did not run successfully gets a full scan
+        incremental = changed is not None and bool((prior_tools.get(tool_name) or {}).get("success"))
+        if incremental:
+            targets = _scan_targets(repo_path, changed, tool_languages)
+            if not targets:
+                carried = _carried_issues(tool_name, prior_issues[tool_name], changed, targets)
+                tool_results[tool_name] = {
+                    **prior_tools[tool_name],
+                    "message": f"No changed files; {len(carried)} issue(s) carried forward",
+                    "issues_count": len(carried),
+                    "languages": tool_languages,
+                    "report_path": None,
+                }
+                tool_issues[tool_name] = carried
+                continue
+        elif tool_name == "shellcheck" and "shell" in languages:
+            # Shell files are already known from language detection
+            targets = sorted(languages["shell"]["files"])
+        jobs.append((tool_name, tool_languages, output_path, targets, incremental))
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(SAST_CPU_BUDGET, len(jobs)),
+                                thread_name_prefix="sast") as pool:
+            futures = [
+                pool.submit(_run_tool, tool_name, tool_languages, repo_path, output_path, targets)
+                for tool_name, tool_languages, output_path, targets, _ in jobs
+            ]
+            for (tool_name, _, _, targets, incremental), future in zip(jobs, futures):
+                result, issues = future.result()
+                if incremental and result.get("success"):
+                    carried = _carried_issues(tool_name, prior_issues[tool_name], changed, targets)
+                    issues = issues + carried
+                    result["message"] = (f"Incremental ({len(targets)} file(s)): {result['message']}; "
+                                         f"{len(carried)} issue(s) carried forward")
+                    result["issues_count"] = len(issues)
+                tool_results[tool_name], tool_issues[tool_name] = result, issues
+
+    all_issues: List[dict] = []
+    for tool_name in tool_plan:
+        all_issues.extend(tool_issues.get(tool_name, []))
 
     # Mark tools that weren't run due to no applicable language
     for tool_name in TOOL_RUNNERS:
@@ -671,20 +878,62 @@ def run_sast_scan(
     all_issues = _deduplicate_issues(all_issues)
 
     # Step 6: Build unified report
-    report = _build_report(repo_path, languages, tool_results, all_issues)
+    report = {**_build_report(repo_path, languages, tool_results, all_issues), **scan_info}
 
     # Step 7: Save unified report
     unified_path = os.path.join(reports_dir, "sast-report.json")
     with open(unified_path, "w") as f:
-        json.dump(report, f, indent=2)
+        json.dump(report, f, separators=(",", ":"))
     logger.info(f"Unified SAST report saved to {unified_path}")
 
-    # Step 8: Generate backward-compatible bandit-report.json if not already
+    # Step 8: Generate backward-compatible bandit-report.json if not already.
+    # Bandit's raw report of an incremental run only covers the changed
+    # files, so it is rewritten from Bandit's merged issues.
+    if changed is not None and "bandit" in tool_plan:
+        _write_bandit_compat(bandit_raw_path, [i for i in all_issues if i.get("tool") == "bandit"])
     _ensure_bandit_compat(reports_dir, all_issues)
 
     return report
 
 
+def _run_tool(
+    tool_name: str,
+    tool_languages: List[str],
+    repo_path: str,
+    output_path: str,
+    targets: List[str] | None = None,
+) -> Tuple[Dict[str, Any], List[dict]]:
+    """Run one SAST tool; returns its tool_results entry and its issues."""
+    runner = TOOL_RUNNERS[tool_name]
+    display = TOOL_DISPLAY.get(tool_name, {"name": tool_name, "description": ""})
+    try:
+        success, message, issues = runner(repo_path, output_path, targets=targets)
+    except Exception as e:
+        logger.error(f"  ✗ {tool_name} failed unexpectedly: {e}")
+        return {
+            "success": False,
+            "message": str(e),
+            "issues_count": 0,
+            "languages": tool_languages,
+            "available": True,
+            "display": display,
+        }, []
+
+    if success:
+        logger.info(f"  ✓ {tool_name}: {message}")
+    else:
+        logger.warning(f"  ✗ {tool_name}: {message}")
+    return {
+        "success": success,
+        "message": message,
+        "issues_count": len(issues),
+        "languages": tool_languages,
+        "available": True,
+        "report_path": output_path,
+        "display": display,
+    }, issues if success else []
+
+
 def _deduplicate_issues(issues: List[dict]) -> List[dict]:
     """Remove duplicate findings across tools (same file + line + rule)."""
     seen = set()
@@ -730,15 +979,6 @@ def _build_report(
             "count": info["count"],
             "info": info["info"],
         }
-        
-    # Robustly strip repo_path from issue files
-    prefix = repo_path if repo_path.endswith('/') else repo_path + '/'
-    for issue in issues:
-        f = issue.get("file", "")
-        if f.startswith(prefix):
-            issue["file"] = f[len(prefix):]
-        elif f.startswith(repo_path):
-            issue["file"] = f[len(repo_path):]
 
     return {
         "schema_version": 1,
@@ -798,8 +1038,11 @@ def _ensure_bandit_compat(reports_dir: str, issues: List[dict]) -> None:
     bandit_path = os.path.join(reports_dir, "bandit-report.json")
     if os.path.exists(bandit_path):
         return  # Already generated by actual bandit run
+    _write_bandit_compat(bandit_path, issues)
+
 
-    # Build a minimal bandit-format report from all SAST issues
+def _write_bandit_compat(bandit_path: str, issues: List[dict]) -> None:
+    """Write *issues* to *bandit_path* as a minimal bandit-format report."""
     all_results = []
     for issue in issues:
         all_results.append({
@@ -837,7 +1080,7 @@ def _ensure_bandit_compat(reports_dir: str, issues: List[dict]) -> None:
     }
 
     with open(bandit_path, "w") as f:
-        json.dump(compat_report, f, indent=2)
+        json.dump(compat_report, f, separators=(",", ":"))
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Scan result cache for SentinelOps
+Content-addressed store of scanner report files. An entry is keyed by
+
+    (source tree hash, tool name, tool version(s), config hash)
+
+so re-running a pipeline on a commit that was already scanned, or pushing
+the same commit to several branches, restores the stored reports instead of
+running the scanner again.
+
+The tree hash comes from git (``HEAD^{tree}`` of the scanned directory) and
+is only used when the working copy is clean; uncommitted local directories
+are never cached. Scanners report repo-relative paths, so report files are
+stored and restored byte for byte (hard-linked where possible). Entries are
+evicted least recently used first once the cache grows past
+SCAN_CACHE_MAX_BYTES.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger("SentinelOps.ScanCache")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.absolute()
+
+SCAN_CACHE_ENABLED = os.getenv("SCAN_CACHE_ENABLED", "true").lower() == "true"
+SCAN_CACHE_DIR = os.getenv("SCAN_CACHE_DIR", str(PROJECT_ROOT / "runtime" / "scan-cache"))
+SCAN_CACHE_MAX_BYTES = int(os.getenv("SCAN_CACHE_MAX_BYTES", str(1024 ** 3)))
+
+MANIFEST_NAME = "manifest.json"
+
+_evict_lock = threading.Lock()
+
+
+def git_output(repo_path: str, *args: str) -> Optional[str]:
+    """stdout of ``git -C repo_path <args>``, or None if git failed."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", repo_path, *args],
+            capture_output=True, text=True, timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def source_tree_id(repo_path: str) -> Optional[str]:
+    """Git tree hash of ``repo_path``, or None when it is not a clean checkout."""
+    tree = git_output(repo_path, "rev-parse", "HEAD:./")
+    if not tree:
+        return None
+    status = git_output(repo_path, "status", "--porcelain", "--untracked-files=all", "--", ".")
+    if status is None or status.strip():
+        return None
+    return tree.strip()
+
+
+def ruleset_epoch() -> str:
+    """Day bucket for inputs that change remotely (vulnerability DBs, rule registries)."""
+    return date.today().isoformat()
+
+
+@lru_cache(maxsize=64)
+def _tool_version(cmd: str, version_args: Sequence[str], epoch: str) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            [cmd, *version_args], capture_output=True, text=True, timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    output = (result.stdout or result.stderr).strip()
+    return output.splitlines()[0].strip() if output else None
+
+
+def tool_version(cmd: str, version_args: Sequence[str] = ("--version",)) -> Optional[str]:
+    """First line of ``cmd --version``; looked up once a day per process."""
+    if not shutil.which(cmd):
+        return None
+    return _tool_version(cmd, tuple(version_args), ruleset_epoch())
+
+
+def scan_cache_key(tree_id: Optional[str], tool: str, version: Any, config: Any = None) -> Optional[str]:
+    """Cache key for scanning the source tree ``tree_id`` with ``tool``, or None if uncacheable.
+
+    ``tree_id`` is source_tree_id() of the scanned directory, computed once
+    per run by the caller; None (a dirty or non-git directory) is never cached.
+    """
+    if not SCAN_CACHE_ENABLED or not tree_id:
+        return None
+    payload = json.dumps(
+        {"tree": tree_id, "tool": tool, "version": version, "config": config},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    # Reports are only ever replaced or unlinked, never rewritten in place,
+    # so the cache and a run's reports directory can share the file
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def restore_scan(key: Optional[str], reports_dir: str,
+                 cache_dir: str = SCAN_CACHE_DIR) -> Optional[List[str]]:
+    """Copy a cached entry's report files into ``reports_dir``.
+
+    Returns the restored file names, or None on a miss.
+    """
+    if not key:
+        return None
+    entry = os.path.join(cache_dir, key)
+    manifest_path = os.path.join(entry, MANIFEST_NAME)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        os.makedirs(reports_dir, exist_ok=True)
+        for name in manifest["files"]:
+            _link_or_copy(os.path.join(entry, name), os.path.join(reports_dir, name))
+        os.utime(entry)
+    except (OSError, ValueError, KeyError):
+        return None
+    logger.info(f"Scan cache hit for {manifest.get('tool')} ({key[:12]})")
+    return list(manifest["files"])
+
+
+def store_scan(key: Optional[str], tool: str, reports_dir: str,
+               filenames: Iterable[str], cache_dir: str = SCAN_CACHE_DIR) -> bool:
+    """Store the given report files from ``reports_dir`` under ``key``."""
+    if not key:
+        return False
+    entry = os.path.join(cache_dir, key)
+    if os.path.isdir(entry):
+        return True
+    tmp_entry = f"{entry}.tmp-{os.getpid()}-{threading.get_ident()}"
+    stored = []
+    try:
+        os.makedirs(tmp_entry, exist_ok=True)
+        for name in filenames:
+            src = os.path.join(reports_dir, name)
+            if not os.path.isfile(src):
+                continue
+            _link_or_copy(src, os.path.join(tmp_entry, name))
+            stored.append(name)
+        with open(os.path.join(tmp_entry, MANIFEST_NAME), "w") as f:
+            json.dump({"tool": tool, "files": stored, "created_at": time.time()}, f)
+        os.replace(tmp_entry, entry)
+    except OSError as exc:
+        # Another run may have stored the same entry first
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        if not os.path.isdir(entry):
+            logger.warning(f"Failed to store {tool} scan in cache: {exc}")
+            return False
+        return True
+
+    try:
+        evict_scan_cache(cache_dir)
+    except OSError as exc:
+        logger.warning(f"Scan cache eviction failed: {exc}")
+    return True
+
+
+def evict_scan_cache(cache_dir: str = SCAN_CACHE_DIR, max_bytes: int = SCAN_CACHE_MAX_BYTES) -> int:
+    """Delete least recently used entries until the cache fits ``max_bytes``."""
+    if not os.path.isdir(cache_dir):
+        return 0
+    with _evict_lock:
+        entries = []
+        for entry in os.scandir(cache_dir):
+            if not entry.is_dir() or ".tmp-" in entry.name:
+                continue
+            size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+            entries.append((entry.stat().st_mtime, entry.path, size))
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, path, size in sorted(entries):
+            if total <= max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} scan cache entr{'y' if removed == 1 else 'ies'}")
+        return removed
@@ -0,0 +1,643 @@
+"""
+SentinelOps pipeline worker pool
+Claims queued pipelines from the database and runs them through
+PipelineExecutor. Runs either inside the web process
+(PIPELINE_WORKER_MODE=embedded) or in the standalone worker process
+started by worker.py.
+
+The queue is the ``pipelines`` table: a job is a row with status="queued".
+Workers claim rows with SELECT ... FOR UPDATE SKIP LOCKED and hold a lease
+that a heartbeat thread keeps extending; a row whose lease expires (crashed
+worker, lost host) is put back in the queue, so any number of processes on
+any number of hosts can pull work without running a pipeline twice.
+"""
+
+import os
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import select, text
+
+from database import db
+from events import broker as event_broker, pipeline_channel, user_channel
+from models import Pipeline, ScanResult, SystemLog, utcnow
+from notifications import PIPELINE_NOTIFICATION_FIELDS, check_and_notify_pipeline_completion
+from pipeline.git_cache import evict_mirrors
+from pipeline.pipeline_executor import PipelineExecutor
+from pipeline.report_store import REPORT_GC_INTERVAL_SECONDS, collect_report_garbage
+from report_ingest import publish_latest_reports, store_scan_results_from_reports
+from rollups import refresh_pipeline_rollup
+
+PIPELINE_WORKERS = max(1, int(os.getenv("PIPELINE_WORKERS", "2")))
+PIPELINE_DRAIN_TIMEOUT_SECONDS = int(os.getenv("PIPELINE_DRAIN_TIMEOUT_SECONDS", "60"))
+PIPELINE_LEASE_SECONDS = int(os.getenv("PIPELINE_LEASE_SECONDS", "120"))
+PIPELINE_HEARTBEAT_SECONDS = int(os.getenv("PIPELINE_HEARTBEAT_SECONDS", "30"))
+PIPELINE_POLL_SECONDS = float(os.getenv("PIPELINE_POLL_SECONDS", "5"))
+PIPELINE_MAX_ATTEMPTS = max(1, int(os.getenv("PIPELINE_MAX_ATTEMPTS", "3")))
+PIPELINE_REAPER_INTERVAL_SECONDS = float(os.getenv("PIPELINE_REAPER_INTERVAL_SECONDS", "30"))
+# Postgres advisory lock key held by the reaper leader for one reaper pass
+PIPELINE_REAPER_LOCK_KEY = 0x53454E54
+# Advisory lock key held by the process running a report garbage collection pass
+REPORT_GC_LOCK_KEY = 0x53454E55
+PIPELINE_WORKER_ROOT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "runtime", "workers"
+)
+# Pipeline.to_dict fields carried by "status" events
+PIPELINE_EVENT_FIELDS = (
+    "status", "started_at", "completed_at", "duration_seconds", "security_score",
+    "is_deployable", "vulnerability_summary",
+)
+
+
+def normalize_status(status) -> str:
+    return status.value if hasattr(status, "value") else str(status)
+
+
+def requeue_expired_pipeline_leases() -> int:
+    """Return pipelines whose lease expired to the queue (or fail them).
+
+    A pipeline that has already been attempted PIPELINE_MAX_ATTEMPTS times
+    is marked failed instead of being retried again. Must be called inside
+    an application context.
+    """
+    now = utcnow()
+    expired = (
+        Pipeline.query
+        .filter(
+            Pipeline.status == "running",
+            Pipeline.lease_expires_at.isnot(None),
+            Pipeline.lease_expires_at < now,
+        )
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for row in expired:
+        row.lease_owner = None
+        row.lease_expires_at = None
+        if (row.attempts or 0) >= PIPELINE_MAX_ATTEMPTS:
+            row.status = "failed"
+            row.completed_at = now
+            stages = row.stages or {}
+            stages["pipeline_error"] = {
+                "name": "Pipeline Worker Error",
+                "status": "failed",
+                "error": f"Worker lease expired after {row.attempts} attempt(s)",
+            }
+            row.stages = stages
+        else:
+            row.status = "queued"
+    db.session.commit()
+    for row in expired:
+        publish_pipeline_status(row)
+        if row.status == "failed":
+            record_pipeline_rollup(row)
+    if expired:
+        print(f"[Pipeline] Recovered {len(expired)} pipeline(s) with expired leases")
+    return len(expired)
+
+
+def _owned_pipeline(pipeline_id: str, worker_id: str) -> Optional[Pipeline]:
+    """The pipeline row, locked, if ``worker_id`` still holds its lease; else None."""
+    return (
+        Pipeline.query
+        .filter(Pipeline.id == pipeline_id, Pipeline.lease_owner == worker_id)
+        .with_for_update()
+        .first()
+    )
+
+
+def record_pipeline_rollup(pipeline: Pipeline) -> None:
+    """Fold a pipeline that just finished into its daily rollup.
+
+    A failure is logged and leaves the rollup to the bucket's next refresh;
+    it never fails the pipeline. Must be called inside an application context.
+    """
+    pipeline_id = pipeline.id
+    try:
+        refresh_pipeline_rollup(pipeline)
+    except Exception as exc:
+        db.session.rollback()
+        print(f"[Pipeline] Rollup refresh for {pipeline_id} failed: {exc}")
+
+
+def publish_pipeline_event(pipeline_id: str, user_id: Optional[int], event: str, data: dict) -> None:
+    """Push a live pipeline event to the streams of the pipeline and of its owner."""
+    channels = [pipeline_channel(pipeline_id)]
+    if user_id is not None:
+        channels.append(user_channel(user_id))
+    event_broker.publish(channels, event, {**data, "pipeline_id": pipeline_id})
+
+
+def publish_pipeline_status(pipeline: Pipeline) -> None:
+    """Push a "status" event carrying the row's committed status and results."""
+    publish_pipeline_event(pipeline.id, pipeline.user_id, "status", pipeline.to_dict(PIPELINE_EVENT_FIELDS))
+
+
+def find_baseline_report_dir(pipeline: Pipeline) -> Optional[str]:
+    """Report directory of the latest successful run of the same repository and branch.
+
+    Repositories are matched on the linked UserRepository when there is one,
+    else on the owner and repository URL. Must be called inside an
+    application context.
+    """
+    query = db.session.query(Pipeline.report_dir).filter(
+        Pipeline.status == "success",
+        Pipeline.branch == pipeline.branch,
+        Pipeline.id != pipeline.id,
+        Pipeline.report_dir.isnot(None),
+    )
+    if pipeline.user_repo_id:
+        query = query.filter(Pipeline.user_repo_id == pipeline.user_repo_id)
+    elif pipeline.repo_url:
+        query = query.filter(Pipeline.user_id == pipeline.user_id, Pipeline.repo_url == pipeline.repo_url)
+    else:
+        return None
+    row = query.order_by(Pipeline.created_at.desc()).first()
+    return row.report_dir if row else None
+
+
+def try_acquire_reaper_leadership(key: int = PIPELINE_REAPER_LOCK_KEY) -> bool:
+    """Try to become the reaper leader for the current transaction.
+
+    Uses a transaction-scoped Postgres advisory lock, released on commit or
+    rollback, so exactly one process performs each reaper pass no matter how
+    many workers are running. Other databases have no cross-process lock and
+    always lead. Must be called inside an application context.
+    """
+    if db.engine.dialect.name != "postgresql":
+        return True
+    return bool(
+        db.session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": key},
+        ).scalar()
+    )
+
+
+def collect_pipeline_reports(reports_dir: str) -> dict:
+    """Apply the report retention policy under ``reports_dir`` (see pipeline.report_store).
+
+    Pipelines whose report directory was deleted get ``report_dir`` cleared
+    and scan results whose raw report was deleted get ``raw_report_path``
+    cleared; the ingested findings stay in the database. A pass that reclaimed
+    anything is recorded in the system log. Must be called inside an
+    application context.
+    """
+    result = collect_report_garbage(reports_dir)
+    removed = result.pop("removed_dirs")
+    removed_reports = result.pop("removed_reports")
+    for start in range(0, len(removed), 500):
+        batch = removed[start:start + 500]
+        (
+            ScanResult.query
+            .filter(ScanResult.pipeline_id.in_(
+                select(Pipeline.id).where(Pipeline.report_dir.in_(batch))
+            ))
+            .update({ScanResult.raw_report_path: None}, synchronize_session=False)
+        )
+        (
+            Pipeline.query
+            .filter(Pipeline.report_dir.in_(batch))
+            .update({Pipeline.report_dir: None}, synchronize_session=False)
+        )
+    for start in range(0, len(removed_reports), 500):
+        (
+            ScanResult.query
+            .filter(ScanResult.raw_report_path.in_(removed_reports[start:start + 500]))
+            .update({ScanResult.raw_report_path: None}, synchronize_session=False)
+        )
+    if result["files_removed"]:
+        log = SystemLog(
+            level="info",
+            source="report-gc",
+            message=(
+                f"Report cleanup reclaimed {result['bytes_reclaimed'] / (1024 * 1024):.1f} MB "
+                f"({result['files_removed']} files, {result['dirs_removed']} directories)"
+            ),
+        )
+        log.extra_metadata = result
+        db.session.add(log)
+        print(f"[Pipeline] {log.message}")
+    db.session.commit()
+    return result
+
+
+def pipeline_queue_snapshot() -> dict:
+    """Queue depth and active leases as seen in the database (any process)."""
+    queued_ids = [
+        row.id for row in
+        db.session.query(Pipeline.id)
+        .filter(Pipeline.status == "queued")
+        .order_by(Pipeline.created_at.asc())
+        .all()
+    ]
+    leases = [
+        {
+            "pipeline_id": row.id,
+            "owner": row.lease_owner,
+            "heartbeat_at": row.heartbeat_at.isoformat() if row.heartbeat_at else None,
+            "lease_expires_at": row.lease_expires_at.isoformat() if row.lease_expires_at else None,
+            "attempts": row.attempts,
+        }
+        for row in db.session.query(
+            Pipeline.id, Pipeline.lease_owner, Pipeline.heartbeat_at,
+            Pipeline.lease_expires_at, Pipeline.attempts,
+        ).filter(Pipeline.status == "running").all()
+    ]
+    return {
+        "queueDepth": len(queued_ids),
+        "queued": queued_ids,
+        "active": [lease["pipeline_id"] for lease in leases],
+        "leases": leases,
+    }
+
+
+class PipelineWorkerPool:
+    """A pool of threads that claim and run queued pipelines.
+
+    Each worker owns its own PipelineExecutor with an isolated workspace
+    root; reports go to a per-pipeline directory under ``reports_dir`` so
+    concurrent runs never share files.
+    """
+
+    def __init__(self, app, reports_dir: str, size: int = PIPELINE_WORKERS,
+                 worker_root: str = PIPELINE_WORKER_ROOT):
+        self.app = app
+        self.reports_dir = reports_dir
+        self.size = size
+        self.worker_root = worker_root
+        self._lock = threading.Lock()
+        self._threads: list = []
+        self._reaper: Optional[threading.Thread] = None
+        self._next_report_gc = 0.0
+        self._state: Dict[int, dict] = {}
+        self._state_lock = threading.Lock()
+        # Owner of each pipeline running in this process, for its user stream
+        self._owners: Dict[str, Optional[int]] = {}
+        self._shutdown = threading.Event()
+        # Set when this process enqueues work so local workers skip the poll delay
+        self._wakeup = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the worker threads and the lease reaper (idempotent).
+
+        Expired leases are recovered once up front, then periodically by the
+        reaper, never from the claim loop or request handlers. The reaper
+        thread also runs report garbage collection every
+        REPORT_GC_INTERVAL_SECONDS and evicts git mirrors on every pass.
+        """
+        with self._lock:
+            if self._shutdown.is_set() or self._threads:
+                return
+            self.reap()
+            self._reaper = threading.Thread(target=self._reaper_loop, name="pipeline-reaper", daemon=True)
+            self._reaper.start()
+            for index in range(self.size):
+                self._state[index] = {
+                    "worker": index,
+                    "worker_id": None,
+                    "status": "idle",
+                    "pipeline_id": None,
+                    "started_at": None,
+                    "completed": 0,
+                }
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    args=(index,),
+                    name=f"pipeline-worker-{index}",
+                    daemon=True,
+                )
+                worker.start()
+                self._threads.append(worker)
+
+    def drain(self, timeout: float = PIPELINE_DRAIN_TIMEOUT_SECONDS) -> None:
+        """Stop claiming jobs and let in-flight pipelines finish.
+
+        Pipelines still queued stay ``queued`` in the database for any other
+        worker process; an in-flight pipeline that outlives the drain timeout
+        is re-queued once its lease expires.
+        """
+        if not self._threads or self._shutdown.is_set():
+            return
+        self._shutdown.set()
+        self._wakeup.set()
+        deadline = time.monotonic() + timeout
+        for worker in self._threads:
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+        if self._reaper is not None:
+            self._reaper.join(timeout=max(0.0, deadline - time.monotonic()))
+
+    def wakeup(self) -> None:
+        self._wakeup.set()
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    @property
+    def draining(self) -> bool:
+        return self._shutdown.is_set()
+
+    def snapshot(self) -> list:
+        """Per-worker state of this process's pool."""
+        with self._state_lock:
+            return [dict(state) for _, state in sorted(self._state.items())]
+
+    # ------------------------------------------------------------------
+    # Queue operations
+    # ------------------------------------------------------------------
+
+    def persist_pipeline_state(self, pipeline, worker_id: str) -> None:
+        """PipelineExecutor on_update hook: mirror run progress onto the DB row.
+
+        Only written while ``worker_id`` still holds the lease; once the
+        reaper has re-queued the row, a stale run must not mark it running.
+        """
+        with self.app.app_context():
+            db_pipeline = _owned_pipeline(pipeline.id, worker_id)
+            if not db_pipeline:
+                db.session.rollback()
+                return
+            # The terminal status and completion time are left to _run_job,
+            # which records them once the findings are stored
+            status = normalize_status(pipeline.status)
+            if status not in Pipeline.FINISHED_STATUSES:
+                db_pipeline.status = status
+            db_pipeline.stages = pipeline.stages or {}
+            if pipeline.started_at:
+                try:
+                    db_pipeline.started_at = datetime.fromisoformat(pipeline.started_at)
+                except ValueError:
+                    pass
+            db_pipeline.duration_seconds = pipeline.duration_seconds
+            db_pipeline.security_score = pipeline.security_score
+            db_pipeline.is_deployable = pipeline.is_deployable
+            if pipeline.vulnerability_summary is not None:
+                db_pipeline.vulnerability_summary = pipeline.vulnerability_summary
+            if getattr(pipeline, "ai_prediction", None) is not None:
+                db_pipeline.ai_prediction_data = pipeline.ai_prediction
+            db.session.commit()
+
+    def publish_pipeline_event(self, pipeline, event: str, data: dict) -> None:
+        """PipelineExecutor on_event hook: push live progress to open streams."""
+        publish_pipeline_event(pipeline.id, self._owners.get(pipeline.id), event, data)
+
+    def reap(self) -> None:
+        """Run one reaper pass if this process wins leadership for it."""
+        try:
+            with self.app.app_context():
+                if not try_acquire_reaper_leadership():
+                    db.session.rollback()
+                    return
+                requeue_expired_pipeline_leases()
+        except Exception as exc:
+            print(f"[Pipeline] Reaper pass failed: {exc}")
+
+    def collect_reports(self) -> None:
+        """Run a report garbage collection pass unless another process is running one."""
+        try:
+            with self.app.app_context():
+                if not try_acquire_reaper_leadership(REPORT_GC_LOCK_KEY):
+                    db.session.rollback()
+                    return
+                collect_pipeline_reports(self.reports_dir)
+        except Exception as exc:
+            print(f"[Pipeline] Report cleanup failed: {exc}")
+
+    def evict_git_cache(self) -> None:
+        """Trim this host's git mirror cache to GIT_CACHE_MAX_BYTES."""
+        try:
+            evict_mirrors()
+        except Exception as exc:
+            print(f"[Pipeline] Git cache eviction failed: {exc}")
+
+    def _reaper_loop(self) -> None:
+        # Jitter so reapers started together do not contend on every tick
+        while not self._shutdown.wait(PIPELINE_REAPER_INTERVAL_SECONDS * random.uniform(0.8, 1.2)):
+            self.reap()
+            self.evict_git_cache()
+            if REPORT_GC_INTERVAL_SECONDS > 0 and time.monotonic() >= self._next_report_gc:
+                self._next_report_gc = time.monotonic() + REPORT_GC_INTERVAL_SECONDS
+                self.collect_reports()
+
+    def _claim_next(self, worker_id: str) -> Optional[dict]:
+        """Lease the oldest queued pipeline to ``worker_id``, or return None."""
+        with self.app.app_context():
+            row = (
+                Pipeline.query
+                .filter(Pipeline.status == "queued")
+                .order_by(Pipeline.created_at.asc())
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if not row:
+                db.session.rollback()
+                return None
+
+            now = utcnow()
+            row.status = "running"
+            row.started_at = now
+            row.lease_owner = worker_id
+            row.lease_expires_at = now + timedelta(seconds=PIPELINE_LEASE_SECONDS)
+            row.heartbeat_at = now
+            row.attempts = (row.attempts or 0) + 1
+            job = {
+                "id": row.id,
+                "user_id": row.user_id,
+                "repo_url": row.repo_url or "",
+                "branch": row.branch or "main",
+                "commit_sha": row.commit_sha or "manual",
+                "commit_message": row.commit_message or "",
+                "author": row.author or "system",
+                "report_dir": row.report_dir,
+                "baseline_dir": find_baseline_report_dir(row),
+                "attempt": row.attempts,
+                "spec": row.job_spec,
+            }
+            db.session.commit()
+            return job
+
+    def _heartbeat(self, pipeline_id: str, worker_id: str, stop: threading.Event) -> None:
+        """Extend ``worker_id``'s lease on a running pipeline until ``stop`` is set."""
+        while not stop.wait(PIPELINE_HEARTBEAT_SECONDS):
+            try:
+                with self.app.app_context():
+                    now = utcnow()
+                    updated = (
+                        Pipeline.query
+                        .filter(Pipeline.id == pipeline_id, Pipeline.lease_owner == worker_id)
+                        .update(
+                            {
+                                Pipeline.heartbeat_at: now,
+                                Pipeline.lease_expires_at: now + timedelta(seconds=PIPELINE_LEASE_SECONDS),
+                            },
+                            synchronize_session=False,
+                        )
+                    )
+                    db.session.commit()
+                if not updated:
+                    print(f"[Pipeline] {worker_id} lost its lease on {pipeline_id}")
+                    return
+            except Exception as exc:
+                print(f"[Pipeline] Heartbeat for {pipeline_id} failed: {exc}")
+
+    def _run_job(self, executor: PipelineExecutor, job: dict, worker_id: str) -> None:
+        """Run a claimed pipeline and record the outcome on its (still leased) row."""
+        spec = job.get("spec") or {}
+        pipeline = executor.create_pipeline(
+            repo_url=job["repo_url"],
+            branch=job["branch"],
+            commit_sha=job["commit_sha"],
+            commit_message=job["commit_message"],
+            author=job["author"],
+            pipeline_id=job["id"],
+        )
+        self._owners[pipeline.id] = job.get("user_id")
+        try:
+            with self.app.app_context():
+                db_pipeline = db.session.get(Pipeline, pipeline.id)
+                if db_pipeline:
+                    db_pipeline.stages = pipeline.stages
+                    db.session.commit()
+                    publish_pipeline_status(db_pipeline)
+
+                try:
+                    result = executor.run_pipeline(
+                        pipeline,
+                        repo_url=spec.get("repo_url"),
+                        target_dir=spec.get("target_dir"),
+                        image_name=spec.get("image_name"),
+                        scan_prefs=spec.get("scan_prefs"),
+                        reports_dir=job.get("report_dir"),
+                        baseline_dir=job.get("baseline_dir"),
+                    )
+                    if db_pipeline:
+                        db.session.refresh(db_pipeline)
+                    if db_pipeline and db_pipeline.lease_owner != worker_id:
+                        print(f"[Pipeline] {worker_id} no longer owns {pipeline.id}; discarding its result")
+                        return
+                    # Findings are stored before the run is marked finished:
+                    # from then on its API views are cached as immutable
+                    if result.report_dir:
+                        store_scan_results_from_reports(pipeline.id, result.report_dir,
+                                                        findings=result.findings)
+                    if db_pipeline:
+                        db_pipeline.status = normalize_status(result.status)
+                        db_pipeline.report_dir = result.report_dir
+                        db_pipeline.security_score = result.security_score
+                        db_pipeline.is_deployable = result.is_deployable
+                        db_pipeline.vulnerability_summary = result.vulnerability_summary or {}
+                        db_pipeline.stages = result.stages or {}
+                        db_pipeline.duration_seconds = result.duration_seconds
+                        db_pipeline.ai_prediction_data = getattr(result, "ai_prediction", None)
+                        db_pipeline.completed_at = utcnow()
+                        db_pipeline.lease_owner = None
+                        db_pipeline.lease_expires_at = None
+                        db.session.commit()
+                        publish_pipeline_status(db_pipeline)
+                        record_pipeline_rollup(db_pipeline)
+                        check_and_notify_pipeline_completion(db_pipeline.to_dict(PIPELINE_NOTIFICATION_FIELDS))
+                    if result.report_dir:
+                        publish_latest_reports(result.report_dir, self.reports_dir)
+                except Exception as exc:
+                    db.session.rollback()
+                    if db_pipeline:
+                        db_pipeline = _owned_pipeline(pipeline.id, worker_id)
+                        if not db_pipeline:
+                            db.session.rollback()
+                            print(f"[Pipeline] {worker_id} no longer owns {pipeline.id}; discarding its failure")
+                            return
+                        db_pipeline.status = "failed"
+                        db_pipeline.completed_at = utcnow()
+                        db_pipeline.lease_owner = None
+                        db_pipeline.lease_expires_at = None
+                        stages = db_pipeline.stages or {}
+                        stages["pipeline_error"] = {
+                            "name": "Pipeline Error",
+                            "status": "failed",
+                            "error": str(exc),
+                        }
+                        db_pipeline.stages = stages
+                        db.session.commit()
+                        publish_pipeline_status(db_pipeline)
+                        record_pipeline_rollup(db_pipeline)
+                        check_and_notify_pipeline_completion(db_pipeline.to_dict(PIPELINE_NOTIFICATION_FIELDS))
+        except Exception as worker_exc:
+            with self.app.app_context():
+                db.session.rollback()
+                db_pipeline = db.session.get(Pipeline, pipeline.id)
+                if db_pipeline and db_pipeline.status in ("queued", "running") and db_pipeline.lease_owner == worker_id:
+                    db_pipeline.status = "failed"
+                    db_pipeline.completed_at = utcnow()
+                    db_pipeline.lease_owner = None
+                    db_pipeline.lease_expires_at = None
+                    stages = db_pipeline.stages or {}
+                    stages["pipeline_error"] = {
+                        "name": "Pipeline Worker Error",
+                        "status": "failed",
+                        "error": str(worker_exc),
+                    }
+                    db_pipeline.stages = stages
+                    db.session.commit()
+                    publish_pipeline_status(db_pipeline)
+                    record_pipeline_rollup(db_pipeline)
+        finally:
+            self._owners.pop(pipeline.id, None)
+
+    def _worker_loop(self, worker_index: int) -> None:
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{worker_index}"
+        worker_root = os.path.join(self.worker_root, str(worker_index))
+        executor = PipelineExecutor(
+            self.reports_dir,
+            on_update=lambda pipeline: self.persist_pipeline_state(pipeline, worker_id),
+            workspace_root=os.path.join(worker_root, "workspace"),
+            on_event=self.publish_pipeline_event,
+        )
+        state = self._state[worker_index]
+        state["worker_id"] = worker_id
+        print(f"[Pipeline] Worker {worker_id} started (root={worker_root})")
+
+        while not self._shutdown.is_set():
+            try:
+                job = self._claim_next(worker_id)
+            except Exception as exc:
+                print(f"[Pipeline] {worker_id} could not poll the queue: {exc}")
+                job = None
+            if job is None:
+                self._wakeup.wait(PIPELINE_POLL_SECONDS)
+                self._wakeup.clear()
+                continue
+
+            pipeline_id = job["id"]
+            with self._state_lock:
+                state.update(status="running", pipeline_id=pipeline_id, started_at=utcnow().isoformat())
+
+            stop_heartbeat = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat,
+                args=(pipeline_id, worker_id, stop_heartbeat),
+                name=f"pipeline-heartbeat-{worker_index}",
+                daemon=True,
+            )
+            heartbeat.start()
+            try:
+                self._run_job(executor, job, worker_id)
+            finally:
+                stop_heartbeat.set()
+                heartbeat.join()
+                executor.current_runs.pop(pipeline_id, None)
+                with self._state_lock:
+                    state.update(status="idle", pipeline_id=None, started_at=None)
+                    state["completed"] += 1
+
+        with self._state_lock:
+            state.update(status="stopped", pipeline_id=None, started_at=None)
+        print(f"[Pipeline] Worker {worker_id} stopped")
@@ -0,0 +1,181 @@
+"""
+SentinelOps report ingestion
+Loads a finished pipeline's scanner reports from disk into the database.
+Shared by the web app and the standalone pipeline worker.
+"""
+
+import os
+import shutil
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, insert, select
+
+from database import db
+from models import Pipeline, ScanResult, Secret, Vulnerability
+from pipeline.findings import (
+    SOURCES, Finding, Findings, ScanSummary, iter_findings, load_scan_summaries, severity_rank,
+)
+from pipeline.report_store import GZIP_SUFFIX, load_report
+
+# Findings per multi-row INSERT statement
+INGEST_BATCH_SIZE = max(1, int(os.getenv("INGEST_BATCH_SIZE", "1000")))
+
+_publish_lock = threading.Lock()
+
+
+def load_json_path(path: str):
+    """Parsed report at ``path`` (plain or gzipped), or None."""
+    return load_report(path) if path else None
+
+
+def publish_latest_reports(source_dir: str, latest_dir: str) -> None:
+    """Copy a finished run's reports into ``latest_dir`` for the "latest" views.
+
+    Each file is staged next to its destination and swapped in with
+    os.replace so readers never observe a half-written report. Reports are
+    copied as stored (plain or gzipped); the other variant of the same
+    report left by an earlier run is removed.
+    """
+    if not os.path.isdir(source_dir) or os.path.abspath(source_dir) == os.path.abspath(latest_dir):
+        return
+    with _publish_lock:
+        for name in os.listdir(source_dir):
+            src = os.path.join(source_dir, name)
+            if not name.endswith((".json", ".json" + GZIP_SUFFIX)) or not os.path.isfile(src):
+                continue
+            tmp = os.path.join(latest_dir, f".{name}.tmp")
+            dst = os.path.join(latest_dir, name)
+            try:
+                shutil.copy2(src, tmp)
+                os.replace(tmp, dst)
+                if name.endswith(GZIP_SUFFIX):
+                    other = dst[:-len(GZIP_SUFFIX)]
+                else:
+                    other = dst + GZIP_SUFFIX
+                if os.path.exists(other):
+                    os.remove(other)
+            except OSError as exc:
+                print(f"[Pipeline] Could not publish {name}: {exc}")
+
+
+def _string_limits(model) -> Dict[str, int]:
+    return {
+        column.key: column.type.length
+        for column in model.__table__.columns
+        if getattr(column.type, "length", None)
+    }
+
+
+def _fit_rows(model, rows: List[dict]) -> List[dict]:
+    """Truncate string values to their column lengths so one long title can't fail the batch."""
+    limits = _string_limits(model)
+    for row in rows:
+        for key, limit in limits.items():
+            value = row.get(key)
+            if isinstance(value, str) and len(value) > limit:
+                row[key] = value[:limit]
+    return rows
+
+
+def _vulnerability_row(finding: Finding) -> dict:
+    return {
+        "source": finding.source,
+        "tool": finding.tool,
+        "severity": finding.severity,
+        "severity_rank": severity_rank(finding.severity),
+        "title": finding.title,
+        "message": finding.message,
+        "file_path": finding.file,
+        "line_number": finding.line,
+        "rule_id": finding.rule_id,
+        "language": finding.language,
+        "url": finding.url,
+        "cwe_id": finding.cwe_id,
+        "vulnerability_id": finding.vulnerability_id,
+        "fixed_version": finding.fixed_version,
+    }
+
+
+def _secret_row(finding: Finding) -> dict:
+    return {
+        "rule_id": finding.rule_id,
+        "severity": finding.severity,
+        "severity_rank": severity_rank(finding.severity),
+        "file_path": finding.file,
+        "line_number": finding.line,
+        "match": finding.match,
+        "commit": finding.commit,
+        "author": finding.author,
+    }
+
+
+def store_scan_results_from_reports(pipeline_id: str, reports_dir: str,
+                                    findings: Optional[Findings] = None) -> None:
+    """Replace a pipeline's ScanResult/Vulnerability/Secret rows from its report files.
+
+    ``findings`` is the run's normalized findings model, whose scanner
+    totals are used instead of re-reading them; the findings themselves
+    are always streamed from ``reports_dir``. Runs as one transaction:
+    prior rows are removed with set-based deletes and findings are written
+    with multi-row INSERTs of at most INGEST_BATCH_SIZE rows, so a retried
+    ingest leaves exactly one copy of the pipeline's results and memory use
+    does not grow with the size of the reports.
+    """
+    try:
+        # Serialize concurrent ingests of the same pipeline on its row lock
+        db.session.execute(select(Pipeline.id).where(Pipeline.id == pipeline_id).with_for_update())
+
+        # Clear any previous scan rows for this pipeline
+        prior_ids = select(ScanResult.id).where(ScanResult.pipeline_id == pipeline_id)
+        for model in (Vulnerability, Secret):
+            db.session.execute(
+                delete(model)
+                .where(model.scan_result_id.in_(prior_ids))
+                .execution_options(synchronize_session=False)
+            )
+        db.session.execute(
+            delete(ScanResult)
+            .where(ScanResult.pipeline_id == pipeline_id)
+            .execution_options(synchronize_session=False)
+        )
+
+        scans = findings.scans if findings is not None else load_scan_summaries(reports_dir)
+        scan_results = {}
+        for source in SOURCES:
+            scan = scans.get(source) or ScanSummary(source)
+            counts = scan.bucketed()
+            scan_results[source] = ScanResult(
+                pipeline_id=pipeline_id,
+                scanner_type=source,
+                total_findings=scan.total,
+                critical_count=counts["CRITICAL"],
+                high_count=counts["HIGH"],
+                medium_count=counts["MEDIUM"],
+                low_count=counts["LOW"],
+                info_count=counts["INFO"],
+                raw_report_path=os.path.join(reports_dir, scan.raw_report),
+            )
+            scan_results[source].extra_metadata = scan.meta
+            db.session.add(scan_results[source])
+        db.session.flush()
+
+        batches: Dict[type, List[dict]] = {Vulnerability: [], Secret: []}
+        for finding in iter_findings(reports_dir):
+            if finding.source == "Gitleaks":
+                model, row = Secret, _secret_row(finding)
+            else:
+                model, row = Vulnerability, _vulnerability_row(finding)
+            row["scan_result_id"] = scan_results[finding.source].id
+            batch = batches[model]
+            batch.append(row)
+            if len(batch) >= INGEST_BATCH_SIZE:
+                db.session.execute(insert(model), _fit_rows(model, batch))
+                batch.clear()
+        for model, batch in batches.items():
+            if batch:
+                db.session.execute(insert(model), _fit_rows(model, batch))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
@@ -0,0 +1,141 @@
+"""
+SentinelOps pipeline rollups
+Per user, repository and day totals of finished pipelines, kept current
+as pipelines finish, so trend and analytics views read one row per day
+instead of every pipeline and finding. Shared by the web app and the
+standalone pipeline worker.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func, text
+
+from database import db
+from models import Pipeline, PipelineDailyRollup, ScanResult, utcnow
+
+# Postgres advisory lock key (with the user id as second key) serializing
+# refreshes of one user's rollup rows
+ROLLUP_LOCK_KEY = 0x53454E56
+
+_COUNTERS = (
+    "pipelines", "succeeded", "failed", "deployable", "blocked", "score_sum",
+    "scored", "duration_sum", "critical", "high", "medium", "low", "secrets",
+)
+# Counters reported as is; the score and duration sums are reported as averages
+_REPORTED = tuple(name for name in _COUNTERS if name not in ("score_sum", "scored", "duration_sum"))
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def refresh_pipeline_rollup(pipeline) -> None:
+    """Recompute the rollup row of the (owner, repository, day) ``pipeline`` falls in.
+
+    The bucket is recomputed from its pipelines rather than incremented by
+    one, so the row stays exact when a pipeline is finished twice or its
+    findings are ingested again. Pipelines are bucketed by creation day
+    (UTC). Commits; must be called inside an application context.
+    """
+    if pipeline.user_id is None or pipeline.created_at is None:
+        return
+    repo = pipeline.github_repo or ""
+    day = pipeline.created_at.date()
+    start = datetime.combine(day, time.min)
+
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(
+            text("SELECT pg_advisory_xact_lock(:key, :user_id)"),
+            {"key": ROLLUP_LOCK_KEY, "user_id": pipeline.user_id},
+        )
+
+    in_bucket = (
+        Pipeline.user_id == pipeline.user_id,
+        func.coalesce(Pipeline.github_repo, "") == repo,
+        Pipeline.created_at >= start,
+        Pipeline.created_at < start + timedelta(days=1),
+        Pipeline.status.in_(Pipeline.FINISHED_STATUSES),
+    )
+    runs = db.session.query(
+        func.count(Pipeline.id),
+        _count_if(Pipeline.status == "success"),
+        _count_if(Pipeline.status == "failed"),
+        _count_if(Pipeline.is_deployable.is_(True)),
+        # Blocked by the security policy: ran through but not deployable
+        _count_if(db.and_(Pipeline.status == "success", Pipeline.is_deployable.is_(False))),
+        func.coalesce(func.sum(Pipeline.security_score), 0),
+        func.count(Pipeline.security_score),
+        func.coalesce(func.sum(Pipeline.duration_seconds), 0.0),
+    ).filter(*in_bucket).one()
+    findings = (
+        db.session.query(
+            func.coalesce(func.sum(ScanResult.critical_count), 0),
+            func.coalesce(func.sum(ScanResult.high_count), 0),
+            func.coalesce(func.sum(ScanResult.medium_count), 0),
+            func.coalesce(func.sum(ScanResult.low_count), 0),
+            func.coalesce(func.sum(case(
+                (ScanResult.scanner_type == "Gitleaks", ScanResult.total_findings), else_=0
+            )), 0),
+        )
+        .join(Pipeline, Pipeline.id == ScanResult.pipeline_id)
+        .filter(*in_bucket)
+        .one()
+    )
+
+    row = PipelineDailyRollup.query.filter_by(user_id=pipeline.user_id, repo=repo, day=day).first()
+    if not runs[0]:
+        if row:
+            db.session.delete(row)
+        db.session.commit()
+        return
+    if row is None:
+        row = PipelineDailyRollup(user_id=pipeline.user_id, repo=repo, day=day)
+        db.session.add(row)
+    for name, value in zip(_COUNTERS, tuple(runs) + tuple(findings)):
+        setattr(row, name, value)
+    db.session.commit()
+
+
+def daily_series(since: date, user_id: Optional[int] = None, repo: Optional[str] = None) -> List[Dict]:
+    """One entry per day from ``since`` through today, summed over the matching rollups.
+
+    Days without finished pipelines are included with zero counts.
+    """
+    q = db.session.query(
+        PipelineDailyRollup.day,
+        *(func.sum(getattr(PipelineDailyRollup, name)) for name in _COUNTERS),
+    ).filter(PipelineDailyRollup.day >= since)
+    if user_id is not None:
+        q = q.filter(PipelineDailyRollup.user_id == user_id)
+    if repo is not None:
+        q = q.filter(PipelineDailyRollup.repo == repo)
+    by_day = {row[0]: dict(zip(_COUNTERS, row[1:])) for row in q.group_by(PipelineDailyRollup.day)}
+
+    series = []
+    today = utcnow().date()
+    day = since
+    while day <= today:
+        totals = by_day.get(day) or dict.fromkeys(_COUNTERS, 0)
+        series.append(_day_entry(day, totals))
+        day += timedelta(days=1)
+    return series
+
+
+def _day_entry(day: date, totals: Dict) -> Dict:
+    pipelines = int(totals["pipelines"] or 0)
+    scored = int(totals["scored"] or 0)
+    entry = {"date": day.isoformat()}
+    entry.update({name: int(totals[name] or 0) for name in _REPORTED})
+    entry["total"] = entry["critical"] + entry["high"] + entry["medium"] + entry["low"]
+    entry["avg_score"] = round(totals["score_sum"] / scored, 1) if scored else None
+    entry["avg_duration_seconds"] = round(float(totals["duration_sum"]) / pipelines, 1) if pipelines else None
+    return entry
+
+
+def rollup_totals(user_id: Optional[int] = None) -> Dict[str, int]:
+    """All-time finding and pipeline counts from the rollups."""
+    q = db.session.query(*(func.coalesce(func.sum(getattr(PipelineDailyRollup, name)), 0) for name in _COUNTERS))
+    if user_id is not None:
+        q = q.filter(PipelineDailyRollup.user_id == user_id)
+    return {name: value for name, value in zip(_COUNTERS, q.one())}
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Print PostgreSQL plans for the per-user pipeline listing hot paths.
+
+Runs EXPLAIN (ANALYZE, BUFFERS) for the queries behind GET /api/pipelines,
+/api/pipelines/trends, /api/pipelines/latest, the "latest pipeline"
+lookup used by the report endpoints and the ScanResult report lookup,
+against the database in DATABASE_URL. Parameters are taken from the user
+with the most pipelines. Exits non-zero if any plan scans pipelines or
+scan_results sequentially.
+
+    python dashboard/scripts/explain_queries.py [--force-index]
+
+On a small development database the planner rightly prefers sequential
+scans; --force-index disables them for the session to check that the
+indexes can serve each query.
+"""
+
+import argparse
+import os
+import sys
+
+_DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _DASHBOARD_DIR not in sys.path:
+    sys.path.insert(0, _DASHBOARD_DIR)
+
+from sqlalchemy import text  # noqa: E402
+
+from worker import create_worker_app  # noqa: E402
+
+SEQ_SCAN_TABLES = ("pipelines", "scan_results")
+
+
+def hot_queries(db, Pipeline, ScanResult):
+    """(name, statement) pairs mirroring the endpoint queries in app.py."""
+    user_id, repo = (
+        db.session.query(Pipeline.user_id, Pipeline.github_repo)
+        .filter(Pipeline.user_id.isnot(None))
+        .group_by(Pipeline.user_id, Pipeline.github_repo)
+        .order_by(db.func.count().desc())
+        .first()
+    ) or (0, None)
+    pipeline_id = (
+        db.session.query(ScanResult.pipeline_id).limit(1).scalar() or ""
+    )
+
+    listing = Pipeline.query.filter(Pipeline.user_id == user_id)
+    by_repo = listing.filter(Pipeline.github_repo == repo)
+    return [
+        ("get_pipelines", listing.order_by(Pipeline.created_at.desc()).limit(20)),
+        ("get_pipelines (count)", listing.with_entities(db.func.count(Pipeline.id))),
+        ("get_pipelines ?repo", by_repo.order_by(Pipeline.created_at.desc()).limit(20)),
+        ("get_pipeline_trends", listing.order_by(Pipeline.created_at.asc()).limit(30)),
+        ("get_latest_pipeline ?repo", by_repo.order_by(Pipeline.created_at.desc()).limit(1)),
+        ("_resolve_accessible_pipeline (latest)",
+         db.session.query(Pipeline.id, Pipeline.user_id, Pipeline.status, Pipeline.completed_at)
+         .filter(Pipeline.user_id == user_id).order_by(Pipeline.created_at.desc()).limit(1)),
+        ("scan result by pipeline and scanner",
+         ScanResult.query.filter_by(pipeline_id=pipeline_id, scanner_type="SAST").limit(1)),
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--force-index", action="store_true",
+                        help="disable sequential scans for this session")
+    args = parser.parse_args()
+
+    app = create_worker_app()
+    from database import db
+    from models import Pipeline, ScanResult
+
+    failures = 0
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            print("EXPLAIN checks need PostgreSQL")
+            return 2
+        if args.force_index:
+            db.session.execute(text("SET enable_seqscan = off"))
+        for name, query in hot_queries(db, Pipeline, ScanResult):
+            sql = str(query.statement.compile(dialect=db.engine.dialect,
+                                              compile_kwargs={"literal_binds": True}))
+            plan = [row[0] for row in db.session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))]
+            seq_scans = [line for line in plan
+                         if any(f"Seq Scan on {table}" in line for table in SEQ_SCAN_TABLES)]
+            print(f"== {name} {'SEQ SCAN' if seq_scans else 'ok'}")
+            for line in plan:
+                print(f"   {line}")
+            failures += bool(seq_scans)
+        db.session.rollback()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+SentinelOps pipeline worker process (``sentinelops-worker``).
+
+Runs the pipeline worker pool outside the web tier. It loads only the
+database models and the pipeline package and shares nothing with the web
+process except the database, so scan capacity scales independently of API
+capacity. Start any number of these on any number of hosts:
+
+    python dashboard/worker.py
+
+and set PIPELINE_WORKER_MODE=external on the web process so it only
+enqueues. SIGTERM/SIGINT stop claiming new work and drain in-flight runs.
+"""
+
+import os
+import signal
+import sys
+import threading
+
+from dotenv import load_dotenv
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_THIS_DIR)
+
+load_dotenv(os.path.join(_PROJECT_ROOT, ".env"))
+
+for _path in (_THIS_DIR, _PROJECT_ROOT):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+_TOOLS_BIN = os.path.join(_THIS_DIR, ".tools", "bin")
+if os.path.isdir(_TOOLS_BIN):
+    os.environ["PATH"] = f"{_TOOLS_BIN}:{os.environ.get('PATH', '')}"
+
+from flask import Flask  # noqa: E402
+
+REPORT_DIR = os.path.join(_PROJECT_ROOT, "runtime", "reports")
+
+
+def create_worker_app() -> Flask:
+    """Bare Flask app carrying only the database configuration."""
+    app = Flask(__name__)
+
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL environment variable is not set.")
+    # Railway gives postgres:// but SQLAlchemy needs postgresql://
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 20)),
+        "pool_pre_ping": True,
+    }
+
+    from database import db
+
+    db.init_app(app)
+    return app
+
+
+def main() -> int:
+    app = create_worker_app()
+
+    from events import start_event_bridge
+    from pipeline_worker import PipelineWorkerPool
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    pool = PipelineWorkerPool(app, REPORT_DIR)
+    # Relay pipeline progress and notifications to the web processes' streams
+    event_bridge = start_event_bridge(app.config["SQLALCHEMY_DATABASE_URI"], listen=False)
+    stop = threading.Event()
+
+    def _handle_signal(signum, _frame):
+        print(f"[Worker] Received signal {signum}, draining")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
+
+    pool.start()
+    print(f"[Worker] Pipeline worker running with {pool.size} worker thread(s)")
+    while not stop.wait(1):
+        if not pool.running:
+            print("[Worker] All worker threads exited unexpectedly")
+            return 1
+
+    pool.drain()
+    if event_bridge is not None:
+        event_bridge.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())